@@ -0,0 +1,6 @@
+from src.rest.async_server import create_async_server
+
+app = create_async_server()
+
+if __name__ == "__main__":
+    app.run()
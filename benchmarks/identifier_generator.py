@@ -0,0 +1,47 @@
+"""Identifiers per second, one SonyFlake per call against the shared one.
+
+    python -m benchmarks.identifier_generator
+"""
+import timeit
+
+from sonyflake import SonyFlake
+
+from src.domain.enum.identifier_algorithm import IdentifierAlgorithm
+from src.domain.identifier_generator import IdentifierGenerator
+
+N = 2000
+
+
+def sony_flake_per_call():
+    return str(SonyFlake().next_id())
+
+
+def report(name: str, seconds: float, n: int = N):
+    print(f"{name:<32} {n / seconds:>12,.0f} ids/s")
+
+
+def main():
+    report("SonyFlake() per call", timeit.timeit(sony_flake_per_call, number=50), 50)
+    report(
+        "IdentifierGenerator.next_id",
+        timeit.timeit(
+            lambda: IdentifierGenerator.next_id(IdentifierAlgorithm.SONY_FLAKE),
+            number=N,
+        ),
+    )
+    report(
+        "IdentifierGenerator.next_ids",
+        timeit.timeit(
+            lambda: IdentifierGenerator.next_ids(IdentifierAlgorithm.SONY_FLAKE, N),
+            number=1,
+        ),
+    )
+    for algorithm in (IdentifierAlgorithm.OBJECT_ID, IdentifierAlgorithm.NANO_ID):
+        report(
+            f"next_ids {algorithm.name}",
+            timeit.timeit(lambda: IdentifierGenerator.next_ids(algorithm, N), number=1),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Identifier validations per second, previous validators against the table.
+
+    python -m benchmarks.identifier_handler
+"""
+import timeit
+from uuid import UUID
+
+import pandas as pd
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from src.domain.enum.identifier_algorithm import IdentifierAlgorithm
+from src.domain.identifier_generator import IdentifierGenerator
+from src.domain.identifier_handler import IdentifierHandler
+
+N = 100000
+
+
+def previous_uuid_v4(identifier):
+    if not isinstance(identifier, str):
+        return False
+    try:
+        UUID(identifier, version=4)
+        return True
+    except ValueError:
+        return False
+
+
+def previous_object_id(identifier):
+    # InvalidId escaped the previous validator, caught here to keep running
+    try:
+        ObjectId(identifier)
+        return True
+    except (ValueError, InvalidId):
+        return False
+
+
+def previous_length(length):
+    return lambda identifier: isinstance(identifier, str) and len(identifier) == length
+
+
+PREVIOUS = {
+    IdentifierAlgorithm.UUID_V4: previous_uuid_v4,
+    IdentifierAlgorithm.SONY_FLAKE: previous_length(18),
+    IdentifierAlgorithm.OBJECT_ID: previous_object_id,
+    IdentifierAlgorithm.NANO_ID: previous_length(21),
+}
+
+
+def rate(func, values) -> float:
+    return len(values) / timeit.timeit(lambda: [func(v) for v in values], number=1)
+
+
+def main():
+    print(f"{'algorithm':<12} {'previous':>12} {'table':>12} {'many':>12}  ids/s")
+    for algorithm, previous in PREVIOUS.items():
+        values = IdentifierGenerator.next_ids(algorithm, N)
+        # Half of the ids invalid, the previous validators raise for those
+        values = values[: N // 2] + [value[:-1] + "!" for value in values[N // 2 :]]
+        column = pd.Series(values, dtype=object)
+
+        many = N / timeit.timeit(
+            lambda: IdentifierHandler.validate_many(algorithm, column), number=1
+        )
+        print(
+            f"{algorithm.name:<12} {rate(previous, values):>12,.0f}"
+            f" {rate(IdentifierHandler.validator(algorithm), values):>12,.0f}"
+            f" {many:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Requests per second of GET /ticket/<id>, metrics off against on.
+
+    python -m benchmarks.instrumentation
+"""
+import timeit
+import uuid
+
+from flask import Flask
+
+from src.domain.model.ticket import TicketDomain
+from src.infrastructure.broker.mock_broker import MockBrokerClient
+from src.infrastructure.mongo.mock_repository import MockRepositoryClient
+from src.rest.container import Container
+from src.rest.instrumentation import TimedProxy, instrument
+from src.rest.route import ticket
+
+N = 2000
+REPEAT = 5
+
+
+class CopyingRepository(MockRepositoryClient):
+    # The ticket repository renames _id on what it reads
+    def get_by_id(self, identifier, attrs):
+        return dict(self.object)
+
+
+def get_client(metrics: bool):
+    ticket_id = TicketDomain.get_default_identifier().value
+    app = Flask(__name__)
+    app.register_blueprint(ticket.ticket_route)
+    app.config["CONTAINER"] = Container(
+        {
+            "REPOSITORY_MONGO": CopyingRepository({"_id": ticket_id}),
+            "BROKER_OUTBOX": MockBrokerClient(),
+            "METRICS_LAYERS": metrics,
+        }
+    )
+    if metrics:
+        instrument(app)
+    return app.test_client(), ticket_id
+
+
+def request_rate(client, ticket_id) -> float:
+    query = {"write_uid": str(uuid.uuid4())}
+    seconds = timeit.timeit(
+        lambda: client.get(f"/ticket/{ticket_id}", query_string=query), number=N
+    )
+    return N / seconds
+
+
+def main():
+    clients = {metrics: get_client(metrics) for metrics in (False, True)}
+    rates = {metrics: list() for metrics in clients}
+    # Interleaved, both see the same machine load, best run kept
+    for _ in range(REPEAT):
+        for metrics, (client, ticket_id) in clients.items():
+            rates[metrics].append(request_rate(client, ticket_id))
+    off, on = max(rates[False]), max(rates[True])
+    print(f"{'metrics off':<12} {off:>10,.0f} requests/s")
+    print(
+        f"{'metrics on':<12} {on:>10,.0f} requests/s"
+        f"  {(1 / on - 1 / off) * 1e6:.1f} us"
+    )
+
+    repository = MockRepositoryClient({})
+    proxy = TimedProxy(repository, "repository")
+    direct = timeit.timeit(lambda: repository.delete("id"), number=N * 50)
+    timed = timeit.timeit(lambda: proxy.delete("id"), number=N * 50)
+    print(f"{'span':<12} {(timed - direct) / (N * 50) * 1e6:>10.2f} us per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Records formatted per second, previous MyJSONFormatter against the plan.
+
+    python -m benchmarks.json_formatter
+"""
+import datetime as dt
+import logging
+import timeit
+
+from src.infrastructure.logger.logger import LOG_RECORD_BUILTIN_ATTRS, MyJSONFormatter
+
+N = 50000
+FMT_KEYS = {
+    "level": "levelname",
+    "message": "message",
+    "timestamp": "timestamp",
+    "logger": "name",
+    "module": "module",
+    "function": "funcName",
+    "line": "lineno",
+    "thread_name": "threadName",
+}
+
+
+class PreviousJSONFormatter(MyJSONFormatter):
+    def _prepare_log_dict(self, record: logging.LogRecord):
+        always_fields = {
+            "message": record.getMessage(),
+            "timestamp": dt.datetime.fromtimestamp(
+                record.created, tz=dt.timezone.utc
+            ).isoformat(),
+        }
+        if record.exc_info is not None:
+            always_fields["exc_info"] = self.formatException(record.exc_info)
+
+        if record.stack_info is not None:
+            always_fields["stack_info"] = self.formatStack(record.stack_info)
+
+        message = {
+            key: msg_val
+            if (msg_val := always_fields.pop(val, None)) is not None
+            else getattr(record, val)
+            for key, val in self.fmt_keys.items()
+        }
+        message.update(always_fields)
+
+        for key, val in record.__dict__.items():
+            if key not in LOG_RECORD_BUILTIN_ATTRS:
+                message[key] = val
+
+        return message
+
+
+def get_records(extra: dict | None) -> list[logging.LogRecord]:
+    logger = logging.getLogger("benchmark")
+    return [
+        logger.makeRecord(
+            "benchmark", logging.DEBUG, __file__, 1, "read %s", (i,), None, extra=extra
+        )
+        for i in range(N)
+    ]
+
+
+def rate(formatter, records) -> float:
+    return N / timeit.timeit(lambda: [formatter.format(r) for r in records], number=1)
+
+
+def main():
+    previous = PreviousJSONFormatter(fmt_keys=FMT_KEYS)
+    compiled = MyJSONFormatter(fmt_keys=FMT_KEYS)
+    print(f"{'records':<10} {'previous':>12} {'plan':>12}  records/s")
+    for name, extra in (("plain", None), ("extra", {"write_uid": "system"})):
+        records = get_records(extra)
+        print(
+            f"{name:<10} {rate(previous, records):>12,.0f}"
+            f" {rate(compiled, records):>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
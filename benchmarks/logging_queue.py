@@ -0,0 +1,75 @@
+"""Cost of a log call on the request thread, direct handlers against the queue.
+
+    python -m benchmarks.logging_queue
+"""
+import logging
+import logging.handlers
+import os
+import tempfile
+import timeit
+
+from src.infrastructure.logger.logger import (
+    LOG_RECORDS_DROPPED,
+    BatchingRotatingFileHandler,
+    MyJSONFormatter,
+    setup_queue,
+)
+
+N = 20000
+FMT_KEYS = {"level": "levelname", "logger": "name", "thread_name": "threadName"}
+
+
+def previous_handler(path):
+    # The file handler of the previous config.json, rotating every 10 kB
+    return logging.handlers.RotatingFileHandler(
+        os.path.join(path, "previous.log"), maxBytes=10000, backupCount=3
+    )
+
+
+def batching_handler(path):
+    return BatchingRotatingFileHandler(
+        os.path.join(path, "queue.log"), maxBytes=10485760, backupCount=5
+    )
+
+
+def get_logger(name, handler) -> logging.Logger:
+    handler.setFormatter(MyJSONFormatter(fmt_keys=FMT_KEYS))
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = [handler]
+    return logger
+
+
+def log_calls(logger) -> float:
+    def run():
+        for i in range(N):
+            logger.info("ticket %s updated", i, extra={"write_uid": "system"})
+
+    return timeit.timeit(run, number=1)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as path:
+        direct = get_logger("direct", previous_handler(path))
+        seconds = log_calls(direct)
+        print(
+            f"{'direct':<14} {N / seconds:>12,.0f} calls/s"
+            f"  {seconds / N * 1e6:>6.1f} us"
+        )
+
+        for overflow in ("block", "drop"):
+            queued = get_logger(overflow, batching_handler(path))
+            listener = setup_queue(queued, overflow=overflow)
+            dropped = LOG_RECORDS_DROPPED._value.get()
+            seconds = log_calls(queued)
+            listener.stop()
+            dropped = LOG_RECORDS_DROPPED._value.get() - dropped
+            print(
+                f"{'queue ' + overflow:<14} {N / seconds:>12,.0f} calls/s"
+                f"  {seconds / N * 1e6:>6.1f} us  dropped {dropped:,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
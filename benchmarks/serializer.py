@@ -0,0 +1,55 @@
+"""Encoded documents per second, json.dumps(default=str) against serializer.
+
+    python -m benchmarks.serializer
+"""
+import json
+import timeit
+
+from bson import ObjectId
+
+from src.domain.model.ticket import TicketDomain
+from src.utils import serializer
+from src.utils.custom_date import CustomDatetime
+
+N = 500
+REPEAT = 200
+
+
+def page(n: int) -> list[dict]:
+    # A fetch_page worth of tickets as read from mongo, audit fields included
+    now = CustomDatetime.str_now()
+    return [
+        {
+            "_id": ObjectId(),
+            **TicketDomain.as_dict(TicketDomain.get_valid_ticket()),
+            "write_uid": "system",
+            "write_at": now,
+        }
+        for _ in range(n)
+    ]
+
+
+def previous(obj) -> str:
+    return json.dumps(obj, default=str)
+
+
+def rate(func, obj) -> float:
+    return REPEAT / timeit.timeit(lambda: func(obj), number=REPEAT)
+
+
+def main():
+    payloads = {
+        "envelope": {"data": page(N), "statusCode": 200},
+        "row": page(1)[0],
+    }
+    print(f"backend: {serializer.BACKEND}")
+    print(f"{'payload':<10} {'previous':>12} {'serializer':>12}  docs/s")
+    for name, obj in payloads.items():
+        print(
+            f"{name:<10} {rate(previous, obj):>12,.0f}"
+            f" {rate(serializer.dumps, obj):>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ echo "STARTING..."
 
 # Execute Odoo server command in a subshell
 (
-    gunicorn --bind 0.0.0.0:5000 wsgi:app
+    gunicorn --config gunicorn.conf.py --bind 0.0.0.0:5000 wsgi:app
     # Exit with the appropriate code
     exit_code=$?
     echo "Server exited with code: $exit_code"
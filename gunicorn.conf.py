@@ -0,0 +1,36 @@
+import os
+import shutil
+
+# Worker hooks, gunicorn loads this file from the working directory.
+
+
+def on_starting(server):
+    # Multiprocess metrics: files left by a previous run would be added to
+    # this one, the directory must exist before a worker imports the app
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+    # Identifier sequence bits given to the worker slot, inherited by every
+    # worker. Set SONYFLAKE_WORKER_BITS for headroom before adding workers
+    slots = max(server.cfg.workers - 1, 0).bit_length()
+    os.environ.setdefault("SONYFLAKE_WORKER_BITS", str(slots))
+
+
+def pre_fork(server, worker):
+    # Lowest slot not held by a live worker, reused after a restart so the
+    # slots stay unique and within SONYFLAKE_WORKER_BITS
+    taken = {getattr(w, "slot", None) for w in server.WORKERS.values()}
+    worker.slot = next(slot for slot in range(len(taken) + 1) if slot not in taken)
+
+
+def post_fork(server, worker):
+    os.environ["GUNICORN_WORKER_ID"] = str(worker.slot)
+
+
+def child_exit(server, worker):
+    # Drops the live gauges of the worker, its counters keep adding up
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
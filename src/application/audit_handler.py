@@ -1,3 +1,5 @@
+import secrets
+
 from ..domain.identifier_handler import IdentifierHandler
 from ..utils.custom_date import CustomDatetime
 from ..utils.HandlerError import HandlerError
@@ -7,6 +9,9 @@ from .ApplicationError import ApplicationError
 
 class AuditHandler:
     _fields = ["write_uid", "write_at", "create_uid", "create_at"]
+    # New on every create and update, write_at only has one second
+    # resolution and two writes in the same second would share it
+    version_field = "write_version"
 
     @classmethod
     def is_valid(
@@ -53,18 +58,28 @@ class AuditHandler:
 
         return cls.is_valid(**item)
 
+    @staticmethod
+    def next_version() -> str:
+        return secrets.token_hex(8)
+
     @classmethod
     def get_update_fields(cls, identifier: IdentifierHandler) -> dict | HandlerError:
         current_uid = identifier.value
-        return {"write_uid": current_uid, "write_at": CustomDatetime.str_now()}
+        return {
+            "write_uid": current_uid,
+            "write_at": CustomDatetime.str_now(),
+            cls.version_field: cls.next_version(),
+        }
 
     @classmethod
     def get_create_fields(cls, identifier: IdentifierHandler) -> dict | HandlerError:
         now = CustomDatetime.str_now()
         current_uid = identifier.value
-        return cls.is_valid(
+        fields = cls.is_valid(
             current_uid,
             now,
             current_uid,
             now,
         )
+        fields[cls.version_field] = cls.next_version()
+        return fields
@@ -0,0 +1,55 @@
+import base64
+import binascii
+import json
+
+from ..domain.model.status_code import INVALID_FORMAT
+from ..infrastructure.bootstrap import constant
+from .ApplicationError import ApplicationError
+from .criteria import Criteria
+
+
+class ContinuationToken:
+    """Opaque keyset cursor over the primary key.
+
+    Identifiers are time ordered (SonyFlake, ObjectId), so resuming after
+    the last key seen costs the same for every page.
+    """
+
+    @staticmethod
+    def encode(last_id) -> str:
+        raw = json.dumps({"after": last_id}).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode(token: str) -> str | ApplicationError:
+        try:
+            padding = "=" * (-len(token) % 4)
+            raw = base64.urlsafe_b64decode(token + padding)
+            last_id = json.loads(raw)["after"]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise ApplicationError(INVALID_FORMAT, "Invalid continuation token")
+        if not isinstance(last_id, (str, int)):
+            raise ApplicationError(INVALID_FORMAT, "Invalid continuation token")
+        return last_id
+
+    @staticmethod
+    def page_size(size: int = None) -> int:
+        if size is None or size <= 0:
+            return constant.PAGE_SIZE
+        return min(size, constant.MAX_PAGE_SIZE)
+
+    @classmethod
+    def matching(cls, fields: list, pk: str, size: int, token: str = None):
+        matching = Criteria(fields)
+        if token is not None:
+            matching.add((pk, ">", cls.decode(token)))
+        # One extra row tells whether another page exists
+        return matching._order_by(pk)._limit(size + 1)
+
+    @classmethod
+    def page(cls, dataset: list, pk: str, size: int) -> dict:
+        next_token = None
+        if len(dataset) > size:
+            dataset = dataset[:size]
+            next_token = cls.encode(dataset[-1][pk])
+        return {"items": dataset, "next": next_token}
@@ -6,6 +6,10 @@ class CriteriaFilters(Enum):
     OR = "or"
     LIMIT = "limit"
     PAGINATION = "pagination"
+    ORDER = "order"
+
+
+OPERATORS = {"=", "!=", ">", ">=", "<", "<=", "in", "not in"}
 
 
 class Criteria:
@@ -16,6 +20,8 @@ class Criteria:
     def add(self, clause: tuple):
         if clause[0] not in self.fields:
             raise ValueError(f"Invalid field: {clause[0]}")
+        if clause[1] not in OPERATORS:
+            raise ValueError(f"Invalid operator: {clause[1]}")
         self.clauses.append(clause)
         return self
 
@@ -29,12 +35,18 @@ class Criteria:
 
     def _limit(self, value: int):
         if value > 0:
-            self.clauses.append(CriteriaFilters.LIMIT, "=", value)
+            self.clauses.append((CriteriaFilters.LIMIT, "=", value))
         return self
 
     def _pagination(self, page: int, size: int):
         if page > 0 and size > 0:
-            self.clauses.append(CriteriaFilters.PAGINATION, page, size)
+            self.clauses.append((CriteriaFilters.PAGINATION, page, size))
+        return self
+
+    def _order_by(self, field: str, ascending: bool = True):
+        if field not in self.fields:
+            raise ValueError(f"Invalid field: {field}")
+        self.clauses.append((CriteriaFilters.ORDER, field, ascending))
         return self
 
     def __str__(self):
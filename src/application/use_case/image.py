@@ -1,7 +1,12 @@
+import copy
+from typing import Iterator
+
 from ...domain.identifier_handler import IdentifierHandler
 from ...domain.model.image import Image, ImageDomain
 from ..audit_handler import AuditHandler
 from ..BrokerProtocol import BrokerProtocol
+from ..continuation import ContinuationToken
+from ..criteria import Criteria
 from ..RepositoryProtocol import RepositoryProtocol
 
 
@@ -17,8 +22,27 @@ class ImageUseCase:
         self._b = ref_broker
         self._f = list(Image._fields)
 
+    def bind(self, ref_write_uid: IdentifierHandler) -> "ImageUseCase":
+        # Repository and broker are shared, only the audit identity changes
+        use_case = copy.copy(self)
+        use_case._w = ref_write_uid
+        return use_case
+
     def add_audit_fields(self) -> None:
-        self._f += AuditHandler._fields
+        # Rebound, not extended in place: bound copies share the list
+        self._f = self._f + list(AuditHandler._fields)
+
+    def stream(self) -> Iterator[dict]:
+        matching = Criteria(self._f)._order_by(ImageDomain.pk)
+
+        return self._r.stream(self._f, matching)
+
+    def fetch_page(self, size: int = None, token: str = None) -> dict:
+        size = ContinuationToken.page_size(size)
+        matching = ContinuationToken.matching(self._f, ImageDomain.pk, size, token)
+
+        dataset = self._r.fetch(self._f, matching)
+        return ContinuationToken.page(dataset, ImageDomain.pk, size)
 
     def create(self, obj: Image) -> None:
         item = ImageDomain.as_dict(obj)
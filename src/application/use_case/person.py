@@ -1,9 +1,16 @@
+import copy
+from typing import AsyncIterator, Iterable, Iterator
+
+import pandas as pd
+
 from ...domain.identifier_handler import IdentifierHandler
 from ...domain.model.person import Person, PersonDomain
 from ...domain.model.status_code import DB_ID_NOT_FOUND, INVALID_FORMAT
+from ...infrastructure.bootstrap import constant
 from ..ApplicationError import ApplicationError
 from ..audit_handler import AuditHandler
 from ..BrokerProtocol import BrokerProtocol
+from ..continuation import ContinuationToken
 from ..criteria import Criteria
 from ..RepositoryProtocol import RepositoryProtocol
 
@@ -20,37 +27,91 @@ class PersonUseCase:
         self._b = ref_broker
         self._f = list(Person._fields)
 
+    def bind(self, ref_write_uid: IdentifierHandler) -> "PersonUseCase":
+        # Repository and broker are shared, only the audit identity changes
+        use_case = copy.copy(self)
+        use_case._w = ref_write_uid
+        return use_case
+
     def add_audit_fields(self) -> None:
-        self._f += AuditHandler._fields
+        # Rebound, not extended in place: bound copies share the list
+        self._f = self._f + list(AuditHandler._fields)
 
     def from_list(self, keys: list, data: list) -> Person:
         return [PersonDomain.from_dict(item) for item in zip(keys, data)]
 
-    def fetch(self, limit: int) -> list[dict]:
-        matching = Criteria(self._f)
-        matching._limit(limit)
+    def fetch(self, limit: int, page: int = 0) -> list[dict]:
+        return self._r.fetch(self._f, self._list_matching(limit, page))
+
+    def stream(self) -> Iterator[dict]:
+        return self._r.stream(self._f, self._stream_matching())
+
+    def fetch_page(self, size: int = None, token: str = None) -> dict:
+        size, matching = self._page_matching(size, token)
 
-        return self._r.fetch(self._f, matching)
+        dataset = self._r.fetch(self._f, matching)
+        return ContinuationToken.page(dataset, PersonDomain.pk, size)
 
     def get_by_id(self, obj_id: IdentifierHandler) -> dict:
         return self._r.get_by_id(obj_id.value, self._f)
 
+    def get_version(self, obj_id: IdentifierHandler) -> str | None:
+        # Projection on the version field only, the document is not read
+        item = self._r.get_by_id(obj_id.value, [AuditHandler.version_field])
+        return self._version_of(item)
+
+    def get_by_id_with_version(
+        self, obj_id: IdentifierHandler
+    ) -> tuple[dict | None, str | None]:
+        item = self._r.get_by_id(obj_id.value, self._version_projection())
+        return self._split_version(item)
+
+    # Sync and async share everything but the IO, fixes land in both at once
+
+    def _list_matching(self, limit: int, page: int = 0) -> Criteria:
+        matching = Criteria(self._f)
+        if page > 0:
+            matching._pagination(page, limit)
+        else:
+            matching._limit(limit)
+        return matching
+
+    def _stream_matching(self) -> Criteria:
+        return Criteria(self._f)._order_by(PersonDomain.pk)
+
+    def _page_matching(self, size: int, token: str) -> tuple[int, Criteria]:
+        size = ContinuationToken.page_size(size)
+        return size, ContinuationToken.matching(self._f, PersonDomain.pk, size, token)
+
+    def _version_projection(self) -> list:
+        field = AuditHandler.version_field
+        return self._f if field in self._f else self._f + [field]
+
+    def _split_version(self, item: dict | None) -> tuple[dict | None, str | None]:
+        # The version leaves the item only when it was not asked for
+        if item is None:
+            return None, None
+        field = AuditHandler.version_field
+        if field in self._f:
+            return item, item.get(field)
+        return item, item.pop(field, None)
+
+    @staticmethod
+    def _version_of(item: dict | None) -> str | None:
+        return item.get(AuditHandler.version_field) if item else None
+
     def delete(self, obj_id: IdentifierHandler) -> None | ApplicationError:
-        identifier = obj_id.person_id
-        if not self._r.entity_exists(identifier):
+        # The filter on the identifier is the existence check: one round trip
+        if self._r.delete(obj_id.value) == 0:
             raise ApplicationError(DB_ID_NOT_FOUND, "Entity not exists")
 
-        return self._r.delete(identifier)
-
     def update(self, obj: Person) -> None | ApplicationError:
         identifier = obj.person_id
-        if not self._r.entity_exists(identifier):
-            raise ApplicationError(DB_ID_NOT_FOUND, "Entity not exists")
-
         item = PersonDomain.as_dict(obj)
         item.update(AuditHandler.get_update_fields(self._w))
 
-        return self._r.update(identifier, item)
+        if self._r.update(identifier, item) == 0:
+            raise ApplicationError(DB_ID_NOT_FOUND, "Entity not exists")
 
     def create(self, obj: Person) -> None:
         item = PersonDomain.as_dict(obj)
@@ -64,7 +125,7 @@ class PersonUseCase:
             try:
                 PersonDomain.is_valid(item)
             except Exception as de:
-                errors(f"{idx}: {str(de)}")
+                errors.append(f"{idx}: {str(de)}")
                 continue
 
         if len(errors) > 0:
@@ -75,3 +136,88 @@ class PersonUseCase:
             item.update(audit)
 
         return self._r.insert_many(data)
+
+    def import_frames(
+        self,
+        frames: Iterable[pd.DataFrame],
+        batch_size: int = constant.BULK_BATCH_SIZE,
+    ) -> dict:
+        report = {"inserted": 0, "failed": 0, "errors": list()}
+        audit = AuditHandler.get_create_fields(self._w)
+
+        for frame in frames:
+            # Validate the whole chunk at once, rows keep their frame index
+            frame = PersonDomain.from_frame(frame)
+            valid, messages = PersonDomain.validate_many(frame)
+            for row, message in messages[~valid].items():
+                self._report_error(report, int(row), message)
+
+            items = frame[valid].to_dict("records")
+            rows = [int(row) for row in frame.index[valid]]
+            for start in range(0, len(items), batch_size):
+                batch = items[start : start + batch_size]
+                for item in batch:
+                    item.update(audit)
+                self._write_batch(report, batch, rows[start : start + batch_size])
+
+        return report
+
+    def _write_batch(self, report: dict, batch: list, batch_rows: list) -> None:
+        inserted, errors = self._r.bulk_insert(batch)
+        report["inserted"] += inserted
+        for error in errors:
+            self._report_error(report, batch_rows[error["index"]], error["message"])
+
+    @staticmethod
+    def _report_error(report: dict, row: int, message: str) -> None:
+        # Keep the report bounded, the count stays exact
+        report["failed"] += 1
+        if len(report["errors"]) < constant.IMPORT_MAX_ERRORS:
+            report["errors"].append({"row": row, "error": message})
+
+
+class AsyncPersonUseCase(PersonUseCase):
+    """Same rules as PersonUseCase, for the awaitable repository and broker."""
+
+    async def fetch(self, limit: int, page: int = 0) -> list[dict]:
+        return await self._r.fetch(self._f, self._list_matching(limit, page))
+
+    def stream(self) -> AsyncIterator[dict]:
+        return self._r.stream(self._f, self._stream_matching())
+
+    async def fetch_page(self, size: int = None, token: str = None) -> dict:
+        size, matching = self._page_matching(size, token)
+
+        dataset = await self._r.fetch(self._f, matching)
+        return ContinuationToken.page(dataset, PersonDomain.pk, size)
+
+    async def get_by_id(self, obj_id: IdentifierHandler) -> dict:
+        return await self._r.get_by_id(obj_id.value, self._f)
+
+    async def get_version(self, obj_id: IdentifierHandler) -> str | None:
+        item = await self._r.get_by_id(obj_id.value, [AuditHandler.version_field])
+        return self._version_of(item)
+
+    async def get_by_id_with_version(
+        self, obj_id: IdentifierHandler
+    ) -> tuple[dict | None, str | None]:
+        item = await self._r.get_by_id(obj_id.value, self._version_projection())
+        return self._split_version(item)
+
+    async def delete(self, obj_id: IdentifierHandler) -> None | ApplicationError:
+        if await self._r.delete(obj_id.value) == 0:
+            raise ApplicationError(DB_ID_NOT_FOUND, "Entity not exists")
+
+    async def update(self, obj: Person) -> None | ApplicationError:
+        identifier = obj.person_id
+        item = PersonDomain.as_dict(obj)
+        item.update(AuditHandler.get_update_fields(self._w))
+
+        if await self._r.update(identifier, item) == 0:
+            raise ApplicationError(DB_ID_NOT_FOUND, "Entity not exists")
+
+    async def create(self, obj: Person) -> None:
+        item = PersonDomain.as_dict(obj)
+        item.update(AuditHandler.get_create_fields(self._w))
+
+        return await self._r.create(item)
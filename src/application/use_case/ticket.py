@@ -1,9 +1,15 @@
+import copy
+from typing import AsyncIterator, Iterator
+
+from ...domain.enum.ticket_event import TicketEvent
 from ...domain.identifier_handler import IdentifierHandler
 from ...domain.model.ticket import Ticket, TicketDomain
 from ...domain.model.status_code import DB_ID_NOT_FOUND
+from ...utils import serializer
 from ..ApplicationError import ApplicationError
 from ..audit_handler import AuditHandler
 from ..BrokerProtocol import BrokerProtocol
+from ..continuation import ContinuationToken
 from ..criteria import Criteria
 from ..RepositoryProtocol import RepositoryProtocol
 
@@ -20,40 +26,167 @@ class TicketUseCase:
         self._b = ref_broker
         self._f = list(Ticket._fields)
 
+    def bind(self, ref_write_uid: IdentifierHandler) -> "TicketUseCase":
+        # Repository and broker are shared, only the audit identity changes
+        use_case = copy.copy(self)
+        use_case._w = ref_write_uid
+        return use_case
+
     def add_audit_fields(self) -> None:
-        self._f += AuditHandler._fields
+        # Rebound, not extended in place: bound copies share the list
+        self._f = self._f + list(AuditHandler._fields)
 
     def from_list(self, keys: list, data: list) -> Ticket:
         return [TicketDomain.from_dict(item) for item in zip(keys, data)]
 
-    def fetch(self, limit: int) -> list[dict]:
-        matching = Criteria(self._f)
-        matching._limit(limit)
+    def fetch(self, limit: int, page: int = 0) -> list[dict]:
+        return self._r.fetch(self._f, self._list_matching(limit, page))
 
-        return self._r.fetch(self._f, matching)
+    def stream(self) -> Iterator[dict]:
+        return self._r.stream(self._f, self._stream_matching())
+
+    def fetch_page(self, size: int = None, token: str = None) -> dict:
+        size, matching = self._page_matching(size, token)
+
+        dataset = self._r.fetch(self._f, matching)
+        return ContinuationToken.page(dataset, TicketDomain.pk, size)
 
     def get_by_id(self, obj_id: IdentifierHandler) -> dict:
         return self._r.get_by_id(obj_id.value, self._f)
 
+    def get_version(self, obj_id: IdentifierHandler) -> str | None:
+        # Projection on the version field only, the document is not read
+        item = self._r.get_by_id(obj_id.value, [AuditHandler.version_field])
+        return self._version_of(item)
+
+    def get_by_id_with_version(
+        self, obj_id: IdentifierHandler
+    ) -> tuple[dict | None, str | None]:
+        item = self._r.get_by_id(obj_id.value, self._version_projection())
+        return self._split_version(item)
+
+    # Sync and async share everything but the IO, fixes land in both at once
+
+    def _list_matching(self, limit: int, page: int = 0) -> Criteria:
+        matching = Criteria(self._f)
+        if page > 0:
+            matching._pagination(page, limit)
+        else:
+            matching._limit(limit)
+        return matching
+
+    def _stream_matching(self) -> Criteria:
+        return Criteria(self._f)._order_by(TicketDomain.pk)
+
+    def _page_matching(self, size: int, token: str) -> tuple[int, Criteria]:
+        size = ContinuationToken.page_size(size)
+        return size, ContinuationToken.matching(self._f, TicketDomain.pk, size, token)
+
+    def _version_projection(self) -> list:
+        field = AuditHandler.version_field
+        return self._f if field in self._f else self._f + [field]
+
+    def _split_version(self, item: dict | None) -> tuple[dict | None, str | None]:
+        # The version leaves the item only when it was not asked for
+        if item is None:
+            return None, None
+        field = AuditHandler.version_field
+        if field in self._f:
+            return item, item.get(field)
+        return item, item.pop(field, None)
+
+    @staticmethod
+    def _version_of(item: dict | None) -> str | None:
+        return item.get(AuditHandler.version_field) if item else None
+
     def delete(self, obj_id: IdentifierHandler) -> None | ApplicationError:
-        identifier = obj_id.ticket_id
-        if not self._r.entity_exists(identifier):
+        # The filter on the identifier is the existence check: one round trip
+        if self._r.delete(obj_id.value) == 0:
             raise ApplicationError(DB_ID_NOT_FOUND, "Entity not exists")
 
-        return self._r.delete(identifier)
+        self._publish(TicketEvent.DELETED, {TicketDomain.pk: obj_id.value})
 
     def update(self, obj: Ticket) -> None | ApplicationError:
         identifier = obj.ticket_id
-        if not self._r.entity_exists(identifier):
+        item = TicketDomain.as_dict(obj)
+        item.update(AuditHandler.get_update_fields(self._w))
+
+        # The repository renames or drops the pk on what it is given
+        if self._r.update(identifier, dict(item)) == 0:
+            raise ApplicationError(DB_ID_NOT_FOUND, "Entity not exists")
+
+        self._publish(TicketEvent.UPDATED, item)
+
+    def create(self, obj: Ticket) -> None:
+        item = TicketDomain.as_dict(obj)
+        item.update(AuditHandler.get_create_fields(self._w))
+
+        result = self._r.create(dict(item))
+        self._publish(TicketEvent.CREATED, item)
+        return result
+
+    def _publish(self, event: TicketEvent, item: dict) -> None:
+        # Without BROKER the write is already saved, there is no one to tell
+        if self._b is None:
+            return
+        # Only enqueued here, the broker round trip happens off the request
+        self._b.publish(event, serializer.dumps(item))
+
+
+class AsyncTicketUseCase(TicketUseCase):
+    """Same rules as TicketUseCase, for the awaitable repository and broker."""
+
+    async def fetch(self, limit: int, page: int = 0) -> list[dict]:
+        return await self._r.fetch(self._f, self._list_matching(limit, page))
+
+    def stream(self) -> AsyncIterator[dict]:
+        return self._r.stream(self._f, self._stream_matching())
+
+    async def fetch_page(self, size: int = None, token: str = None) -> dict:
+        size, matching = self._page_matching(size, token)
+
+        dataset = await self._r.fetch(self._f, matching)
+        return ContinuationToken.page(dataset, TicketDomain.pk, size)
+
+    async def get_by_id(self, obj_id: IdentifierHandler) -> dict:
+        return await self._r.get_by_id(obj_id.value, self._f)
+
+    async def get_version(self, obj_id: IdentifierHandler) -> str | None:
+        item = await self._r.get_by_id(obj_id.value, [AuditHandler.version_field])
+        return self._version_of(item)
+
+    async def get_by_id_with_version(
+        self, obj_id: IdentifierHandler
+    ) -> tuple[dict | None, str | None]:
+        item = await self._r.get_by_id(obj_id.value, self._version_projection())
+        return self._split_version(item)
+
+    async def delete(self, obj_id: IdentifierHandler) -> None | ApplicationError:
+        if await self._r.delete(obj_id.value) == 0:
             raise ApplicationError(DB_ID_NOT_FOUND, "Entity not exists")
 
+        await self._publish(TicketEvent.DELETED, {TicketDomain.pk: obj_id.value})
+
+    async def update(self, obj: Ticket) -> None | ApplicationError:
+        identifier = obj.ticket_id
         item = TicketDomain.as_dict(obj)
         item.update(AuditHandler.get_update_fields(self._w))
 
-        return self._r.update(identifier, item)
+        if await self._r.update(identifier, dict(item)) == 0:
+            raise ApplicationError(DB_ID_NOT_FOUND, "Entity not exists")
 
-    def create(self, obj: Ticket) -> None:
+        await self._publish(TicketEvent.UPDATED, item)
+
+    async def create(self, obj: Ticket) -> None:
         item = TicketDomain.as_dict(obj)
         item.update(AuditHandler.get_create_fields(self._w))
 
-        return self._r.create(item)
+        result = await self._r.create(dict(item))
+        await self._publish(TicketEvent.CREATED, item)
+        return result
+
+    async def _publish(self, event: TicketEvent, item: dict) -> None:
+        if self._b is None:
+            return
+        # Awaited on the event loop, other requests run meanwhile
+        await self._b.publish(event, serializer.dumps(item))
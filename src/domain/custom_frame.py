@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+
+class CustomFrame:
+    @staticmethod
+    def column(frame: pd.DataFrame, name: str) -> pd.Series:
+        # Missing columns behave like a column of None
+        if name in frame:
+            return frame[name].astype(object)
+        return pd.Series(None, index=frame.index, dtype=object)
+
+    @staticmethod
+    def is_text(column: pd.Series) -> pd.Series:
+        return column.map(lambda value: isinstance(value, str)).astype(bool)
+
+    @staticmethod
+    def contains(column: pd.Series, pattern: str) -> pd.Series:
+        found = column.astype(str).str.contains(pattern, regex=True)
+        return column.notna() & found.astype(bool)
+
+    @staticmethod
+    def is_member(column: pd.Series, enum_class) -> pd.Series:
+        return column.notna() & column.isin([item.value for item in enum_class])
+
+    @staticmethod
+    def failed_messages(column: pd.Series, failed: pd.Series, check) -> pd.Series:
+        # Scalar checks only run on the rows that already failed
+        messages = pd.Series(None, index=column.index, dtype=object)
+        for position in np.flatnonzero(failed.to_numpy(dtype=bool)):
+            messages.iat[position] = check(column.iat[position])[1]
+        return messages
+
+    @classmethod
+    def check_dates(cls, column: pd.Series, date_class) -> tuple[pd.Series, pd.Series]:
+        text = cls.is_text(column)
+        parsed = pd.to_datetime(
+            column.where(text), format=date_class.str_format, errors="coerce"
+        )
+        failed = (column.notna() & parsed.isna()).to_numpy(dtype=bool, copy=True)
+        messages = pd.Series(None, index=column.index, dtype=object)
+        # Whatever pandas rejects is confirmed by the scalar parser
+        for position in np.flatnonzero(failed):
+            is_ok, err = date_class.check_format(column.iat[position])
+            failed[position] = not is_ok
+            messages.iat[position] = err
+
+        return pd.Series(failed, index=column.index), messages
+
+    @staticmethod
+    def collect_errors(
+        frame: pd.DataFrame, checks: list[tuple[pd.Series, str | pd.Series]]
+    ) -> tuple[pd.Series, pd.Series]:
+        """Join the failed checks per row, in the order they were declared.
+
+        Returns the valid mask and the error message of every row, empty
+        for valid rows.
+        """
+        errors = [list() for _ in range(len(frame))]
+        for failed, message in checks:
+            for position in np.flatnonzero(failed.to_numpy(dtype=bool)):
+                errors[position].append(
+                    message if isinstance(message, str) else message.iat[position]
+                )
+
+        messages = pd.Series(
+            ["\n".join(row) for row in errors], index=frame.index, dtype=object
+        )
+        return messages.eq(""), messages
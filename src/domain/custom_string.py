@@ -1,4 +1,6 @@
 import re
+import sys
+from functools import cache
 
 
 class CustomString:
@@ -8,6 +10,17 @@ class CustomString:
             return True
         return False
 
+    @staticmethod
+    @cache
+    def digit_pattern() -> str:
+        # Character class equivalent to str.isdigit, \d only covers decimals
+        extra = (
+            character
+            for character in map(chr, range(sys.maxunicode + 1))
+            if character.isdigit() and not character.isdecimal()
+        )
+        return "[\\d" + re.escape("".join(extra)) + "]"
+
     @staticmethod
     def validate_email_syntax(email):
         pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
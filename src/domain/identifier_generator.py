@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+from uuid import uuid4
+
+from bson import ObjectId
+from nanoid import generate
+from sonyflake import SonyFlake
+from sonyflake.sonyflake import BIT_LEN_SEQUENCE, lower_16bit_private_ip
+
+from .enum.identifier_algorithm import IdentifierAlgorithm
+
+
+class TickSonyFlake(SonyFlake):
+    """SonyFlake whose 8 bit sequence is shared with the worker slot.
+
+    The upper worker_bits of the sequence hold the slot, the rest count
+    the identifiers of one 10 ms tick. The workers of a host split the
+    256 identifiers per tick of its machine id between them.
+    """
+
+    worker = 0
+    worker_bits = 0
+    counter = (1 << BIT_LEN_SEQUENCE) - 1
+
+    @classmethod
+    def for_worker(
+        cls, machine_id: int, worker: int = 0, worker_bits: int = 0
+    ) -> "TickSonyFlake":
+        if not 0 <= worker_bits < BIT_LEN_SEQUENCE:
+            raise ValueError(f"worker_bits must be below {BIT_LEN_SEQUENCE}")
+        if not 0 <= worker < 1 << worker_bits:
+            raise ValueError(f"worker slot {worker} needs more than {worker_bits} bits")
+
+        sony_flake = cls(machine_id=lambda: machine_id)
+        sony_flake.worker = worker
+        sony_flake.worker_bits = worker_bits
+        # Full counter: the first id waits for the next tick, like SonyFlake
+        sony_flake.counter = (1 << (BIT_LEN_SEQUENCE - worker_bits)) - 1
+        return sony_flake
+
+    def next_id(self) -> int:
+        counter_bits = BIT_LEN_SEQUENCE - self.worker_bits
+        mask = (1 << counter_bits) - 1
+        with self.mutex:
+            current = self.current_elapsed_time()
+            if self.elapsed_time < current:
+                self.elapsed_time = current
+                self.counter = 0
+            else:
+                self.counter = (self.counter + 1) & mask
+                if self.counter == 0:
+                    self.elapsed_time += 1
+                    time.sleep(self.sleep_time(self.elapsed_time - current))
+            self.sequence = (self.worker << counter_bits) | self.counter
+            return self.to_id()
+
+    @staticmethod
+    def sleep_time(duration: int) -> float:
+        # Wait for the next 10 ms tick, sonyflake-py waits ten times longer
+        return (duration - (time.time() * 100) % 1) / 100
+
+
+class IdentifierGenerator:
+    """Process wide source of new identifiers for every IdentifierAlgorithm.
+
+    A single SonyFlake per process keeps its sequence, so identifiers
+    drawn in the same tick never collide. Its machine id is the lower 16
+    bits of the private address, or SONYFLAKE_MACHINE_ID, and must be
+    unique among the hosts writing to the same collections: hosts on
+    different networks such as 172.17.0.2 and 172.18.0.2 need
+    SONYFLAKE_MACHINE_ID. Gunicorn workers of a host are told apart by
+    their slot, set by gunicorn.conf.py, in the upper SONYFLAKE_WORKER_BITS
+    of the sequence. Two processes of one host outside gunicorn share
+    the machine id and the sequence, they can collide.
+    """
+
+    _lock = threading.Lock()
+    _pid = None
+    _sony_flake = None
+
+    @classmethod
+    def _reset(cls):
+        cls._lock = threading.Lock()
+        cls._pid = None
+        cls._sony_flake = None
+
+    @staticmethod
+    def machine_id() -> int:
+        configured = os.getenv("SONYFLAKE_MACHINE_ID")
+        if configured is None:
+            return lower_16bit_private_ip()
+        machine_id = int(configured)
+        if not 0 <= machine_id <= 0xFFFF:
+            raise ValueError("SONYFLAKE_MACHINE_ID must fit in 16 bits")
+        return machine_id
+
+    @staticmethod
+    def worker_slot() -> tuple[int, int]:
+        # Slot and its width, a single process keeps the whole sequence
+        worker = os.getenv("GUNICORN_WORKER_ID")
+        if worker is None:
+            return 0, 0
+        return int(worker), int(os.getenv("SONYFLAKE_WORKER_BITS", 4))
+
+    @classmethod
+    def sony_flake(cls) -> SonyFlake:
+        if cls._pid != os.getpid():
+            with cls._lock:
+                if cls._pid != os.getpid():
+                    cls._sony_flake = TickSonyFlake.for_worker(
+                        cls.machine_id(), *cls.worker_slot()
+                    )
+                    cls._pid = os.getpid()
+        return cls._sony_flake
+
+    @classmethod
+    def next_id(cls, algorithm: IdentifierAlgorithm) -> str:
+        return cls.next_ids(algorithm, 1)[0]
+
+    @classmethod
+    def next_ids(cls, algorithm: IdentifierAlgorithm, n: int) -> list[str]:
+        if algorithm == IdentifierAlgorithm.SONY_FLAKE:
+            sf = cls.sony_flake()
+            return [str(sf.next_id()) for _ in range(n)]
+        if algorithm == IdentifierAlgorithm.OBJECT_ID:
+            # ObjectId() adds a counter, from_datetime would only keep the time
+            return [str(ObjectId()) for _ in range(n)]
+        if algorithm == IdentifierAlgorithm.NANO_ID:
+            return [generate() for _ in range(n)]
+        if algorithm == IdentifierAlgorithm.UUID_V4:
+            return [str(uuid4()) for _ in range(n)]
+        return ["N/A"] * n
+
+
+os.register_at_fork(after_in_child=IdentifierGenerator._reset)
@@ -1,13 +1,92 @@
-from datetime import datetime
-from uuid import UUID, uuid4
+import re
+import string
+from collections import namedtuple
+from functools import cache
 
+import numpy as np
+import pandas as pd
 from bson import ObjectId
-from nanoid import generate
-from sonyflake import SonyFlake
 
 from .model.status_code import ID_NOT_VALID
 from .DomainError import DomainError
 from .enum.identifier_algorithm import IdentifierAlgorithm
+from .identifier_generator import IdentifierGenerator
+
+IdentifierFormat = namedtuple(
+    "IdentifierFormat",
+    [
+        "length",
+        "pattern",
+        "table",
+        "check",
+    ],
+)
+
+# Character classes used by the formats, any other character is literal
+FORMAT_CLASSES = {
+    "x": string.hexdigits,
+    "d": string.digits,
+    "n": string.ascii_letters + string.digits + "_-",
+    "v": "89abAB",
+}
+
+
+def compile_format(layout: str) -> IdentifierFormat:
+    """Compile a layout, one character per position, into a check for
+    single values and a position by character table for whole columns."""
+    allowed = [FORMAT_CLASSES.get(character, character) for character in layout]
+    pattern = re.compile("".join(f"[{re.escape(chars)}]" for chars in allowed))
+    length = len(layout)
+    fullmatch = pattern.fullmatch
+
+    # One class on every position: no per position match, a scan for any
+    # character outside the class, or isdigit for digits
+    if len(set(layout)) == 1 and allowed[0] == string.digits:
+
+        def check(identifier) -> bool:
+            return (
+                isinstance(identifier, str)
+                and len(identifier) == length
+                and identifier.isascii()
+                and identifier.isdigit()
+            )
+
+    elif len(set(layout)) == 1:
+        outside = re.compile(f"[^{re.escape(allowed[0])}]").search
+
+        def check(identifier) -> bool:
+            return (
+                isinstance(identifier, str)
+                and len(identifier) == length
+                and outside(identifier) is None
+            )
+
+    else:
+
+        def check(identifier) -> bool:
+            return (
+                isinstance(identifier, str)
+                and len(identifier) == length
+                and fullmatch(identifier) is not None
+            )
+
+    # Column 256 stands for every character outside latin-1: never allowed
+    table = np.zeros((length, 257), dtype=bool)
+    for position, chars in enumerate(allowed):
+        table[position, [ord(character) for character in chars]] = True
+
+    return IdentifierFormat(length, pattern, table, check)
+
+
+# Text form generated for each algorithm
+IDENTIFIER_FORMATS = {
+    IdentifierAlgorithm.UUID_V4: compile_format(
+        "xxxxxxxx-xxxx-4xxx-vxxx-xxxxxxxxxxxx"
+    ),
+    IdentifierAlgorithm.SONY_FLAKE: compile_format("d" * 18),
+    IdentifierAlgorithm.OBJECT_ID: compile_format("x" * 24),
+    IdentifierAlgorithm.NANO_ID: compile_format("n" * 21),
+}
 
 
 class IdentifierHandler:
@@ -30,78 +109,112 @@ class IdentifierHandler:
         default = functions[algorithm.value]()
         return cls(algorithm, default)
 
+    @classmethod
+    def get_default_identifiers(cls, algorithm: IdentifierAlgorithm, n: int):
+        return [
+            cls(algorithm, value)
+            for value in IdentifierGenerator.next_ids(algorithm, n)
+        ]
+
     @staticmethod
     def get_sony_flake():
-        sf = SonyFlake()
-        return str(sf.next_id())
+        return IdentifierGenerator.next_id(IdentifierAlgorithm.SONY_FLAKE)
 
     @staticmethod
     def get_object_id():
-        now = datetime.now()
-        return str(ObjectId.from_datetime(now))
+        return IdentifierGenerator.next_id(IdentifierAlgorithm.OBJECT_ID)
 
     @staticmethod
     def get_nanoid():
-        return generate()
+        return IdentifierGenerator.next_id(IdentifierAlgorithm.NANO_ID)
 
     @staticmethod
     def get_default():
-        return "N/A"
+        return IdentifierGenerator.next_id(IdentifierAlgorithm.DEFAULT)
 
     @staticmethod
     def get_uuid_v4():
-        return str(uuid4())
+        return IdentifierGenerator.next_id(IdentifierAlgorithm.UUID_V4)
 
     @classmethod
     def is_valid(cls, algorithm: IdentifierAlgorithm, identifier) -> None | DomainError:
         if identifier is None:
             raise DomainError(ID_NOT_VALID, "Is Empty")
 
-        validator = [
-            cls.is_valid_default,
-            cls.is_valid_uuid_v4,
-            cls.is_valid_snowflake,
-            cls.is_valid_object_id,
-            cls.is_valid_nano_id,
-        ]
-        if not validator[algorithm.value](identifier):
+        if not cls.validator(algorithm)(identifier):
             raise DomainError(ID_NOT_VALID, "Algorithm does not match")
         return cls(algorithm, identifier)
 
+    @classmethod
+    @cache
+    def validator(cls, algorithm: IdentifierAlgorithm):
+        # Resolved once per algorithm, text formats use the compiled check
+        if algorithm == IdentifierAlgorithm.DEFAULT:
+            return cls.is_valid_default
+        if algorithm == IdentifierAlgorithm.OBJECT_ID:
+            return cls.is_valid_object_id
+        return IDENTIFIER_FORMATS[algorithm].check
+
+    @classmethod
+    def validate_many(
+        cls, algorithm: IdentifierAlgorithm, identifiers: pd.Series
+    ) -> pd.Series:
+        # Column wise validator, None and NA are never valid
+        present = identifiers.notna()
+        if algorithm not in IDENTIFIER_FORMATS:
+            return present
+
+        layout = IDENTIFIER_FORMATS[algorithm]
+        values = identifiers.tolist()
+        text = np.fromiter(
+            (isinstance(value, str) for value in values), dtype=bool, count=len(values)
+        )
+
+        # Fixed width code points, one row per value. Shorter values are
+        # padded with 0, never allowed, the spare column flags longer ones.
+        width = layout.length + 1
+        codes = (
+            np.array(
+                [value if is_text else "" for value, is_text in zip(values, text)],
+                dtype=f"<U{width}",
+            )
+            .view(np.uint32)
+            .reshape(-1, width)
+        )
+        cells = np.minimum(codes[:, : layout.length], 256) + np.arange(
+            0, layout.length * 257, 257
+        )
+        valid = pd.Series(
+            (codes[:, layout.length] == 0) & layout.table.ravel()[cells].all(axis=1),
+            index=identifiers.index,
+        )
+
+        # Non text values (ObjectId instances, bytes) take the scalar path
+        other = present & ~pd.Series(text, index=identifiers.index)
+        if other.any():
+            valid[other] = identifiers[other].map(cls.validator(algorithm))
+        return valid.astype(bool)
+
     @staticmethod
     def is_valid_default(identifier):
         return True
 
     @staticmethod
     def is_valid_snowflake(identifier: str):
-        if not isinstance(identifier, str):
-            return False
-        if len(identifier) != 18:
-            return False
-        return True
+        return IDENTIFIER_FORMATS[IdentifierAlgorithm.SONY_FLAKE].check(identifier)
 
     @staticmethod
     def is_valid_object_id(identifier):
-        try:
-            ObjectId(identifier)
+        if isinstance(identifier, ObjectId):
             return True
-        except ValueError:
-            return False
+        if isinstance(identifier, bytes):
+            return len(identifier) == 12
+        return IDENTIFIER_FORMATS[IdentifierAlgorithm.OBJECT_ID].check(identifier)
 
     @staticmethod
     def is_valid_nano_id(identifier: str):
-        if not isinstance(identifier, str):
-            return False
-        if len(identifier) != 21:
-            return False
-        return True
+        return IDENTIFIER_FORMATS[IdentifierAlgorithm.NANO_ID].check(identifier)
 
     @staticmethod
     def is_valid_uuid_v4(identifier):
-        if not isinstance(identifier, str):
-            return False
-        try:
-            UUID(identifier, version=4)
-            return True
-        except ValueError:
-            return False
+        return IDENTIFIER_FORMATS[IdentifierAlgorithm.UUID_V4].check(identifier)
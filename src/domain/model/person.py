@@ -1,9 +1,12 @@
 from collections import namedtuple
 
+import pandas as pd
+
 from ...infrastructure.bootstrap import constant
 from ...utils.custom_date import CustomDate
 from .status_code import FIELD_REQUIRED, ID_NOT_FOUND, INVALID_FORMAT
 from ..custom_dict import CustomDict
+from ..custom_frame import CustomFrame
 from ..custom_string import CustomString
 from ..DomainError import DomainError
 from ..enum.contact_type import ContactType
@@ -81,6 +84,22 @@ class PersonDomain:
         cls.is_valid(**item)
         return Person(**item)
 
+    @staticmethod
+    def from_frame(frame: pd.DataFrame) -> pd.DataFrame:
+        # Column wise from_dict: extra columns are folded into attrs
+        fields = [k for k in Person._fields if k != "attrs"]
+        extras = [k for k in frame.columns if k not in Person._fields]
+
+        item = pd.DataFrame(
+            {k: CustomFrame.column(frame, k) for k in fields}, index=frame.index
+        )
+        item = item.where(item.notna(), None)
+        item["attrs"] = [
+            {k: v for k, v in zip(extras, values) if pd.notna(v)}
+            for values in frame[extras].itertuples(index=False)
+        ]
+        return item
+
     @classmethod
     def is_valid(
         cls,
@@ -111,7 +130,8 @@ class PersonDomain:
                 errors.append("last_name contain numbers")
 
         if contact_type is not None:
-            if not ContactType.has_value(contact_type):
+            is_ok, _ = ContactType.has_value(contact_type)
+            if not is_ok:
                 errors.append("Invalid contact type")
 
         if birthdate is not None and not (birthdate == CustomDate.not_available()):
@@ -121,7 +141,7 @@ class PersonDomain:
 
         if (
             document_number is not None
-            and not isinstance(document_number, str)
+            and isinstance(document_number, str)
             and not (document_number == constant.NOT_AVAILABLE)
         ):
             if not document_number.isalnum():
@@ -134,6 +154,54 @@ class PersonDomain:
         if len(errors) > 0:
             raise DomainError(INVALID_FORMAT, "\n".join(errors))
 
+    @classmethod
+    def validate_many(cls, frame: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+        """Column wise is_valid, one column per Person field.
+
+        Missing columns and NA cells are treated as None. Returns the valid
+        mask and the joined error messages of every row.
+        """
+        person_id = CustomFrame.column(frame, "person_id")
+        name = CustomFrame.column(frame, "name")
+        last_name = CustomFrame.column(frame, "last_name")
+        contact_type = CustomFrame.column(frame, "contact_type")
+        birthdate = CustomFrame.column(frame, "birthdate")
+        document_number = CustomFrame.column(frame, "document_number")
+        attrs = CustomFrame.column(frame, "attrs")
+
+        digits = CustomString.digit_pattern()
+        valid_id = IdentifierHandler.validate_many(cls.algorithm, person_id)
+        dates = birthdate.where(birthdate.ne(CustomDate.not_available()))
+        bad_date, date_errors = CustomFrame.check_dates(dates, CustomDate)
+        document = document_number.where(CustomFrame.is_text(document_number))
+        bad_document = (
+            document.notna()
+            & document.ne(constant.NOT_AVAILABLE)
+            & ~document.fillna("").astype(str).str.isalnum().astype(bool)
+        )
+        bad_attrs = ~attrs.map(
+            lambda value: not isinstance(value, dict)
+            or CustomDict.has_only_primitive_types(value)
+        ).astype(bool)
+
+        return CustomFrame.collect_errors(
+            frame,
+            [
+                (person_id.isna(), "Id must be provided"),
+                (person_id.notna() & ~valid_id, "Algorithm does not match"),
+                (CustomFrame.contains(name, digits), "name contain numbers"),
+                (CustomFrame.contains(last_name, digits), "last_name contain numbers"),
+                (
+                    contact_type.notna()
+                    & ~CustomFrame.is_member(contact_type, ContactType),
+                    "Invalid contact type",
+                ),
+                (bad_date, date_errors),
+                (bad_document, "Invalid document number"),
+                (bad_attrs, "the dictionary must have only primitive types"),
+            ],
+        )
+
     @classmethod
     def new(
         cls,
@@ -1,7 +1,10 @@
 from collections import namedtuple
 
+import pandas as pd
+
 from .status_code import FIELD_REQUIRED, ID_NOT_FOUND, INVALID_FORMAT
 from ..custom_dict import CustomDict
+from ..custom_frame import CustomFrame
 from ..custom_string import CustomString
 from ..DomainError import DomainError
 from ..enum.channel_type import ChannelType
@@ -117,6 +120,60 @@ class TicketDomain:
         if len(errors) > 0:
             raise DomainError(INVALID_FORMAT, "\n".join(errors))
 
+    @classmethod
+    def validate_many(cls, frame: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+        """Column wise is_valid, one column per Ticket field.
+
+        Missing columns and NA cells are treated as None. Returns the valid
+        mask and the joined error messages of every row.
+        """
+        ticket_id = CustomFrame.column(frame, "ticket_id")
+        channel_type = CustomFrame.column(frame, "channel_type")
+        requirement = CustomFrame.column(frame, "requirement")
+        because = CustomFrame.column(frame, "because")
+        state = CustomFrame.column(frame, "state")
+        attrs = CustomFrame.column(frame, "attrs")
+
+        valid_id = IdentifierHandler.validate_many(cls.algorithm, ticket_id)
+        bad_state = state.notna() & ~CustomFrame.is_member(state, TicketState)
+        bad_channel = channel_type.notna() & ~CustomFrame.is_member(
+            channel_type, ChannelType
+        )
+        bad_attrs = ~attrs.map(
+            lambda value: not isinstance(value, dict)
+            or CustomDict.has_only_primitive_types(value)
+        ).astype(bool)
+
+        return CustomFrame.collect_errors(
+            frame,
+            [
+                (ticket_id.notna() & ~valid_id, "Algorithm does not match"),
+                (
+                    requirement.notna()
+                    & (~CustomFrame.is_text(requirement) | requirement.eq("")),
+                    "invalid requirement",
+                ),
+                (
+                    because.notna()
+                    & (~CustomFrame.is_text(because) | because.eq("")),
+                    "invalid because",
+                ),
+                (
+                    bad_state,
+                    CustomFrame.failed_messages(
+                        state, bad_state, TicketState.has_value
+                    ),
+                ),
+                (
+                    bad_channel,
+                    CustomFrame.failed_messages(
+                        channel_type, bad_channel, ChannelType.has_value
+                    ),
+                ),
+                (bad_attrs, "the dictionary must have only primitive types"),
+            ],
+        )
+
     @classmethod
     def new(
         cls,
@@ -1,7 +1,16 @@
 import os
 
+from ..broker.aio_rabbitmq import AsyncRabbitmqClient
+from ..broker.kafka import KafkaClient, KafkaServer
+from ..broker.outbox import BrokerOutbox
 from ..broker.rabbitmq import RabbitmqClient, RabbitmqServer
+from ..broker.rabbitmq_pool import RabbitmqPool
+from ..cache.local_cache import LocalCache
+from ..cache.redis_cache import RedisCache, RedisServer
+from ..mongo.async_mongo import AsyncMongoClient, AsyncMongoPool
 from ..mongo.mongo import MongoClient, MongoServer
+from ..mongo.mongo_pool import MongoPool
+from . import constant
 
 
 class Bootstrap:
@@ -23,6 +32,9 @@ class Bootstrap:
     def get_from_environment(self):
         self.SECRET_KEY = os.getenv("SECRET_KEY", "BatmanIsBruceWayne")
         self.IS_IN_PRODUCTION = os.getenv("IS_IN_PRODUCTION", 0)
+        # Request histograms and per layer spans on /metrics, 0 turns them off
+        self.METRICS_REQUESTS = int(os.getenv("METRICS_REQUESTS", 1))
+        self.METRICS_LAYERS = int(os.getenv("METRICS_LAYERS", 1))
 
         self.BROKER = os.getenv("BROKER", False)
         if self.BROKER == "RABBITMQ":
@@ -32,11 +44,29 @@ class Bootstrap:
                 username=os.environ["RABBITMQ_USER"],
                 password=os.environ["RABBITMQ_PASS"],
                 lost_message_path=self.BROKER_PATH,
+                pool_size=int(os.getenv("RABBITMQ_POOL_SIZE", 4)),
+                heartbeat=int(os.getenv("RABBITMQ_HEARTBEAT", 60)),
             )
-            self.BROKER_RABBITMQ = RabbitmqClient(self.RABBITMQ_SERVER)
+            # Connections and channels are reused across requests
+            self.RABBITMQ_POOL = RabbitmqPool(self.RABBITMQ_SERVER)
+            self.BROKER_RABBITMQ = RabbitmqClient(self.RABBITMQ_POOL)
+            self.BROKER_RABBITMQ.set_queue(os.getenv("RABBITMQ_QUEUE", constant.NAME))
+            # Domain events leave the request path through the outbox
+            self.BROKER_OUTBOX = BrokerOutbox(self.BROKER_RABBITMQ)
         if self.BROKER == "KAFKA":
-            self.KAFKA_HOST = os.environ["KAFKA_HOST"]
-            self.KAFKA_PORT = os.environ["KAFKA_PORT"]
+            self.KAFKA_SERVER = KafkaServer(
+                hostname=os.environ["KAFKA_HOST"],
+                port=int(os.environ["KAFKA_PORT"]),
+                prefix=os.getenv("KAFKA_PREFIX", constant.NAME),
+                lost_message_path=self.BROKER_PATH,
+                linger_ms=int(os.getenv("KAFKA_LINGER_MS", 5)),
+                batch_size=int(os.getenv("KAFKA_BATCH_SIZE", 32768)),
+                compression_type=os.getenv("KAFKA_COMPRESSION", "gzip"),
+            )
+            self.BROKER_KAFKA = KafkaClient(self.KAFKA_SERVER)
+            # send blocks while metadata is missing or the buffer is full,
+            # the outbox keeps that wait off the request thread too
+            self.BROKER_OUTBOX = BrokerOutbox(self.BROKER_KAFKA)
 
         self.DB = os.getenv("DB", False)
         if self.DB == "MONGO":
@@ -46,5 +76,38 @@ class Bootstrap:
                 username=os.environ["MONGO_USER"],
                 password=os.environ["MONGO_PASS"],
                 collection=os.environ["MONGO_DB"],
+                min_pool_size=int(os.getenv("MONGO_MIN_POOL_SIZE", 0)),
+                max_pool_size=int(os.getenv("MONGO_MAX_POOL_SIZE", 100)),
+                max_idle_time_ms=int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 60000)),
+            )
+            # Single pool per worker process, shared by every repository
+            self.MONGO_POOL = MongoPool(self.MONGO_SERVER)
+            self.REPOSITORY_MONGO = MongoClient(self.MONGO_POOL)
+
+        # Read-through cache for get_by_id, NONE turns it off. LOCAL is per
+        # worker: versions and ETags are checked against mongo on every read,
+        # other reads may miss writes of other workers for CACHE_TTL seconds.
+        # REDIS is shared by every worker and has no such window.
+        self.CACHE_TYPE = os.getenv("CACHE", "LOCAL")
+        self.CACHE = None
+        if self.CACHE_TYPE == "LOCAL":
+            self.CACHE = LocalCache(
+                int(os.getenv("CACHE_MAX_SIZE", constant.CACHE_MAX_SIZE))
             )
-            self.REPOSITORY_MONGO = MongoClient(self.MONGO_SERVER)
+        if self.CACHE_TYPE == "REDIS":
+            self.REDIS_SERVER = RedisServer(
+                hostname=os.environ["REDIS_HOST"],
+                port=int(os.environ["REDIS_PORT"]),
+                database=int(os.getenv("REDIS_DB", 0)),
+                prefix=os.getenv("REDIS_PREFIX", constant.NAME),
+            )
+            self.CACHE = RedisCache(self.REDIS_SERVER)
+
+    def get_async_backends(self):
+        # Only the asyncio server needs them, both connect on first use
+        if self.DB == "MONGO":
+            self.ASYNC_MONGO_POOL = AsyncMongoPool(self.MONGO_SERVER)
+            self.ASYNC_REPOSITORY_MONGO = AsyncMongoClient(self.ASYNC_MONGO_POOL)
+        if self.BROKER == "RABBITMQ":
+            self.ASYNC_BROKER = AsyncRabbitmqClient(self.RABBITMQ_SERVER)
+            self.ASYNC_BROKER.set_queue(os.getenv("RABBITMQ_QUEUE", constant.NAME))
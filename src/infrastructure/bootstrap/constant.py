@@ -8,4 +8,21 @@ DATE_FORMAT = "%Y/%m/%d"
 TIME_FORMAT = "%H:%M:%S"
 DATETIME_FORMAT = "%Y/%m/%d %H:%M:%S"
 TIME_OUT = 600
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 500
+CSV_CHUNK_SIZE = 10000
+BULK_BATCH_SIZE = 1000
+IMPORT_MAX_ERRORS = 1000
+OUTBOX_MAX_SIZE = 10000
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_PUT_TIMEOUT = 1.0
+OUTBOX_CLOSE_TIMEOUT = 10.0
+SPOOL_SEGMENT_SIZE = 16 * 1024 * 1024
+SPOOL_REPLAY_RATE = 100
 NOT_AVAILABLE = "N/A"
+CACHE_MAX_SIZE = 10000
+CACHE_TTL = 30.0
+CACHE_NEGATIVE_TTL = 5.0
+DEADLINE_WORKERS = 16
+DEADLINE_MAX_PENDING = 64
@@ -0,0 +1,137 @@
+import asyncio
+import os
+from enum import Enum
+
+from ...domain.model.status_code import BROKER_CONNECTION_FAIL, BROKER_SEND_FAIL
+from ...utils.custom_date import CustomDatetime
+from ..InfrastructureError import InfrastructureError
+from .rabbitmq_pool import RabbitmqServer
+from .spool import LostMessageSpool
+
+
+async def connection_factory(ref_rabbitmq_server: RabbitmqServer):
+    # Imported lazily, aio_pika is only required by the asyncio server
+    import aio_pika
+
+    return await aio_pika.connect_robust(
+        host=ref_rabbitmq_server.hostname,
+        port=ref_rabbitmq_server.port,
+        login=ref_rabbitmq_server.username,
+        password=ref_rabbitmq_server.password,
+        heartbeat=ref_rabbitmq_server.heartbeat,
+    )
+
+
+def message_factory(topic_name: str, message: str):
+    import aio_pika
+
+    # Same properties as RabbitmqClient, consumers dispatch on the type
+    return aio_pika.Message(
+        message.encode("utf-8"),
+        type=topic_name,
+        content_type="application/json",
+        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+    )
+
+
+class AsyncRabbitmqClient:
+    """RabbitMQ publisher for the asyncio server.
+
+    One robust connection per worker process, it reconnects on its own.
+    A single channel in publisher confirm mode is shared by every
+    request, publish returns once the broker confirmed the message.
+    """
+
+    def __init__(
+        self,
+        ref_rabbitmq_server: RabbitmqServer,
+        ref_connection_factory=connection_factory,
+        ref_message_factory=message_factory,
+        in_lost_save_local: bool = True,
+    ) -> None:
+        self.server = ref_rabbitmq_server
+        self._factory = ref_connection_factory
+        self._message = ref_message_factory
+        self.in_lost_save_local = in_lost_save_local
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def dsn(self):
+        return f"amqp://{self.server.username}:{self.server.password}@{self.server.hostname}:{self.server.port}/%2F"
+
+    def set_queue(self, queue):
+        self.queue = queue
+        self.spool = LostMessageSpool(self.server.lost_message_path, queue)
+
+    def _reset(self):
+        self._connection = None
+        self._channel = None
+        self._pid = None
+        self._lock = None
+
+    async def channel(self):
+        if self._pid != os.getpid() or self._channel is None:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._pid != os.getpid() or self._channel is None:
+                    try:
+                        self._connection = await self._factory(self.server)
+                        self._channel = await self._connection.channel(
+                            publisher_confirms=True
+                        )
+                    except Exception as e:
+                        raise InfrastructureError(BROKER_CONNECTION_FAIL, str(e))
+                    self._pid = os.getpid()
+        return self._channel
+
+    async def publish(self, topic: Enum, message: str) -> None | InfrastructureError:
+        await self.publish_batch([(topic, message)])
+
+    async def publish_batch(self, events: list[tuple]) -> None | InfrastructureError:
+        try:
+            channel = await self.channel()
+            # Confirms are awaited together, not one round trip per event
+            results = await asyncio.gather(
+                *(
+                    channel.default_exchange.publish(
+                        self._message(topic.name, message), routing_key=self.queue
+                    )
+                    for topic, message in events
+                ),
+                return_exceptions=True,
+            )
+        except Exception as e:
+            await self._on_failure(e, events)
+            return
+
+        unsent = [
+            event
+            for event, result in zip(events, results)
+            if isinstance(result, BaseException)
+        ]
+        if unsent:
+            error = next(r for r in results if isinstance(r, BaseException))
+            await self._on_failure(error, unsent)
+
+    async def _on_failure(self, error: Exception, unsent: list) -> InfrastructureError:
+        if self.in_lost_save_local:
+            now = CustomDatetime.str_now()
+            # The spool fsyncs, keep that off the event loop
+            await asyncio.to_thread(
+                self.spool.append,
+                [
+                    {"type": topic.name, "data": message, "write_at": now}
+                    for topic, message in unsent
+                ],
+            )
+
+        if isinstance(error, InfrastructureError):
+            raise error
+        raise InfrastructureError(BROKER_SEND_FAIL, str(error))
+
+    async def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            await self._connection.close()
+        self._reset()
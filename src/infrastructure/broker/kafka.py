@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from enum import Enum
+
+from prometheus_client import Counter, Histogram
+from pydantic import BaseModel
+
+from ...domain.enum.ticket_event import TicketEvent
+from ...domain.model.status_code import BROKER_CONNECTION_FAIL, BROKER_SEND_FAIL
+from ...utils.custom_date import CustomDatetime
+from ..bootstrap import constant
+from ..InfrastructureError import InfrastructureError
+from .spool import LostMessageSpool
+
+KAFKA_SENT = Counter(
+    "kafka_messages_sent",
+    "Messages acknowledged by kafka",
+    ["topic"],
+)
+KAFKA_FAILED = Counter(
+    "kafka_messages_failed",
+    "Messages kafka could not deliver",
+    ["topic"],
+)
+KAFKA_DELIVERY = Histogram(
+    "kafka_delivery_seconds",
+    "Time from send to acknowledgement",
+    ["topic"],
+)
+
+
+class KafkaServer(BaseModel):
+    hostname: str
+    port: int
+    prefix: str
+    lost_message_path: str
+    acks: str | int = 1
+    linger_ms: int = 5
+    batch_size: int = 32768
+    compression_type: str | None = "gzip"
+    max_block_ms: int = 1000
+    close_timeout: float = 10.0
+
+
+def producer_factory(ref_kafka_server: KafkaServer):
+    # Imported lazily, kafka is only required when BROKER=KAFKA
+    from kafka import KafkaProducer
+
+    return KafkaProducer(
+        bootstrap_servers=f"{ref_kafka_server.hostname}:{ref_kafka_server.port}",
+        client_id=constant.NAME,
+        acks=ref_kafka_server.acks,
+        linger_ms=ref_kafka_server.linger_ms,
+        batch_size=ref_kafka_server.batch_size,
+        compression_type=ref_kafka_server.compression_type,
+        max_block_ms=ref_kafka_server.max_block_ms,
+    )
+
+
+class KafkaClient:
+    """One long lived producer per worker process.
+
+    send only appends to the producer buffer, batching, compression and
+    the network round trips happen on the producer thread. Delivery
+    results come back through callbacks that feed the metrics and spool
+    what was lost.
+    """
+
+    def __init__(
+        self,
+        ref_kafka_server: KafkaServer,
+        ref_producer_factory=producer_factory,
+        in_lost_save_local: bool = True,
+    ) -> None:
+        self.server = ref_kafka_server
+        self._factory = ref_producer_factory
+        self.in_lost_save_local = in_lost_save_local
+        self.spool = LostMessageSpool(
+            ref_kafka_server.lost_message_path, ref_kafka_server.prefix
+        )
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def dsn(self):
+        return f"{self.server.hostname}:{self.server.port}"
+
+    def _reset(self):
+        # The producer thread does not survive a fork
+        self._producer = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def producer(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    try:
+                        self._producer = self._factory(self.server)
+                    except Exception as e:
+                        raise InfrastructureError(BROKER_CONNECTION_FAIL, str(e))
+                    self._pid = os.getpid()
+        return self._producer
+
+    @property
+    def queue(self) -> str:
+        # Lost messages are spooled under the topic prefix
+        return self.server.prefix
+
+    def set_queue(self, prefix: str) -> None:
+        self.server.prefix = prefix
+        self.spool = LostMessageSpool(self.server.lost_message_path, prefix)
+
+    def topic_name(self, topic: Enum | str) -> str:
+        name = topic if isinstance(topic, str) else topic.name
+        return f"{self.server.prefix}.{name.lower()}"
+
+    def publish(self, topic: Enum, message: str) -> None | InfrastructureError:
+        name = self.topic_name(topic)
+        try:
+            future = self.producer.send(name, value=message.encode("utf-8"))
+        except InfrastructureError as e:
+            self._on_error(topic, message, time.perf_counter(), e)
+            raise
+        except Exception as e:
+            # Buffer full for longer than max_block_ms or metadata missing
+            self._on_error(topic, message, time.perf_counter(), e)
+            raise InfrastructureError(BROKER_SEND_FAIL, str(e))
+
+        start = time.perf_counter()
+        future.add_callback(self._on_delivered, name, start)
+        future.add_errback(self._on_error, topic, message, start)
+
+    def publish_batch(self, events: list[tuple]) -> None | InfrastructureError:
+        try:
+            producer = self.producer
+        except InfrastructureError as e:
+            self._lost(events, e)
+            raise
+
+        # publish spools every event it fails, the rest of the batch is
+        # still sent and the first failure is raised once it is flushed
+        failure = None
+        for topic, message in events:
+            try:
+                self.publish(topic, message)
+            except InfrastructureError as e:
+                failure = failure or e
+        producer.flush(timeout=self.server.close_timeout)
+        if failure is not None:
+            raise failure
+
+    def republish(self, record: dict) -> None:
+        # Spooled records wait for their acknowledgement, a failure stops
+        # the replay and the record stays in the spool
+        future = self.producer.send(
+            self.topic_name(record["type"]), value=record["data"].encode("utf-8")
+        )
+        future.get(timeout=self.server.close_timeout)
+
+    @staticmethod
+    def _on_delivered(name: str, start: float, metadata) -> None:
+        KAFKA_SENT.labels(name).inc()
+        KAFKA_DELIVERY.labels(name).observe(time.perf_counter() - start)
+
+    def _on_error(self, topic: Enum, message: str, start: float, error) -> None:
+        self._lost([(topic, message)], error)
+
+    def _lost(self, events: list[tuple], error) -> None:
+        for topic, _ in events:
+            KAFKA_FAILED.labels(self.topic_name(topic)).inc()
+        if self.in_lost_save_local:
+            now = CustomDatetime.str_now()
+            self.spool.append(
+                [
+                    {
+                        "type": topic.name,
+                        "data": message,
+                        "write_at": now,
+                        "error": str(error),
+                    }
+                    for topic, message in events
+                ]
+            )
+
+    def close(self):
+        if self._producer is not None and self._pid == os.getpid():
+            self._producer.close(timeout=self.server.close_timeout)
+        self._reset()
+
+
+# Test
+def kafka_interface_test(ref_kafka_server, ref_producer_factory=producer_factory):
+    kafka_broker = KafkaClient(ref_kafka_server, ref_producer_factory)
+    kafka_broker.publish(TicketEvent.CREATED, "testing...")
+    kafka_broker.publish_batch([(TicketEvent.UPDATED, "testing...")])
+    kafka_broker.close()
@@ -1,6 +1,104 @@
+from collections import defaultdict, namedtuple
+
+RecordMetadata = namedtuple("RecordMetadata", ["topic", "partition", "offset"])
+
+
 class MockBrokerClient:
     def dsn(self):
         return "mock-broker"
 
-    def publish(self, message) -> None:
+    def publish(self, topic, message) -> None:
+        return None
+
+    def publish_batch(self, events: list) -> None:
         return None
+
+
+class AsyncMockBrokerClient:
+    def dsn(self):
+        return "mock-broker"
+
+    async def publish(self, topic, message) -> None:
+        return None
+
+    async def publish_batch(self, events: list) -> None:
+        return None
+
+
+class FakeFuture:
+    # Resolved on send, callbacks added later run straight away like kafka's
+    def __init__(self, value=None, exception=None):
+        self.value = value
+        self.exception = exception
+
+    def add_callback(self, f, *args):
+        if self.exception is None:
+            f(*args, self.value)
+        return self
+
+    def add_errback(self, f, *args):
+        if self.exception is not None:
+            f(*args, self.exception)
+        return self
+
+    def get(self, timeout=None):
+        if self.exception is not None:
+            raise self.exception
+        return self.value
+
+
+class FakeKafkaProducer:
+    """In process stand-in for kafka.KafkaProducer.
+
+    Messages are kept per topic, topics listed in fail_topics reject
+    every message through the errback.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.topics = defaultdict(list)
+        self.fail_topics = set()
+        self.flushed = 0
+        self.closed = False
+
+    def send(self, topic, value=None, key=None):
+        if topic in self.fail_topics:
+            return FakeFuture(exception=Exception(f"{topic} is not available"))
+        self.topics[topic].append(value)
+        return FakeFuture(RecordMetadata(topic, 0, len(self.topics[topic]) - 1))
+
+    def flush(self, timeout=None):
+        self.flushed += 1
+
+    def close(self, timeout=None):
+        self.closed = True
+
+
+class FakeAioExchange:
+    def __init__(self):
+        self.messages = list()
+        self.fail = False
+
+    async def publish(self, message, routing_key=None):
+        if self.fail:
+            raise Exception(f"{routing_key} is not available")
+        self.messages.append((routing_key, message))
+
+
+class FakeAioConnection:
+    """In process stand-in for an aio_pika robust connection.
+
+    Every channel publishes to the same default exchange, set fail on it
+    to reject every message.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.default_exchange = FakeAioExchange()
+        self.channels = 0
+        self.closed = False
+
+    async def channel(self, publisher_confirms=True):
+        self.channels += 1
+        return self
+
+    async def close(self):
+        self.closed = True
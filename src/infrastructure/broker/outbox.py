@@ -0,0 +1,131 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from enum import Enum
+
+from prometheus_client import Counter
+
+from ...domain.model.status_code import BROKER_SEND_FAIL
+from ..bootstrap import constant
+from ..InfrastructureError import InfrastructureError
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_PUBLISHED = Counter(
+    "broker_outbox_published",
+    "Events confirmed by the broker",
+)
+OUTBOX_FAILED = Counter(
+    "broker_outbox_failed",
+    "Events the outbox could not publish",
+)
+OUTBOX_REJECTED = Counter(
+    "broker_outbox_rejected",
+    "Events refused because the outbox was full",
+)
+
+_STOP = object()
+
+
+class BrokerOutbox:
+    """In process outbox in front of a broker client.
+
+    publish only enqueues the event, a background thread drains the queue
+    and hands whole batches to the broker. When the queue is full the
+    caller waits up to put_timeout before the event is refused.
+    """
+
+    def __init__(
+        self,
+        ref_broker,
+        max_size: int = constant.OUTBOX_MAX_SIZE,
+        batch_size: int = constant.OUTBOX_BATCH_SIZE,
+        put_timeout: float = constant.OUTBOX_PUT_TIMEOUT,
+    ) -> None:
+        self._b = ref_broker
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+        atexit.register(self.close)
+
+    @property
+    def dsn(self):
+        return self._b.dsn
+
+    @property
+    def broker(self):
+        return self._b
+
+    @broker.setter
+    def broker(self, ref_broker) -> None:
+        # Read by the flusher on every batch, swapped before the first one
+        self._b = ref_broker
+
+    def _reset(self):
+        # The flusher thread does not survive a fork, start a new one lazily
+        self._queue = queue.Queue(self.max_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="broker-outbox", daemon=True
+                    )
+                    self._thread.start()
+
+    def publish(self, topic: Enum, message: str) -> None | InfrastructureError:
+        self._start()
+        try:
+            self._queue.put((topic, message), timeout=self.put_timeout)
+        except queue.Full:
+            OUTBOX_REJECTED.inc()
+            raise InfrastructureError(BROKER_SEND_FAIL, "Broker outbox is full")
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            # Whatever queued up meanwhile rides along, up to batch_size
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._flush(batch)
+
+    def _flush(self, batch: list):
+        try:
+            self._b.publish_batch(batch)
+            OUTBOX_PUBLISHED.inc(len(batch))
+        except Exception:
+            OUTBOX_FAILED.inc(len(batch))
+            logger.exception("outbox failed to publish %s events", len(batch))
+
+    def close(self, timeout: float = constant.OUTBOX_CLOSE_TIMEOUT):
+        # Pending events are published before the worker exits
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("outbox closed with %s pending events", self._queue.qsize())
+            return
+        thread.join(timeout)
+        self._thread = None
@@ -1,9 +1,8 @@
-import json
-import os
+from enum import Enum
 
 import pika
-from pydantic import BaseModel
 
+from ...domain.enum.ticket_event import TicketEvent
 from ...utils.custom_date import CustomDatetime
 from ...domain.model.status_code import (
     BROKER_CHANNEL_ERROR,
@@ -11,99 +10,86 @@ from ...domain.model.status_code import (
     BROKER_SEND_FAIL,
 )
 from ..InfrastructureError import InfrastructureError
-
-
-class RabbitmqServer(BaseModel):
-    hostname: str
-    port: int
-    username: str
-    password: str
-    lost_message_path: str
+from .rabbitmq_pool import RabbitmqPool, RabbitmqServer
+from .spool import LostMessageSpool
 
 
 class RabbitmqClient:
     def __init__(
         self,
-        rabbitmq_server: RabbitmqServer,
+        ref_rabbitmq_pool: RabbitmqPool,
         in_lost_save_local: bool = True,
     ) -> None:
-        self.server = rabbitmq_server
-        self.client = None
-        self.channel = None
+        self._p = ref_rabbitmq_pool
+        self.server = ref_rabbitmq_pool.server
         self.in_lost_save_local = in_lost_save_local
 
     def set_queue(self, queue):
         self.queue = queue
+        self.spool = LostMessageSpool(self.server.lost_message_path, queue)
 
     @property
     def dsn(self):
-        return f"amqp://{self.server.username}:{self.server.password}@{self.server.hostname}:{self.server.port}/%2F"
-
-    def _connect(self):
-        credentials = pika.PlainCredentials(self.server.username, self.server.password)
-        parameters = pika.ConnectionParameters(
-            host=self.server.hostname, port=self.server.port, credentials=credentials
+        return self._p.dsn
+
+    @staticmethod
+    def _properties(topic_name: str) -> pika.BasicProperties:
+        # Every event shares the queue, consumers dispatch on the type
+        return pika.BasicProperties(
+            type=topic_name,
+            content_type="application/json",
+            delivery_mode=pika.DeliveryMode.Persistent,
         )
-        self.client = pika.BlockingConnection(parameters)
 
-        self.channel = self.client.channel()
+    def publish(self, topic: Enum, message: str) -> None | InfrastructureError:
+        try:
+            self._p.publish(self.queue, message, self._properties(topic.name))
+        except Exception as e:
+            self._on_failure(e, [(topic, message)])
 
-    def publish(self, message) -> None | InfrastructureError:
+    def publish_batch(self, events: list[tuple]) -> None | InfrastructureError:
+        # Publisher confirms: each event is acknowledged by the broker
+        sent = 0
         try:
-            self._connect()
-            self.channel.basic_publish(
-                exchange="",
-                routing_key=self.queue,
-                body=message,
+            with self._p.channel(confirm=True) as channel:
+                for topic, message in events:
+                    channel.basic_publish(
+                        exchange="",
+                        routing_key=self.queue,
+                        body=message,
+                        properties=self._properties(topic.name),
+                    )
+                    sent += 1
+        except Exception as e:
+            self._on_failure(e, events[sent:])
+
+    def republish(self, record: dict) -> None:
+        # Spooled records go straight to the pool, failures are not spooled
+        self._p.publish(self.queue, record["data"], self._properties(record["type"]))
+
+    def _on_failure(self, error: Exception, unsent: list) -> InfrastructureError:
+        if self.in_lost_save_local:
+            now = CustomDatetime.str_now()
+            self.spool.append(
+                [
+                    {"type": topic.name, "data": message, "write_at": now}
+                    for topic, message in unsent
+                ]
             )
-        except pika.exceptions.AMQPConnectionError:
+
+        if isinstance(error, InfrastructureError):
+            raise error
+        if isinstance(error, pika.exceptions.AMQPConnectionError):
             raise InfrastructureError(
                 BROKER_CONNECTION_FAIL, "Connection to RabbitMQ failed"
             )
-        except pika.exceptions.ChannelClosed:
+        if isinstance(error, pika.exceptions.ChannelClosed):
             raise InfrastructureError(BROKER_CHANNEL_ERROR, "Channel is closed")
-        except Exception as e:
-            self._saveAsFile("json", str(e))
-            raise InfrastructureError(BROKER_SEND_FAIL, str(e))
-        finally:
-            if self.client:
-                self.client.close()
-
-    def _saveAsFile(self, message_type, message):
-        file_path = os.path.join(self.server.lost_message_path, self.queue)
-        # Ensure the directory structure exists
-        os.makedirs(file_path, exist_ok=True)
-
-        now = CustomDatetime.str_now()
-        file_name = os.path.join(file_path, +".log")
-
-        with open(file_name, "a+", encoding="utf-8") as f:
-            # Check if the file is empty (newly created) and add '['
-            f.seek(0, os.SEEK_END)
-            if f.tell() == 0:
-                f.write("[")
-            else:
-                # Move the cursor to the end of the file
-                f.seek(0, os.SEEK_END)
-                # Move one position back to overwrite the trailing ']'
-                f.seek(f.tell() - 1, os.SEEK_SET)
-                # Add a comma to separate JSON objects
-                f.write(",")
-
-            # Dump the JSON data
-            json.dump(
-                {"type": message_type, "data": message, "write_at": now},
-                f,
-                ensure_ascii=False,
-                indent=4,
-            )
-
-            # Add a closing square bracket
-            f.write("]")
+        raise InfrastructureError(BROKER_SEND_FAIL, str(error))
 
 
 # Test
 def rabbitmq_interface_test(ref_rabbitmq_server):
-    rabbitmq_broker = RabbitmqClient(ref_rabbitmq_server)
+    rabbitmq_broker = RabbitmqClient(RabbitmqPool(ref_rabbitmq_server))
     rabbitmq_broker.set_queue("test")
-    rabbitmq_broker.publish("testing...")
+    rabbitmq_broker.publish(TicketEvent.CREATED, "testing...")
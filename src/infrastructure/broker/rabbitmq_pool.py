@@ -0,0 +1,174 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import pika
+from prometheus_client import Counter
+from pydantic import BaseModel
+
+from ...domain.model.status_code import BROKER_CONNECTION_FAIL
+from ..InfrastructureError import InfrastructureError
+from ..singleton import singleton
+
+POOL_OPENED = Counter(
+    "rabbitmq_pool_connections_opened",
+    "Connections opened by the rabbitmq pool",
+)
+POOL_DISCARDED = Counter(
+    "rabbitmq_pool_connections_discarded",
+    "Connections dropped by the rabbitmq pool",
+    ["reason"],
+)
+
+# Errors that leave the connection or the channel unusable
+STALE_ERRORS = (
+    pika.exceptions.ConnectionClosed,
+    pika.exceptions.StreamLostError,
+    pika.exceptions.ChannelClosed,
+    pika.exceptions.ChannelWrongStateError,
+)
+
+
+class RabbitmqServer(BaseModel):
+    hostname: str
+    port: int
+    username: str
+    password: str
+    lost_message_path: str
+    pool_size: int = 4
+    heartbeat: int = 60
+    blocked_connection_timeout: float = 30.0
+    checkout_timeout: float = 5.0
+    reconnect_attempts: int = 3
+    reconnect_backoff: float = 0.2
+    reconnect_max_backoff: float = 5.0
+
+
+@singleton
+class RabbitmqPool:
+    """Long lived connection and channel pairs, one pool per worker process.
+
+    A BlockingConnection is not thread safe, so every pair is checked out
+    by a single thread at a time. Heartbeats that piled up while a pair
+    sat idle are served on checkout, dead pairs are replaced. Channels in
+    publisher confirm mode are pooled apart from plain ones.
+    """
+
+    def __init__(self, ref_rabbitmq_server: RabbitmqServer):
+        self.server = ref_rabbitmq_server
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def dsn(self):
+        return f"amqp://{self.server.username}:{self.server.password}@{self.server.hostname}:{self.server.port}/%2F"
+
+    def _reset(self):
+        # Sockets inherited from the parent are dropped, never closed
+        self._idle = {False: queue.LifoQueue(), True: queue.LifoQueue()}
+        self._slots = threading.BoundedSemaphore(self.server.pool_size)
+        self._pid = os.getpid()
+
+    def _parameters(self) -> pika.ConnectionParameters:
+        credentials = pika.PlainCredentials(self.server.username, self.server.password)
+        return pika.ConnectionParameters(
+            host=self.server.hostname,
+            port=self.server.port,
+            credentials=credentials,
+            heartbeat=self.server.heartbeat,
+            blocked_connection_timeout=self.server.blocked_connection_timeout,
+        )
+
+    def _open(self, confirm: bool):
+        delay = self.server.reconnect_backoff
+        for attempt in range(1, self.server.reconnect_attempts + 1):
+            try:
+                connection = pika.BlockingConnection(self._parameters())
+                POOL_OPENED.inc()
+                channel = connection.channel()
+                if confirm:
+                    channel.confirm_delivery()
+                return connection, channel
+            except pika.exceptions.AMQPConnectionError:
+                if attempt == self.server.reconnect_attempts:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, self.server.reconnect_max_backoff)
+
+    @staticmethod
+    def _discard(entry, reason: str):
+        POOL_DISCARDED.labels(reason).inc()
+        connection, _ = entry
+        try:
+            if connection.is_open:
+                connection.close()
+        except pika.exceptions.AMQPError:
+            pass
+
+    def _checkout(self, confirm: bool):
+        while True:
+            try:
+                entry = self._idle[confirm].get_nowait()
+            except queue.Empty:
+                return self._open(confirm)
+
+            connection, channel = entry
+            try:
+                connection.process_data_events(time_limit=0)
+            except pika.exceptions.AMQPError:
+                self._discard(entry, "heartbeat")
+                continue
+            if channel.is_open:
+                return entry
+            self._discard(entry, "closed")
+
+    @contextmanager
+    def channel(self, confirm: bool = False):
+        if self._pid != os.getpid():
+            self._reset()
+        if not self._slots.acquire(timeout=self.server.checkout_timeout):
+            raise InfrastructureError(
+                BROKER_CONNECTION_FAIL, "No RabbitMQ channel available"
+            )
+
+        entry = None
+        try:
+            entry = self._checkout(confirm)
+            yield entry[1]
+        except STALE_ERRORS:
+            if entry is not None:
+                self._discard(entry, "stale")
+                entry = None
+            raise
+        finally:
+            if entry is not None:
+                self._idle[confirm].put(entry)
+            self._slots.release()
+
+    def publish(self, routing_key: str, body, properties=None) -> None:
+        # A pair can die between checkout and write, retry once on a new one
+        for attempt in range(2):
+            try:
+                with self.channel() as channel:
+                    channel.basic_publish(
+                        exchange="",
+                        routing_key=routing_key,
+                        body=body,
+                        properties=properties,
+                    )
+                return
+            except STALE_ERRORS:
+                if attempt == 1:
+                    raise
+
+    def close(self):
+        for idle in self._idle.values():
+            while True:
+                try:
+                    entry = idle.get_nowait()
+                except queue.Empty:
+                    break
+                if self._pid == os.getpid():
+                    self._discard(entry, "shutdown")
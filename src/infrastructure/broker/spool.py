@@ -0,0 +1,191 @@
+import argparse
+import fcntl
+import glob
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from ..bootstrap import constant
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".ndjson"
+CLAIMED_SUFFIX = ".replaying"
+
+
+class LostMessageSpool:
+    """Append only spool of the messages the broker did not accept.
+
+    One directory per queue holding newline delimited JSON segments. Every
+    append takes an exclusive flock on the directory, so all gunicorn
+    workers can share it, and issues a single fsync for the whole batch.
+    The active segment is sealed once it grows past segment_size.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        queue: str,
+        segment_size: int = constant.SPOOL_SEGMENT_SIZE,
+    ) -> None:
+        self.directory = os.path.join(path, queue)
+        self.segment_size = segment_size
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _replaying(self):
+        # Held for the whole replay, a second replay finds it taken and
+        # leaves, claims are never shared between two of them
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".replay.lock"), "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _segments(self, suffix: str = SEGMENT_SUFFIX) -> list[str]:
+        # Names are zero padded timestamps, sorting gives the write order
+        return sorted(glob.glob(os.path.join(self.directory, "*" + suffix)))
+
+    def _active_segment(self) -> str:
+        segments = self._segments()
+        if segments and os.path.getsize(segments[-1]) < self.segment_size:
+            return segments[-1]
+        return os.path.join(self.directory, f"{time.time_ns():020d}{SEGMENT_SUFFIX}")
+
+    @staticmethod
+    def _encode(records: list[dict]) -> bytes:
+        return "".join(
+            json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            for record in records
+        ).encode("utf-8")
+
+    def append(self, records: list[dict]) -> None:
+        if len(records) == 0:
+            return
+        data = self._encode(records)
+
+        with self._locked():
+            fd = os.open(
+                self._active_segment(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _claim(self) -> list[str]:
+        # Sealed and active segments are renamed away, new appends start a
+        # fresh segment. Claims left by an interrupted replay are retried.
+        with self._locked():
+            for segment in self._segments():
+                os.rename(segment, segment[: -len(SEGMENT_SUFFIX)] + CLAIMED_SUFFIX)
+            return self._segments(CLAIMED_SUFFIX)
+
+    def _rewrite(self, segment: str, records: list[dict]) -> None:
+        # Claimed segments have no other writer, swap in the remainder
+        partial = segment + ".tmp"
+        with open(partial, "wb") as f:
+            f.write(self._encode(records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, segment)
+
+    @staticmethod
+    def _read(segment: str) -> Iterator[dict]:
+        with open(segment, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def replay(self, publish: Callable[[dict], None], rate: float = 0) -> int:
+        """Publish every spooled record, at most rate records per second.
+
+        Records are delivered at least once: if publish fails the replay
+        stops and the next one resumes from the failed record. Only one
+        replay runs per queue, another one started meanwhile returns 0.
+        """
+        with self._replaying() as owner:
+            if not owner:
+                logger.warning("replay already running on %s", self.directory)
+                return 0
+            return self._replay(publish, rate)
+
+    def _replay(self, publish: Callable[[dict], None], rate: float) -> int:
+        interval = 1 / rate if rate > 0 else 0
+        next_at = time.monotonic()
+        replayed = 0
+
+        for segment in self._claim():
+            records = list(self._read(segment))
+            for position, record in enumerate(records):
+                now = time.monotonic()
+                if now < next_at:
+                    time.sleep(next_at - now)
+                next_at = max(next_at, now) + interval
+                try:
+                    publish(record)
+                except Exception:
+                    logger.exception(
+                        "replay stopped, %s records kept", len(records) - position
+                    )
+                    self._rewrite(segment, records[position:])
+                    return replayed
+                replayed += 1
+            os.remove(segment)
+
+        return replayed
+
+
+def main(argv: list = None) -> int:
+    from ..bootstrap.bootstrap import Bootstrap
+
+    parser = argparse.ArgumentParser(description="Re-publish spooled broker messages")
+    parser.add_argument(
+        "--queue",
+        help="spooled rabbitmq queue or kafka topic prefix, defaults to the broker's",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=constant.SPOOL_REPLAY_RATE,
+        help="messages per second, 0 for no limit",
+    )
+    args = parser.parse_args(argv)
+
+    my_config = Bootstrap()
+    if my_config.BROKER == "RABBITMQ":
+        broker = my_config.BROKER_RABBITMQ
+    elif my_config.BROKER == "KAFKA":
+        broker = my_config.BROKER_KAFKA
+    else:
+        parser.error("BROKER must be RABBITMQ or KAFKA to replay its spool")
+    if args.queue:
+        broker.set_queue(args.queue)
+    spool = LostMessageSpool(my_config.BROKER_PATH, broker.queue)
+    replayed = spool.replay(broker.republish, args.rate)
+    print(f"{replayed} messages replayed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,189 @@
+import copy
+import logging
+from typing import Protocol
+
+from prometheus_client import Counter
+
+from ..bootstrap import constant
+
+logger = logging.getLogger(__name__)
+
+CACHE_HITS = Counter(
+    "cache_hits",
+    "get_by_id answered by the cache",
+    ["table"],
+)
+CACHE_MISSES = Counter(
+    "cache_misses",
+    "get_by_id sent to the repository",
+    ["table"],
+)
+
+
+class CacheProtocol(Protocol):
+    # True when every worker reads and invalidates the same entries
+    shared: bool
+
+    def get(self, key: str):
+        pass
+
+    def set(self, key: str, value, ttl: float) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+
+class CachedRepository:
+    """Read-through cache in front of a repository's get_by_id.
+
+    Misses are cached too, for a shorter negative_ttl, so unknown
+    identifiers do not reach the database on every request. Every write
+    path drops the entry after the repository call. The cache is an
+    optimisation only: when it fails the repository answers.
+
+    A per process cache only sees the writes of its own worker. Reads
+    asking for one of `fresh_fields`, the entity version, read those
+    fields from the repository and the entry only answers when they
+    still match, so versions and ETags are never stale. Other reads may
+    be stale for up to ttl seconds.
+    """
+
+    def __init__(
+        self,
+        ref_repository,
+        ref_cache: CacheProtocol,
+        ttl: float = constant.CACHE_TTL,
+        negative_ttl: float = constant.CACHE_NEGATIVE_TTL,
+        fresh_fields: tuple = (),
+    ) -> None:
+        self._r = ref_repository
+        self._c = ref_cache
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.fresh_fields = tuple(fresh_fields)
+        self.shared = getattr(ref_cache, "shared", False)
+        self.tablename = ref_repository.tablename
+        self.pk = ref_repository.pk
+
+    def _key(self, identifier) -> str:
+        return f"{self.tablename}:{identifier}"
+
+    def _get(self, key: str):
+        try:
+            return self._c.get(key)
+        except Exception:
+            logger.exception("cache get failed for %s", key)
+            return None
+
+    def _set(self, key: str, value, ttl: float) -> None:
+        try:
+            self._c.set(key, value, ttl)
+        except Exception:
+            logger.exception("cache set failed for %s", key)
+
+    def _invalidate(self, identifier) -> None:
+        try:
+            self._c.delete(self._key(identifier))
+        except Exception:
+            # Left to expire, stale for at most ttl seconds
+            logger.exception("cache invalidation failed for %s", identifier)
+
+    @staticmethod
+    def _answers(entry: tuple, requested: tuple | None) -> bool:
+        # A cached miss answers any projection, a read only narrower ones
+        cached, item = entry
+        if item is None or cached is None:
+            return True
+        return requested is not None and set(requested) <= set(cached)
+
+    def _fresh(self, projection: tuple | None) -> list:
+        # Fields to read again before a per process entry may answer
+        if self.shared:
+            return []
+        if projection is None:
+            return list(self.fresh_fields)
+        return [field for field in self.fresh_fields if field in projection]
+
+    def _current(self, identifier, item: dict | None, fresh: list) -> bool:
+        current = self._r.get_by_id(identifier, fresh)
+        if item is None or current is None:
+            return item is None and current is None
+        return all(current.get(field) == item.get(field) for field in fresh)
+
+    def get_by_id(self, identifier, fields: list) -> dict:
+        key = self._key(identifier)
+        projection = tuple(fields) if fields is not None else None
+
+        fresh = self._fresh(projection)
+        if fresh and projection is not None and set(projection) <= set(fresh):
+            # Only the version was asked for, the cache cannot save the read
+            return self._r.get_by_id(identifier, fields)
+
+        entry = self._get(key)
+        # Entries keep the projection they were read with
+        if (
+            entry is not None
+            and self._answers(entry, projection)
+            and (not fresh or self._current(identifier, entry[1], fresh))
+        ):
+            CACHE_HITS.labels(self.tablename).inc()
+            item = entry[1]
+            if item is not None and entry[0] != projection:
+                item = {
+                    k: v for k, v in item.items() if k in projection or k == self.pk
+                }
+            return copy.deepcopy(item)
+
+        CACHE_MISSES.labels(self.tablename).inc()
+        item = self._r.get_by_id(identifier, fields)
+        ttl = self.ttl if item else self.negative_ttl
+        self._set(key, (projection, copy.deepcopy(item)), ttl)
+        return item
+
+    def entity_exists(self, identifier) -> bool:
+        return self._r.entity_exists(identifier)
+
+    def fetch(self, fields: list, matching) -> list:
+        return self._r.fetch(fields, matching)
+
+    def stream(self, fields: list, matching):
+        return self._r.stream(fields, matching)
+
+    def delete(self, identifier) -> int:
+        try:
+            return self._r.delete(identifier)
+        finally:
+            self._invalidate(identifier)
+
+    def update(self, identifier, item) -> int:
+        try:
+            return self._r.update(identifier, item)
+        finally:
+            self._invalidate(identifier)
+
+    def create(self, item) -> None:
+        # Read before create() moves the primary key to _id
+        identifier = item.get(self.pk)
+        try:
+            return self._r.create(item)
+        finally:
+            # A cached miss for this identifier would hide the new entity
+            self._invalidate(identifier)
+
+    def insert_many(self, data) -> None:
+        dataset = list(data)
+        identifiers = [item.get(self.pk) for item in dataset]
+        try:
+            return self._r.insert_many(dataset)
+        finally:
+            for identifier in identifiers:
+                self._invalidate(identifier)
+
+    def bulk_insert(self, data: list) -> tuple[int, list[dict]]:
+        identifiers = [item.get(self.pk) for item in data]
+        try:
+            return self._r.bulk_insert(data)
+        finally:
+            for identifier in identifiers:
+                self._invalidate(identifier)
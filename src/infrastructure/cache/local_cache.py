@@ -0,0 +1,67 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from prometheus_client import Counter
+
+from ..bootstrap import constant
+
+CACHE_EVICTIONS = Counter(
+    "cache_evictions",
+    "Entries dropped by the in process cache",
+    ["reason"],
+)
+
+
+class LocalCache:
+    """In process LRU cache where every entry carries its own TTL.
+
+    Expired entries are dropped when they are read, the least recently
+    used one when the cache grows past max_size. Every worker process
+    keeps its own copy.
+    """
+
+    shared = False
+
+    def __init__(self, max_size: int = constant.CACHE_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def dsn(self):
+        return "local"
+
+    def _reset(self):
+        # A lock held by another thread at fork time would never be released
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                CACHE_EVICTIONS.labels("expired").inc()
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                CACHE_EVICTIONS.labels("size").inc()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
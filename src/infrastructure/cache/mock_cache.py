@@ -0,0 +1,34 @@
+import time
+
+
+class FakeRedis:
+    """In process stand-in for redis.Redis.
+
+    Supports the get, set with px and delete calls the cache makes,
+    calls counts every command sent.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.data = dict()
+        self.calls = 0
+
+    def get(self, name):
+        self.calls += 1
+        entry = self.data.get(name)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[name]
+            return None
+        return value
+
+    def set(self, name, value, px=None):
+        self.calls += 1
+        expires_at = time.monotonic() + px / 1000 if px is not None else None
+        self.data[name] = (value, expires_at)
+        return True
+
+    def delete(self, *names):
+        self.calls += 1
+        return sum(self.data.pop(name, None) is not None for name in names)
@@ -0,0 +1,90 @@
+import os
+import pickle
+import threading
+
+from pydantic import BaseModel
+
+from ...domain.model.status_code import DB_CONNECTION_FAIL
+from ..InfrastructureError import InfrastructureError
+
+
+class RedisServer(BaseModel):
+    hostname: str
+    port: int
+    database: int = 0
+    prefix: str
+    socket_timeout: float = 0.2
+
+
+def client_factory(ref_redis_server: RedisServer):
+    # Imported lazily, redis is only required when CACHE=REDIS
+    import redis
+
+    return redis.Redis(
+        host=ref_redis_server.hostname,
+        port=ref_redis_server.port,
+        db=ref_redis_server.database,
+        socket_timeout=ref_redis_server.socket_timeout,
+        socket_connect_timeout=ref_redis_server.socket_timeout,
+    )
+
+
+class RedisCache:
+    """Cache shared by every worker, backed by redis.
+
+    Values are pickled so documents keep their bson types, the store is
+    only reachable by the service itself. Entries expire on the server.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        ref_redis_server: RedisServer,
+        ref_client_factory=client_factory,
+    ) -> None:
+        self.server = ref_redis_server
+        self._factory = ref_client_factory
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def dsn(self):
+        return f"redis://{self.server.hostname}:{self.server.port}/{self.server.database}"
+
+    def _reset(self):
+        # Connections do not survive a fork, the child opens its own
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    try:
+                        self._client = self._factory(self.server)
+                    except Exception as e:
+                        raise InfrastructureError(DB_CONNECTION_FAIL, str(e))
+                    self._pid = os.getpid()
+        return self._client
+
+    def _key(self, key: str) -> str:
+        return f"{self.server.prefix}:{key}"
+
+    def get(self, key: str):
+        value = self.client.get(self._key(key))
+        if value is None:
+            return None
+        return pickle.loads(value)
+
+    def set(self, key: str, value, ttl: float) -> None:
+        self.client.set(
+            self._key(key),
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+            px=max(1, int(ttl * 1000)),
+        )
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
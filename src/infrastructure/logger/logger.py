@@ -1,9 +1,30 @@
-# import atexit
-import datetime as dt
+import atexit
+import copy
 import json
 import logging.config
 import logging.handlers
+import operator
+import os
 import pathlib
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from prometheus_client import Counter
+
+from ...utils import serializer
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped",
+    "Log records dropped because the logging queue was full",
+)
+LOG_RECORDS_FILTERED = Counter(
+    "log_records_filtered",
+    "Log records left out by SamplingFilter",
+    ["reason"],
+)
 
 LOG_RECORD_BUILTIN_ATTRS = {
     "args",
@@ -29,10 +50,20 @@ LOG_RECORD_BUILTIN_ATTRS = {
     "thread",
     "threadName",
     "taskName",
+    # Set by SamplingFilter
+    "_sampling",
 }
 
 
 class MyJSONFormatter(logging.Formatter):
+    """One JSON object per record.
+
+    fmt_keys maps output keys to record attributes. It is compiled once
+    into a plan of getters. message, timestamp, exc_info and stack_info
+    are computed, and the ones not named in fmt_keys follow the planned
+    keys, then the extra attributes of the record.
+    """
+
     def __init__(
         self,
         *,
@@ -40,36 +71,75 @@ class MyJSONFormatter(logging.Formatter):
     ):
         super().__init__()
         self.fmt_keys = fmt_keys if fmt_keys is not None else {}
+        computed = {
+            "message": self._message,
+            "timestamp": self._timestamp,
+            "exc_info": self._exc_info,
+            "stack_info": self._stack_info,
+        }
+        self._plan = [
+            (key, computed.get(val), operator.attrgetter(val))
+            for key, val in self.fmt_keys.items()
+        ]
+        self._always = [
+            (key, get)
+            for key, get in computed.items()
+            if key not in self.fmt_keys.values()
+        ]
+        # (second, "YYYY-MM-DDTHH:MM:SS"), swapped as a whole between threads
+        self._second = (None, "")
 
     # @override
     def format(self, record: logging.LogRecord) -> str:
         message = self._prepare_log_dict(record)
-        return json.dumps(message, default=str)
+        return serializer.dumps(message)
 
-    def _prepare_log_dict(self, record: logging.LogRecord):
-        always_fields = {
-            "message": record.getMessage(),
-            "timestamp": dt.datetime.fromtimestamp(
-                record.created, tz=dt.timezone.utc
-            ).isoformat(),
-        }
-        if record.exc_info is not None:
-            always_fields["exc_info"] = self.formatException(record.exc_info)
+    def _message(self, record: logging.LogRecord) -> str:
+        return record.getMessage()
 
-        if record.stack_info is not None:
-            always_fields["stack_info"] = self.formatStack(record.stack_info)
+    def _timestamp(self, record: logging.LogRecord) -> str:
+        # Same text as datetime.fromtimestamp(created, utc).isoformat(),
+        # the date and time part is only formatted once per second
+        second = int(record.created)
+        micro = round((record.created - second) * 1e6)
+        if micro >= 1000000:
+            second += 1
+            micro -= 1000000
 
-        message = {
-            key: msg_val
-            if (msg_val := always_fields.pop(val, None)) is not None
-            else getattr(record, val)
-            for key, val in self.fmt_keys.items()
-        }
-        message.update(always_fields)
+        cached, prefix = self._second
+        if cached != second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._second = (second, prefix)
+        if micro:
+            return f"{prefix}.{micro:06d}+00:00"
+        return f"{prefix}+00:00"
+
+    def _exc_info(self, record: logging.LogRecord) -> str | None:
+        if record.exc_info is None:
+            return None
+        return self.formatException(record.exc_info)
 
-        for key, val in record.__dict__.items():
-            if key not in LOG_RECORD_BUILTIN_ATTRS:
-                message[key] = val
+    def _stack_info(self, record: logging.LogRecord) -> str | None:
+        if record.stack_info is None:
+            return None
+        return self.formatStack(record.stack_info)
+
+    def _prepare_log_dict(self, record: logging.LogRecord):
+        message = dict()
+        for key, compute, get in self._plan:
+            value = None if compute is None else compute(record)
+            message[key] = value if value is not None else get(record)
+
+        for key, compute in self._always:
+            value = compute(record)
+            if value is not None:
+                message[key] = value
+
+        # Most records carry no extra, skip the walk over their attributes
+        if record.__dict__.keys() - LOG_RECORD_BUILTIN_ATTRS:
+            for key, val in record.__dict__.items():
+                if key not in LOG_RECORD_BUILTIN_ATTRS:
+                    message[key] = val
 
         return message
 
@@ -80,16 +150,256 @@ class NonErrorFilter(logging.Filter):
         return record.levelno <= logging.INFO
 
 
+class SamplingFilter(logging.Filter):
+    """Sampling and rate limiting for records below `pass_level`.
+
+    A record is kept with the rate of its message template in
+    `messages`, else of its logger or closest parent in `loggers`, else
+    `default_rate`. Kept records then take a token from the bucket of
+    their logger and template, refilled at `rate` per second up to
+    `burst`. The next record let through carries how many were
+    suppressed meanwhile. Records at `pass_level` or above always pass.
+
+    The decision is stored on the record, handlers sharing the filter
+    agree and the bucket is charged once.
+    """
+
+    def __init__(
+        self,
+        loggers: dict[str, float] | None = None,
+        messages: dict[str, float] | None = None,
+        default_rate: float = 1.0,
+        rate: float = 10.0,
+        burst: int = 50,
+        pass_level: str = "WARNING",
+        max_buckets: int = 1024,
+    ):
+        super().__init__()
+        self.loggers = loggers if loggers is not None else {}
+        self.messages = messages if messages is not None else {}
+        self.default_rate = default_rate
+        self.rate = rate
+        self.burst = burst
+        self.pass_level = logging.getLevelName(pass_level)
+        self.max_buckets = max_buckets
+        self._rates = dict()
+        # (logger, template): [tokens, refilled at, suppressed]
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._sampled = LOG_RECORDS_FILTERED.labels("sampled")
+        self._limited = LOG_RECORDS_FILTERED.labels("rate_limited")
+
+    # @override
+    def filter(self, record: logging.LogRecord) -> bool | logging.LogRecord:
+        if record.levelno >= self.pass_level:
+            return True
+        decision = record.__dict__.get("_sampling")
+        if decision is None:
+            decision = record._sampling = self._decide(record)
+        return decision
+
+    def _decide(self, record: logging.LogRecord) -> bool:
+        rate = self.messages.get(record.msg)
+        if rate is None:
+            rate = self._logger_rate(record.name)
+        if rate < 1.0 and random.random() >= rate:
+            self._sampled.inc()
+            return False
+
+        suppressed = self._take(record.name, record.msg)
+        if suppressed is None:
+            self._limited.inc()
+            return False
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} ({suppressed} suppressed)"
+        return True
+
+    def _logger_rate(self, name: str) -> float:
+        rate = self._rates.get(name)
+        if rate is None:
+            parent = name
+            while parent not in self.loggers and "." in parent:
+                parent = parent.rpartition(".")[0]
+            rate = self.loggers.get(parent, self.default_rate)
+            self._rates[name] = rate
+        return rate
+
+    def _take(self, name: str, template) -> int | None:
+        # Suppressed count to report, None when the bucket is empty
+        key = (name, template)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now, 0]
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return None
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+            return suppressed
+
+
+class BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that flushes once per batch, not once per record.
+
+    The file is flushed every `capacity` records, on records at
+    `flush_level` or above and when the queue listener runs out of
+    records, so a quiet process does not keep lines in the buffer.
+    """
+
+    def __init__(
+        self, *args, capacity: int = 256, flush_level: str = "ERROR", **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.capacity = capacity
+        self.flush_level = logging.getLevelName(flush_level)
+        self._pending = 0
+
+    # @override
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            self._pending += 1
+            if self._pending >= self.capacity or record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    # @override
+    def flush(self) -> None:
+        self._pending = 0
+        super().flush()
+
+
+class OverflowQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler over a bounded queue.
+
+    When the queue is full the record is dropped right away with the
+    "drop" policy, or after waiting up to `timeout` seconds for the
+    listener with the "block" policy. Drops are counted, never logged.
+    """
+
+    def __init__(
+        self, ref_queue: queue.Queue, overflow: str = "drop", timeout: float = 0.05
+    ):
+        super().__init__(ref_queue)
+        self.block = overflow == "block"
+        self.timeout = timeout
+
+    # @override
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves the process, the record only needs its
+        # message resolved, formatting is left to the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    # @override
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.block:
+                self.queue.put(record, timeout=self.timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    # @override
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            # Queue drained, write what the handlers have batched
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+    # @override
+    def enqueue_sentinel(self) -> None:
+        # Waits for room, the sentinel must not be dropped on a full queue
+        self.queue.put(self._sentinel)
+
+
+_listener = None
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+    _listener = None
+
+
+def setup_queue(
+    logger: logging.Logger,
+    size: int = 10000,
+    overflow: str = "drop",
+    timeout: float = 0.05,
+) -> BatchingQueueListener:
+    """Move the handlers of `logger` behind a queue and a listener thread.
+
+    Request threads only put records on the queue, the listener formats
+    them and writes to the handlers. It is restarted in forked workers.
+    """
+    global _listener
+    _stop_listener()
+
+    queue_handler = OverflowQueueHandler(queue.Queue(size), overflow, timeout)
+    # Filters every handler shares run before the queue, on the caller
+    for ref_filter in logger.handlers[0].filters if logger.handlers else []:
+        if all(ref_filter in handler.filters for handler in logger.handlers):
+            queue_handler.addFilter(ref_filter)
+    listener = BatchingQueueListener(
+        queue_handler.queue, *logger.handlers, respect_handler_level=True
+    )
+    queue_handler.listener = listener
+    logger.handlers = [queue_handler]
+
+    def restart():
+        # The listener thread does not survive the fork
+        queue_handler.queue = listener.queue = queue.Queue(size)
+        listener._thread = None
+        if _listener is listener:
+            listener.start()
+
+    os.register_at_fork(after_in_child=restart)
+    listener.start()
+    _listener = listener
+    return listener
+
+
 def setup_logging(file_path):
     config_file = pathlib.Path(file_path)
     with open(config_file) as f_in:
         config = json.load(f_in)
 
+    # dictConfig only configures queue handlers from python 3.12
+    queue_config = config.pop("queue", None)
+    _stop_listener()
     logging.config.dictConfig(config)
-    # queue_handler = logging.getHandlerByName("queue_handler")
-    # if queue_handler is not None:
-    #     queue_handler.listener.start()
-    #     atexit.register(queue_handler.listener.stop)
+    if queue_config is not None:
+        setup_queue(logging.getLogger(), **queue_config)
+
+
+atexit.register(_stop_listener)
 
 
 def logger_interface_test(config_file):
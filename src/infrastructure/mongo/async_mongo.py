@@ -0,0 +1,200 @@
+import os
+from typing import AsyncIterator, Dict, List
+
+import pymongo
+from bson import ObjectId
+from pymongo import AsyncMongoClient as AsyncMongoProvider
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from ...domain.model.error_message import DB_CREATE_FAIL, DB_DELETE_FAIL, DB_UPDATE_FAIL
+from ...utils import timeout
+from ..bootstrap import constant
+from ..singleton import singleton
+from .criteria_compiler import CriteriaCompiler
+from .mongo import CriteriaProtocol, failure
+from .mongo_pool import MongoPoolMetrics, MongoServer
+
+
+@singleton
+class AsyncMongoPool:
+    """One asyncio pymongo client per worker process.
+
+    Same settings and pool metrics as MongoPool. The client is built on
+    first use, inside the event loop that serves the requests.
+    """
+
+    def __init__(self, ref_mongo_server: MongoServer):
+        self.server = ref_mongo_server
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def dsn(self):
+        return f"mongodb://{self.server.username}:{self.server.password}@{self.server.hostname}:{self.server.port}"
+
+    def _reset(self):
+        self._client = None
+        self._pid = None
+
+    @property
+    def client(self) -> AsyncMongoProvider:
+        # Single event loop per process, no lock needed between awaits
+        if self._pid != os.getpid():
+            self._client = AsyncMongoProvider(
+                self.dsn,
+                minPoolSize=self.server.min_pool_size,
+                maxPoolSize=self.server.max_pool_size,
+                maxIdleTimeMS=self.server.max_idle_time_ms,
+                waitQueueTimeoutMS=self.server.wait_queue_timeout_ms,
+                event_listeners=[MongoPoolMetrics()],
+            )
+            self._pid = os.getpid()
+        return self._client
+
+    def get_collection(self, database: str, tablename: str):
+        return self.client[database][tablename]
+
+    async def close(self):
+        if self._client is not None and self._pid == os.getpid():
+            await self._client.close()
+        self._reset()
+
+
+class AsyncMongoClient:
+    """MongoClient with awaitable operations, for the asyncio server.
+
+    Queries are compiled the same way and the caller's deadline bounds
+    every operation.
+    """
+
+    def __init__(self, ref_mongo_pool: AsyncMongoPool, tablename: str = None):
+        self._p = ref_mongo_pool
+        self.server = ref_mongo_pool.server
+        self.tablename = tablename
+
+    def for_table(self, tablename: str) -> "AsyncMongoClient":
+        return AsyncMongoClient(self._p, tablename)
+
+    @property
+    def dsn(self):
+        return self._p.dsn
+
+    @property
+    def cursor(self):
+        return self._p.get_collection(self.server.collection, self.tablename)
+
+    @staticmethod
+    def _find(collection, query, attributes, **kwargs):
+        cursor = collection.find(query.filter, attributes, **kwargs)
+        if query.sort is not None:
+            cursor = cursor.sort(query.sort)
+        if query.skip > 0:
+            cursor = cursor.skip(query.skip)
+        if query.limit > 0:
+            cursor = cursor.limit(query.limit)
+        return cursor
+
+    async def fetch(
+        self,
+        attrs: List[str] = None,
+        matching: CriteriaProtocol = None,
+        aliases: dict = None,
+    ) -> List[Dict]:
+        query = CriteriaCompiler.compile(matching, aliases)
+        attributes = None
+        if attrs is not None:
+            attributes = {attr: 1 for attr in attrs}
+
+        try:
+            with pymongo.timeout(timeout.remaining()):
+                cursor = self._find(self.cursor, query, attributes)
+                return await cursor.to_list()
+        except PyMongoError as err:
+            if err.timeout:
+                raise timeout.TimeoutError(str(err)) from err
+            raise
+
+    async def stream(
+        self,
+        attrs: List[str] = None,
+        matching: CriteriaProtocol = None,
+        aliases: dict = None,
+        batch_size: int = constant.STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[Dict]:
+        query = CriteriaCompiler.compile(matching, aliases)
+        attributes = None
+        if attrs is not None:
+            attributes = {attr: 1 for attr in attrs}
+
+        cursor = self._find(self.cursor, query, attributes, batch_size=batch_size)
+        # Server time of the whole cursor, the pace of the reader is not counted
+        if (remaining := timeout.remaining()) is not None:
+            cursor = cursor.max_time_ms(max(1, int(remaining * 1000)))
+        try:
+            async for item in cursor:
+                yield item
+        finally:
+            await cursor.close()
+
+    async def get_by_id(self, identifier: str, attrs: List[str]) -> Dict | None:
+        attributes = None
+        if attrs is not None:
+            attributes = {attr: 1 for attr in attrs}
+        try:
+            with pymongo.timeout(timeout.remaining()):
+                return await self.cursor.find_one({"_id": identifier}, attributes)
+        except PyMongoError as err:
+            if err.timeout:
+                raise timeout.TimeoutError(str(err)) from err
+            raise
+
+    async def delete(self, identifier: str) -> int:
+        try:
+            with pymongo.timeout(timeout.remaining()):
+                result = await self.cursor.delete_one({"_id": identifier})
+            return result.deleted_count
+        except Exception as err:
+            raise failure(DB_DELETE_FAIL, err)
+
+    async def update(self, identifier: str, kwargs: dict) -> int:
+        try:
+            with pymongo.timeout(timeout.remaining()):
+                result = await self.cursor.update_one(
+                    {"_id": identifier}, {"$set": kwargs}
+                )
+            return result.matched_count
+        except Exception as err:
+            raise failure(DB_UPDATE_FAIL, err)
+
+    async def create(self, kwargs: dict) -> str:
+        try:
+            with pymongo.timeout(timeout.remaining()):
+                result = await self.cursor.insert_one(kwargs)
+            if isinstance(result.inserted_id, ObjectId):
+                return str(result.inserted_id)
+            return result.inserted_id
+        except Exception as err:
+            raise failure(DB_CREATE_FAIL, err)
+
+    async def insert_many(self, dataset: list[dict]) -> None:
+        try:
+            with pymongo.timeout(timeout.remaining()):
+                await self.cursor.insert_many(dataset)
+        except Exception as err:
+            raise failure(DB_CREATE_FAIL, err)
+
+    async def bulk_insert(
+        self, dataset: list[dict], ordered: bool = False
+    ) -> tuple[int, list[dict]]:
+        try:
+            with pymongo.timeout(timeout.remaining()):
+                result = await self.cursor.insert_many(dataset, ordered=ordered)
+            return len(result.inserted_ids), []
+        except BulkWriteError as err:
+            errors = [
+                {"index": item["index"], "message": item["errmsg"]}
+                for item in err.details.get("writeErrors", [])
+            ]
+            return err.details.get("nInserted", 0), errors
+        except Exception as err:
+            raise failure(DB_CREATE_FAIL, err)
@@ -0,0 +1,148 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from ...application.criteria import CriteriaFilters
+
+MongoQuery = namedtuple(
+    "MongoQuery",
+    [
+        "filter",
+        "sort",
+        "skip",
+        "limit",
+    ],
+)
+
+QueryPlan = namedtuple(
+    "QueryPlan",
+    [
+        "groups",
+        "sort",
+        "limit_index",
+        "page_index",
+    ],
+)
+
+MONGO_OPERATORS = {
+    "=": "$eq",
+    "!=": "$ne",
+    ">": "$gt",
+    ">=": "$gte",
+    "<": "$lt",
+    "<=": "$lte",
+    "in": "$in",
+    "not in": "$nin",
+}
+
+EMPTY_QUERY = MongoQuery({}, None, 0, 0)
+
+
+class CriteriaCompiler:
+    """Translate Criteria clauses into a server side mongo query.
+
+    Clauses are split into a shape (fields, operators and connectors) and
+    the literal values, plans are cached by shape so identical criteria
+    with different values are parsed once.
+    """
+
+    @classmethod
+    def compile(cls, matching, aliases: dict = None) -> MongoQuery:
+        if matching is None or len(matching.clauses) == 0:
+            return EMPTY_QUERY
+
+        shape, values = cls.split(matching.clauses)
+        alias_key = tuple(sorted(aliases.items())) if aliases else ()
+        plan = cls.plan(shape, alias_key)
+
+        return cls.bind(plan, values)
+
+    @staticmethod
+    def split(clauses: list) -> tuple[tuple, list]:
+        shape = list()
+        values = list()
+        for clause in clauses:
+            if isinstance(clause, CriteriaFilters):
+                shape.append(clause)
+            elif clause[0] == CriteriaFilters.LIMIT:
+                shape.append((CriteriaFilters.LIMIT,))
+                values.append(clause[2])
+            elif clause[0] == CriteriaFilters.PAGINATION:
+                shape.append((CriteriaFilters.PAGINATION,))
+                values.extend([clause[1], clause[2]])
+            elif clause[0] == CriteriaFilters.ORDER:
+                shape.append(clause)
+            else:
+                field, operator, value = clause
+                shape.append((field, operator))
+                values.append(value)
+        return tuple(shape), values
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def plan(shape: tuple, aliases: tuple) -> QueryPlan:
+        alias = dict(aliases)
+        groups = [[]]
+        sort = list()
+        limit_index = None
+        page_index = None
+
+        value_index = 0
+        for item in shape:
+            if item == CriteriaFilters.OR:
+                # AND binds tighter than OR: start a new conjunction
+                groups.append([])
+            elif item == CriteriaFilters.AND:
+                continue
+            elif item[0] == CriteriaFilters.LIMIT:
+                limit_index = value_index
+                value_index += 1
+            elif item[0] == CriteriaFilters.PAGINATION:
+                page_index = value_index
+                value_index += 2
+            elif item[0] == CriteriaFilters.ORDER:
+                _, field, ascending = item
+                sort.append((alias.get(field, field), 1 if ascending else -1))
+            else:
+                field, operator = item
+                if operator not in MONGO_OPERATORS:
+                    raise ValueError(f"Invalid operator: {operator}")
+                groups[-1].append(
+                    (alias.get(field, field), MONGO_OPERATORS[operator], value_index)
+                )
+                value_index += 1
+
+        groups = tuple(tuple(group) for group in groups if len(group) > 0)
+        if page_index is not None and len(sort) == 0:
+            # Offsets are only stable over a deterministic order
+            sort.append(("_id", 1))
+
+        return QueryPlan(groups, tuple(sort), limit_index, page_index)
+
+    @staticmethod
+    def bind(plan: QueryPlan, values: list) -> MongoQuery:
+        conjunctions = list()
+        for group in plan.groups:
+            conditions = [
+                {field: {operator: values[index]}} for field, operator, index in group
+            ]
+            conjunctions.append(
+                conditions[0] if len(conditions) == 1 else {"$and": conditions}
+            )
+
+        query_filter = dict()
+        if len(conjunctions) == 1:
+            query_filter = conjunctions[0]
+        elif len(conjunctions) > 1:
+            query_filter = {"$or": conjunctions}
+
+        skip = 0
+        limit = 0
+        if plan.limit_index is not None:
+            limit = values[plan.limit_index]
+        if plan.page_index is not None:
+            page = values[plan.page_index]
+            size = values[plan.page_index + 1]
+            skip = (page - 1) * size
+            limit = size if limit == 0 else min(limit, size)
+
+        return MongoQuery(query_filter, list(plan.sort) or None, skip, limit)
@@ -5,23 +5,57 @@ class MockRepositoryClient:
     def dsn(self):
         return "mock-repos"
 
-    def set_tablename(self, tablename):
+    def for_table(self, tablename):
         self.tablename = tablename
+        return self
 
-    def fetch(self, attrs, matching):
+    def fetch(self, attrs, matching, aliases=None):
         return [self.object]
 
+    def stream(self, attrs, matching, aliases=None):
+        yield self.object
+
     def get_by_id(self, identifier, attrs):
         return self.object
 
-    def delete(self, identifier) -> None:
-        return None
+    def delete(self, identifier) -> int:
+        return 1
 
-    def update(self, identifier, kwargs) -> None:
-        return None
+    def update(self, identifier, kwargs) -> int:
+        return 1
 
     def create(self, item) -> None:
         return None
 
     def insert_many(self, data) -> None:
         return None
+
+    def bulk_insert(self, data) -> tuple[int, list]:
+        return len(data), []
+
+
+class AsyncMockRepositoryClient(MockRepositoryClient):
+    # Copies: async repositories rename _id on what they receive
+    async def fetch(self, attrs, matching, aliases=None):
+        return [dict(self.object)]
+
+    async def stream(self, attrs, matching, aliases=None):
+        yield dict(self.object)
+
+    async def get_by_id(self, identifier, attrs):
+        return dict(self.object)
+
+    async def delete(self, identifier) -> int:
+        return 1
+
+    async def update(self, identifier, kwargs) -> int:
+        return 1
+
+    async def create(self, item) -> None:
+        return None
+
+    async def insert_many(self, data) -> None:
+        return None
+
+    async def bulk_insert(self, data, ordered=False) -> tuple[int, list]:
+        return len(data), []
@@ -1,51 +1,68 @@
-from datetime import datetime
-from typing import Dict, List, Protocol
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Protocol
 
+import pymongo
 from bson import ObjectId
-from pydantic import BaseModel
-from pymongo import MongoClient as MongoProvider
+from pymongo.errors import BulkWriteError, PyMongoError
 
 from ...domain.model.error_message import DB_CREATE_FAIL, DB_DELETE_FAIL, DB_UPDATE_FAIL
+from ...utils import timeout
+from ..bootstrap import constant
 from ..InfrastructureError import InfrastructureError
+from .criteria_compiler import CriteriaCompiler
+from .mongo_pool import MongoPool, MongoServer
 
 
-#TODO do not close the connection and give the responsability of manage function to repositories
+class CriteriaProtocol(Protocol):
+    clauses: list
 
-class MongoServer(BaseModel):
-    hostname: str
-    port: int
-    username: str
-    password: str
-    collection: str
 
+@contextmanager
+def bounded():
+    # What is left of the caller's deadline becomes maxTimeMS and the
+    # socket timeout, the server stops working once the caller gave up
+    try:
+        with pymongo.timeout(timeout.remaining()):
+            yield
+    except PyMongoError as err:
+        if err.timeout:
+            raise timeout.TimeoutError(str(err)) from err
+        raise
 
-class CriteriaProtocol(Protocol):
-    clauses: list
+
+def failure(status, err: Exception) -> Exception:
+    # Deadline hits keep their own type, they are answered as timeouts
+    if isinstance(err, PyMongoError) and err.timeout:
+        return timeout.TimeoutError(str(err))
+    return InfrastructureError(status, str(err))
 
 
 class MongoClient:
-    def __init__(self, ref_mongo_server: MongoServer):
-        self.server = ref_mongo_server
-        self.client = None
+    def __init__(self, ref_mongo_pool: MongoPool, tablename: str = None):
+        self._p = ref_mongo_pool
+        self.server = ref_mongo_pool.server
+        self.tablename = tablename
         self.collection = None
+        self._pid = None
+        if tablename is not None:
+            self._connect()
 
-    def set_tablename(self, tablename):
-        self.tablename = tablename
+    def for_table(self, tablename: str) -> "MongoClient":
+        # Each repository owns its handle, the shared client is never mutated
+        return MongoClient(self._p, tablename)
 
     @property
     def dsn(self):
-        return f"mongodb://{self.server.username}:{self.server.password}@{self.server.hostname}:{self.server.port}"
-
-    @staticmethod
-    def decoder_criteria(matching) -> None:
-        print(matching)
+        return self._p.dsn
 
     def _connect(self):
-        if self.client is None:
-            self.client = MongoProvider(self.dsn)
-            self.collection = self.client[self.server.collection][
-                self.tablename
-            ]  # Access collection directly
+        # Resolved once per process, handles are only rebuilt after a fork
+        if self._pid != os.getpid():
+            self.collection = self._p.get_collection(
+                self.server.collection, self.tablename
+            )
+            self._pid = os.getpid()
 
     @property
     def cursor(self):
@@ -57,19 +74,57 @@ class MongoClient:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.client:
-            self.client.close()
-            self.client = None
+        # Connections belong to the pool, they are released on checkin
+        return None
 
     def fetch(
-        self, attrs: List[str] = None, matching: CriteriaProtocol = None
+        self,
+        attrs: List[str] = None,
+        matching: CriteriaProtocol = None,
+        aliases: dict = None,
     ) -> List[Dict] | InfrastructureError:
-        if matching is not None:
-            self.decoder_criteria(matching)
-        attributes = dict
+        query = CriteriaCompiler.compile(matching, aliases)
+        attributes = None
         if attrs is not None:
             attributes = {attr: 1 for attr in attrs}
-        return list(self.cursor.find({}, attributes))
+
+        with bounded():
+            cursor = self.cursor.find(query.filter, attributes)
+            if query.sort is not None:
+                cursor = cursor.sort(query.sort)
+            if query.skip > 0:
+                cursor = cursor.skip(query.skip)
+            if query.limit > 0:
+                cursor = cursor.limit(query.limit)
+            return list(cursor)
+
+    def stream(
+        self,
+        attrs: List[str] = None,
+        matching: CriteriaProtocol = None,
+        aliases: dict = None,
+        batch_size: int = constant.STREAM_BATCH_SIZE,
+    ) -> Iterator[Dict] | InfrastructureError:
+        query = CriteriaCompiler.compile(matching, aliases)
+        attributes = None
+        if attrs is not None:
+            attributes = {attr: 1 for attr in attrs}
+
+        # The driver keeps a single batch in memory while we iterate
+        cursor = self.cursor.find(query.filter, attributes, batch_size=batch_size)
+        if query.sort is not None:
+            cursor = cursor.sort(query.sort)
+        if query.skip > 0:
+            cursor = cursor.skip(query.skip)
+        if query.limit > 0:
+            cursor = cursor.limit(query.limit)
+        # Server time of the whole cursor, the pace of the reader is not counted
+        if (remaining := timeout.remaining()) is not None:
+            cursor = cursor.max_time_ms(max(1, int(remaining * 1000)))
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
 
     def get_by_id(
         self, identifier: str, attrs: List[str]
@@ -77,46 +132,68 @@ class MongoClient:
         attributes = dict
         if attrs is not None:
             attributes = {attr: 1 for attr in attrs}
-        return self.cursor.find_one({"_id": identifier}, attributes)
+        with bounded():
+            return self.cursor.find_one({"_id": identifier}, attributes)
 
-    def delete(self, identifier: str) -> None | InfrastructureError:
+    def delete(self, identifier: str) -> int | InfrastructureError:
         try:
-            self.cursor.delete_one({"_id": identifier})
+            with pymongo.timeout(timeout.remaining()):
+                result = self.cursor.delete_one({"_id": identifier})
+            return result.deleted_count
         except Exception as err:
-            raise InfrastructureError(DB_DELETE_FAIL, str(err))
+            raise failure(DB_DELETE_FAIL, err)
 
-    def update(self, identifier: str, kwargs: dict) -> None | InfrastructureError:
+    def update(self, identifier: str, kwargs: dict) -> int | InfrastructureError:
         try:
-            result = self.cursor.update_one({"_id": identifier}, {"$set": kwargs})
-            return result.modified_count
+            with pymongo.timeout(timeout.remaining()):
+                result = self.cursor.update_one({"_id": identifier}, {"$set": kwargs})
+            # Matched, not modified: rewriting identical values still counts
+            return result.matched_count
         except Exception as err:
-            raise InfrastructureError(DB_UPDATE_FAIL, str(err))
+            raise failure(DB_UPDATE_FAIL, err)
 
     def create(self, kwargs: dict) -> str | InfrastructureError:
         try:
-            identity = self.cursor.insert_one(kwargs).inserted_id
+            with pymongo.timeout(timeout.remaining()):
+                identity = self.cursor.insert_one(kwargs).inserted_id
             if isinstance(identity, ObjectId):
                 return str(identity)
             return identity
         except Exception as err:
-            raise InfrastructureError(DB_CREATE_FAIL, str(err))
+            raise failure(DB_CREATE_FAIL, err)
 
     def insert_many(self, dataset: list[dict]) -> None | InfrastructureError:
         try:
-            self.cursor.insert_many(dataset)
+            with pymongo.timeout(timeout.remaining()):
+                self.cursor.insert_many(dataset)
+        except Exception as err:
+            raise failure(DB_CREATE_FAIL, err)
+
+    def bulk_insert(
+        self, dataset: list[dict], ordered: bool = False
+    ) -> tuple[int, list[dict]] | InfrastructureError:
+        # Unordered: the server keeps going after a failing document
+        try:
+            with pymongo.timeout(timeout.remaining()):
+                result = self.cursor.insert_many(dataset, ordered=ordered)
+            return len(result.inserted_ids), []
+        except BulkWriteError as err:
+            errors = [
+                {"index": item["index"], "message": item["errmsg"]}
+                for item in err.details.get("writeErrors", [])
+            ]
+            return err.details.get("nInserted", 0), errors
         except Exception as err:
-            raise InfrastructureError(DB_CREATE_FAIL, str(err))
+            raise failure(DB_CREATE_FAIL, err)
 
     @staticmethod
     def get_object_id():
-        now = datetime.now()
-        return str(ObjectId.from_datetime(now))
+        return str(ObjectId())
 
 
 # Test
 def mongo_interface_test(ref_mongo_server):
-    mongo_repository = MongoClient(ref_mongo_server)
-    mongo_repository.set_tablename("test")
+    mongo_repository = MongoClient(MongoPool(ref_mongo_server)).for_table("test")
     assert hasattr(mongo_repository, "dsn")
 
     current_id = MongoClient.get_object_id()
@@ -0,0 +1,165 @@
+import os
+import threading
+
+from prometheus_client import Counter, Gauge
+from pydantic import BaseModel
+from pymongo import MongoClient as MongoProvider
+from pymongo import monitoring
+
+from ..singleton import singleton
+
+POOL_CONNECTIONS = Gauge(
+    "mongo_pool_connections",
+    "Open connections in the mongo pool",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKED_OUT = Gauge(
+    "mongo_pool_checked_out",
+    "Connections currently borrowed from the mongo pool",
+    ["address"],
+    multiprocess_mode="livesum",
+)
+POOL_CREATED = Counter(
+    "mongo_pool_connections_created",
+    "Connections opened by the mongo pool",
+    ["address"],
+)
+POOL_CLOSED = Counter(
+    "mongo_pool_connections_closed",
+    "Connections closed by the mongo pool",
+    ["address", "reason"],
+)
+POOL_CHECKOUT_FAILED = Counter(
+    "mongo_pool_checkout_failed",
+    "Failed attempts to borrow a connection from the mongo pool",
+    ["address", "reason"],
+)
+
+
+class MongoServer(BaseModel):
+    hostname: str
+    port: int
+    username: str
+    password: str
+    collection: str
+    min_pool_size: int = 0
+    max_pool_size: int = 100
+    max_idle_time_ms: int = 60000
+    wait_queue_timeout_ms: int = 5000
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    @staticmethod
+    def _address(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        address = self._address(event)
+        POOL_CONNECTIONS.labels(address).set(0)
+        POOL_CHECKED_OUT.labels(address).set(0)
+
+    def connection_created(self, event):
+        address = self._address(event)
+        POOL_CREATED.labels(address).inc()
+        POOL_CONNECTIONS.labels(address).inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        address = self._address(event)
+        POOL_CLOSED.labels(address, event.reason).inc()
+        POOL_CONNECTIONS.labels(address).dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        POOL_CHECKOUT_FAILED.labels(self._address(event), event.reason).inc()
+
+    def connection_checked_out(self, event):
+        POOL_CHECKED_OUT.labels(self._address(event)).inc()
+
+    def connection_checked_in(self, event):
+        POOL_CHECKED_OUT.labels(self._address(event)).dec()
+
+
+@singleton
+class MongoPool:
+    """One pooled pymongo client per worker process.
+
+    pymongo clients are not fork-safe, so the client is dropped in the
+    child after a fork and rebuilt lazily on first use.
+    """
+
+    def __init__(self, ref_mongo_server: MongoServer):
+        self.server = ref_mongo_server
+        self._client = None
+        self._collections = dict()
+        self._pid = None
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def dsn(self):
+        return f"mongodb://{self.server.username}:{self.server.password}@{self.server.hostname}:{self.server.port}"
+
+    def _reset(self):
+        self._client = None
+        self._collections = dict()
+        self._pid = None
+        self._lock = threading.Lock()
+        POOL_CONNECTIONS.clear()
+        POOL_CHECKED_OUT.clear()
+
+    def _create(self):
+        return MongoProvider(
+            self.dsn,
+            minPoolSize=self.server.min_pool_size,
+            maxPoolSize=self.server.max_pool_size,
+            maxIdleTimeMS=self.server.max_idle_time_ms,
+            waitQueueTimeoutMS=self.server.wait_queue_timeout_ms,
+            event_listeners=[MongoPoolMetrics()],
+        )
+
+    @property
+    def client(self) -> MongoProvider:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._client = self._create()
+                    self._collections = dict()
+                    self._pid = os.getpid()
+        return self._client
+
+    def get_collection(self, database: str, tablename: str):
+        key = (database, tablename)
+        client = self.client
+        collection = self._collections.get(key)
+        if collection is None:
+            # pymongo collections are immutable and thread safe, build once
+            with self._lock:
+                collection = self._collections.get(key)
+                if collection is None:
+                    collection = client[database][tablename]
+                    self._collections[key] = collection
+        return collection
+
+    def close(self):
+        with self._lock:
+            if self._client is not None and self._pid == os.getpid():
+                self._client.close()
+            self._client = None
+            self._collections = dict()
+            self._pid = None
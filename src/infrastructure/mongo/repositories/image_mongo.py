@@ -6,8 +6,7 @@ class ImageMongo:
     tablename = "image"
 
     def __init__(self, ref_client: MongoClient, pk=None) -> None | InfrastructureError:
-        self._m = ref_client
-        self._m.set_tablename(self.tablename)
+        self._m = ref_client.for_table(self.tablename)
         self.pk = pk if pk is not None else "_id"
 
     def entity_exists(self, identifier) -> bool:
@@ -16,26 +15,30 @@ class ImageMongo:
         return True
 
     def fetch(self, fields: list, matching) -> list:
-        dataset = self._m.fetch(fields, matching)
+        dataset = self._m.fetch(fields, matching, {self.pk: "_id"})
         if self.pk != "_id":
             for item in dataset:
                 item[self.pk] = item.pop("_id")
         return dataset
 
+    def stream(self, fields: list, matching):
+        for item in self._m.stream(fields, matching, {self.pk: "_id"}):
+            if self.pk != "_id":
+                item[self.pk] = item.pop("_id")
+            yield item
+
     def get_by_id(self, identifier, fields: list) -> dict:
         item = self._m.get_by_id(identifier, fields)
         if self.pk != "_id" and item:
             item[self.pk] = item.pop("_id")
         return item
 
-    def delete(self, identifier) -> None | InfrastructureError:
-        self._m.delete(identifier)
-        return None
+    def delete(self, identifier) -> int | InfrastructureError:
+        return self._m.delete(identifier)
 
-    def update(self, identifier, item) -> None | InfrastructureError:
+    def update(self, identifier, item) -> int | InfrastructureError:
         item.pop(self.pk)
-        self._m.update(identifier, item)
-        return None
+        return self._m.update(identifier, item)
 
     def create(self, item) -> None | InfrastructureError:
         item["_id"] = item.pop(self.pk)
@@ -1,4 +1,5 @@
 from ...InfrastructureError import InfrastructureError
+from ..async_mongo import AsyncMongoClient
 from ..mongo import MongoClient
 
 
@@ -6,8 +7,7 @@ class TicketMongo:
     tablename = "ticket"
 
     def __init__(self, ref_client: MongoClient, pk) -> None | InfrastructureError:
-        self._m = ref_client
-        self._m.set_tablename(self.tablename)
+        self._m = ref_client.for_table(self.tablename)
         self.pk = pk
 
     def entity_exists(self, identifier) -> bool:
@@ -16,26 +16,30 @@ class TicketMongo:
         return True
 
     def fetch(self, fields: list, matching) -> list:
-        dataset = self._m.fetch(fields, matching)
+        dataset = self._m.fetch(fields, matching, {self.pk: "_id"})
         if self.pk != "_id":
             for item in dataset:
                 item[self.pk] = item.pop("_id")
         return dataset
 
+    def stream(self, fields: list, matching):
+        for item in self._m.stream(fields, matching, {self.pk: "_id"}):
+            if self.pk != "_id":
+                item[self.pk] = item.pop("_id")
+            yield item
+
     def get_by_id(self, identifier, fields: list) -> dict:
         item = self._m.get_by_id(identifier, fields)
         if self.pk != "_id" and item:
             item[self.pk] = item.pop("_id")
         return item
 
-    def delete(self, identifier) -> None | InfrastructureError:
-        self._m.delete(identifier)
-        return None
+    def delete(self, identifier) -> int | InfrastructureError:
+        return self._m.delete(identifier)
 
-    def update(self, identifier, item) -> None | InfrastructureError:
+    def update(self, identifier, item) -> int | InfrastructureError:
         item.pop(self.pk)
-        self._m.update(identifier, item)
-        return None
+        return self._m.update(identifier, item)
 
     def create(self, item) -> None | InfrastructureError:
         item["_id"] = item.pop(self.pk)
@@ -48,3 +52,47 @@ class TicketMongo:
             item["_id"] = item.pop(self.pk)
         self._m.insert_many(dataset)
         return None
+
+
+class TicketAsyncMongo:
+    tablename = "ticket"
+
+    def __init__(self, ref_client: AsyncMongoClient, pk) -> None | InfrastructureError:
+        self._m = ref_client.for_table(self.tablename)
+        self.pk = pk
+
+    async def entity_exists(self, identifier) -> bool:
+        if await self._m.get_by_id(identifier, [self.pk]) is None:
+            return False
+        return True
+
+    async def fetch(self, fields: list, matching) -> list:
+        dataset = await self._m.fetch(fields, matching, {self.pk: "_id"})
+        if self.pk != "_id":
+            for item in dataset:
+                item[self.pk] = item.pop("_id")
+        return dataset
+
+    async def stream(self, fields: list, matching):
+        async for item in self._m.stream(fields, matching, {self.pk: "_id"}):
+            if self.pk != "_id":
+                item[self.pk] = item.pop("_id")
+            yield item
+
+    async def get_by_id(self, identifier, fields: list) -> dict:
+        item = await self._m.get_by_id(identifier, fields)
+        if self.pk != "_id" and item:
+            item[self.pk] = item.pop("_id")
+        return item
+
+    async def delete(self, identifier) -> int | InfrastructureError:
+        return await self._m.delete(identifier)
+
+    async def update(self, identifier, item) -> int | InfrastructureError:
+        item.pop(self.pk)
+        return await self._m.update(identifier, item)
+
+    async def create(self, item) -> None | InfrastructureError:
+        item["_id"] = item.pop(self.pk)
+        await self._m.create(item)
+        return None
@@ -1,8 +1,10 @@
+import copy
 from typing import TextIO
 
 from ...application.use_case.image import ImageUseCase
 from ...domain.model.image import ImageDomain
 from ...infrastructure.mongo.repositories.image_mongo import ImageMongo
+from ..params import parse_size
 
 
 class ImageController:
@@ -19,6 +21,17 @@ class ImageController:
         self._uc = ImageUseCase(_w, _r, _b)
         self._p = image_path
 
+    def bind(self, ref_write_uid) -> "ImageController":
+        controller = copy.copy(self)
+        controller._uc = self._uc.bind(ref_write_uid)
+        return controller
+
+    def stream(self):
+        return self._uc.stream()
+
+    def fetch_page(self, size: str | int = None, token: str = None) -> dict:
+        return self._uc.fetch_page(parse_size(size), token)
+
     def create(
         self,
         image_file: TextIO,
@@ -1,46 +1,93 @@
-from utils.timeout import timeout_function
-from ...application.use_case.person import PersonUseCase
+import copy
+
+import pandas as pd
+
+from ...application.audit_handler import AuditHandler
+from ...application.continuation import ContinuationToken
+from ...application.use_case.person import AsyncPersonUseCase, PersonUseCase
 from ...domain.enum.contact_type import ContactType
 from ...domain.model.person import PersonDomain
-from ...infrastructure.mongo.repositories.person_mongo import PersonMongo
+from ...infrastructure.bootstrap import constant
+from ...infrastructure.cache.cached_repository import CachedRepository
+from ...infrastructure.mongo.repositories.person_mongo import (
+    PersonAsyncMongo,
+    PersonMongo,
+)
+from ...utils.timeout import (
+    async_timeout_function,
+    async_timeout_iterator,
+    timeout_function,
+    timeout_iterator,
+)
+from ..params import parse_size
 
 # Time out per use case
 class PersonController:
     def __init__(
         self,
         ref_write_uid,
-        ref_env,
-        ref_timeout,
+        ref_repository,
+        ref_broker,
+        ref_timeout: int = constant.TIME_OUT,
+        ref_cache=None,
     ) -> None:
         _w = ref_write_uid
-        _r = PersonMongo(ref_env["REPOSITORY_MONGO"])
-        _b = ref_env["BROKER_RABBITMQ"]
+        _r = PersonMongo(ref_repository, PersonDomain.pk)
+        if ref_cache is not None:
+            _r = CachedRepository(
+                _r, ref_cache, fresh_fields=(AuditHandler.version_field,)
+            )
+        _b = ref_broker
         self._t = ref_timeout
         self._uc = PersonUseCase(_w, _r, _b)
 
-    def fetch(self) -> list:
-        return timeout_function(
-                self._uc.fetch(0), seconds=self._t
-            )
+    def bind(self, ref_write_uid) -> "PersonController":
+        controller = copy.copy(self)
+        controller._uc = self._uc.bind(ref_write_uid)
+        return controller
+
+    def _call(self, func, *args):
+        return timeout_function(func, args, seconds=self._t)
+
+    def fetch(self, size: str | int = None, page: str | int = None) -> list:
+        # Numbered pages, bounded like the continuation ones
+        limit = ContinuationToken.page_size(parse_size(size))
+        return self._call(self._uc.fetch, limit, parse_size(page, "page") or 0)
+
+    def stream(self):
+        return timeout_iterator(self._uc.stream(), seconds=self._t)
+
+    def fetch_page(self, size: str | int = None, token: str = None) -> dict:
+        return self._call(self._uc.fetch_page, parse_size(size), token)
 
     def get_by_id(self, person_id: str):
         person_id = PersonDomain.set_identifier(person_id)
 
+        return timeout_function(self._uc.get_by_id, (person_id,), seconds=self._t)
+
+    def get_version(self, person_id: str) -> str | None:
+        person_id = PersonDomain.set_identifier(person_id)
+
+        return timeout_function(self._uc.get_version, (person_id,), seconds=self._t)
+
+    def get_by_id_with_version(self, person_id: str) -> tuple:
+        person_id = PersonDomain.set_identifier(person_id)
+
         return timeout_function(
-            self._uc.get_by_id(person_id), seconds=self._t
+            self._uc.get_by_id_with_version, (person_id,), seconds=self._t
         )
 
 
     def delete(self, person_id: str):
         person_id = PersonDomain.set_identifier(person_id)
 
-        return self._uc.delete(person_id)
+        return self._call(self._uc.delete, person_id)
 
     def update(self, person_id: str, params: dict):
         params.update({"person_id": person_id})
         obj = PersonDomain.from_dict(params)
 
-        return self._uc.update(obj)
+        return self._call(self._uc.update, obj)
 
     def create(
         self,
@@ -66,7 +113,70 @@ class PersonController:
             address,
         )
 
-        return self._uc.create(obj)
+        return self._call(self._uc.create, obj)
 
     def insert_many(self, data: list):
         return self._uc.insert_many(data)
+
+    def import_csv(self, csv_file, batch_size: str | int = None) -> dict:
+        # Only one chunk of the upload is parsed in memory at a time
+        chunks = pd.read_csv(
+            csv_file,
+            delimiter=",",
+            dtype=str,
+            chunksize=constant.CSV_CHUNK_SIZE,
+        )
+        size = int(batch_size) if batch_size else constant.BULK_BATCH_SIZE
+
+        return self._uc.import_frames(self._csv_frames(chunks), size)
+
+    @staticmethod
+    def _csv_frames(chunks):
+        for chunk in chunks:
+            if "contact_type" in chunk:
+                chunk["contact_type"] = chunk["contact_type"].map(
+                    lambda v: int(v) if isinstance(v, str) and v.isdigit() else v
+                )
+            yield chunk
+
+
+class AsyncPersonController(PersonController):
+    """PersonController for the asyncio server, every call is awaitable.
+
+    Validation is inherited, the use case returns coroutines that run
+    under the controller deadline on the event loop.
+    """
+
+    def __init__(
+        self,
+        ref_write_uid,
+        ref_repository,
+        ref_broker,
+        ref_timeout: int = constant.TIME_OUT,
+    ) -> None:
+        _w = ref_write_uid
+        _r = PersonAsyncMongo(ref_repository, PersonDomain.pk)
+        _b = ref_broker
+        self._t = ref_timeout
+        self._uc = AsyncPersonUseCase(_w, _r, _b)
+
+    async def _call(self, func, *args):
+        return await async_timeout_function(func, args, seconds=self._t)
+
+    def stream(self):
+        return async_timeout_iterator(self._uc.stream(), seconds=self._t)
+
+    async def get_by_id(self, person_id: str):
+        person_id = PersonDomain.set_identifier(person_id)
+
+        return await self._call(self._uc.get_by_id, person_id)
+
+    async def get_version(self, person_id: str) -> str | None:
+        person_id = PersonDomain.set_identifier(person_id)
+
+        return await self._call(self._uc.get_version, person_id)
+
+    async def get_by_id_with_version(self, person_id: str) -> tuple:
+        person_id = PersonDomain.set_identifier(person_id)
+
+        return await self._call(self._uc.get_by_id_with_version, person_id)
@@ -1,8 +1,24 @@
-from ...application.use_case.ticket import TicketUseCase
+import copy
+
+from ...application.audit_handler import AuditHandler
+from ...application.continuation import ContinuationToken
+from ...application.use_case.ticket import AsyncTicketUseCase, TicketUseCase
 from ...domain.enum.channel_type import ChannelType
 from ...domain.enum.ticket_state import TicketState
 from ...domain.model.ticket import TicketDomain
-from ...infrastructure.mongo.repositories.ticket_mongo import TicketMongo
+from ...infrastructure.bootstrap import constant
+from ...infrastructure.cache.cached_repository import CachedRepository
+from ...infrastructure.mongo.repositories.ticket_mongo import (
+    TicketAsyncMongo,
+    TicketMongo,
+)
+from ...utils.timeout import (
+    async_timeout_function,
+    async_timeout_iterator,
+    timeout_function,
+    timeout_iterator,
+)
+from ..params import parse_size
 
 
 class TicketController:
@@ -11,30 +27,65 @@ class TicketController:
         ref_write_uid,
         ref_repository,
         ref_broker,
+        ref_timeout: int = constant.TIME_OUT,
+        ref_cache=None,
     ) -> None:
         _w = ref_write_uid
         _r = TicketMongo(ref_repository, TicketDomain.pk)
+        if ref_cache is not None:
+            _r = CachedRepository(
+                _r, ref_cache, fresh_fields=(AuditHandler.version_field,)
+            )
         _b = ref_broker
+        self._t = ref_timeout
         self._uc = TicketUseCase(_w, _r, _b)
 
-    def fetch(self) -> list:
-        return self._uc.fetch(0)
+    def bind(self, ref_write_uid) -> "TicketController":
+        controller = copy.copy(self)
+        controller._uc = self._uc.bind(ref_write_uid)
+        return controller
+
+    def _call(self, func, *args):
+        return timeout_function(func, args, seconds=self._t)
+
+    def fetch(self, size: str | int = None, page: str | int = None) -> list:
+        # Numbered pages, bounded like the continuation ones
+        limit = ContinuationToken.page_size(parse_size(size))
+        return self._call(self._uc.fetch, limit, parse_size(page, "page") or 0)
+
+    def stream(self):
+        return timeout_iterator(self._uc.stream(), seconds=self._t)
+
+    def fetch_page(self, size: str | int = None, token: str = None) -> dict:
+        return self._call(self._uc.fetch_page, parse_size(size), token)
 
     def get_by_id(self, ticket_id: str):
         ticket_id = TicketDomain.set_identifier(ticket_id)
 
-        return self._uc.get_by_id(ticket_id)
+        return timeout_function(self._uc.get_by_id, (ticket_id,), seconds=self._t)
+
+    def get_version(self, ticket_id: str) -> str | None:
+        ticket_id = TicketDomain.set_identifier(ticket_id)
+
+        return timeout_function(self._uc.get_version, (ticket_id,), seconds=self._t)
+
+    def get_by_id_with_version(self, ticket_id: str) -> tuple:
+        ticket_id = TicketDomain.set_identifier(ticket_id)
+
+        return timeout_function(
+            self._uc.get_by_id_with_version, (ticket_id,), seconds=self._t
+        )
 
     def delete(self, ticket_id: str):
         ticket_id = TicketDomain.set_identifier(ticket_id)
 
-        return self._uc.delete(ticket_id)
+        return self._call(self._uc.delete, ticket_id)
 
     def update(self, ticket_id: str, params: dict):
-        ticket_id = TicketDomain.set_identifier(ticket_id)
-        obj = TicketDomain.from_dict(ticket_id, params)
+        params.update({TicketDomain.pk: ticket_id})
+        obj = TicketDomain.from_dict(params)
 
-        return self._uc.update(obj)
+        return self._call(self._uc.update, obj)
 
     def create(
         self,
@@ -60,4 +111,46 @@ class TicketController:
             ticket_id, enum_channel, requirement, because, enum_state, attrs
         )
 
-        return self._uc.create(obj)
+        return self._call(self._uc.create, obj)
+
+
+class AsyncTicketController(TicketController):
+    """TicketController for the asyncio server, every call is awaitable.
+
+    Validation is inherited, the use case returns coroutines that run
+    under the controller deadline on the event loop.
+    """
+
+    def __init__(
+        self,
+        ref_write_uid,
+        ref_repository,
+        ref_broker,
+        ref_timeout: int = constant.TIME_OUT,
+    ) -> None:
+        _w = ref_write_uid
+        _r = TicketAsyncMongo(ref_repository, TicketDomain.pk)
+        _b = ref_broker
+        self._t = ref_timeout
+        self._uc = AsyncTicketUseCase(_w, _r, _b)
+
+    async def _call(self, func, *args):
+        return await async_timeout_function(func, args, seconds=self._t)
+
+    def stream(self):
+        return async_timeout_iterator(self._uc.stream(), seconds=self._t)
+
+    async def get_by_id(self, ticket_id: str):
+        ticket_id = TicketDomain.set_identifier(ticket_id)
+
+        return await self._call(self._uc.get_by_id, ticket_id)
+
+    async def get_version(self, ticket_id: str) -> str | None:
+        ticket_id = TicketDomain.set_identifier(ticket_id)
+
+        return await self._call(self._uc.get_version, ticket_id)
+
+    async def get_by_id_with_version(self, ticket_id: str) -> tuple:
+        ticket_id = TicketDomain.set_identifier(ticket_id)
+
+        return await self._call(self._uc.get_by_id_with_version, ticket_id)
@@ -0,0 +1,16 @@
+from ..domain.DomainError import DomainError
+from ..domain.model.status_code import INVALID_FORMAT
+
+
+def parse_size(size: str | int = None, name: str = "size") -> int | None:
+    """Page size or number from the query string, None when not given."""
+    if size is None or size == "":
+        return None
+    if isinstance(size, str):
+        # int() would also take "+2", " 2" or "2_0"
+        if not (size.isascii() and size.isdigit()):
+            raise DomainError(INVALID_FORMAT, f"{name} must be a positive integer")
+        size = int(size)
+    if not isinstance(size, int) or size <= 0:
+        raise DomainError(INVALID_FORMAT, f"{name} must be a positive integer")
+    return size
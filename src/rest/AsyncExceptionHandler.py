@@ -0,0 +1,66 @@
+import logging
+from functools import wraps
+from typing import AsyncIterator
+
+from quart import Response
+
+from ..infrastructure.bootstrap import constant
+from ..utils import serializer
+from .ExceptionHandler import _END, error_response
+from .status_code import CODE_NOT_MODIFIED
+
+logger = logging.getLogger(__name__)
+
+
+async def async_stream_envelope(first, items: AsyncIterator, status_code: int):
+    # Same envelope as stream_envelope, rows come from an async cursor
+    yield '{"data":['
+    try:
+        if first is not _END:
+            yield serializer.dumps(first)
+            batch = list()
+            async for item in items:
+                batch.append(serializer.dumps(item))
+                if len(batch) == constant.STREAM_BATCH_SIZE:
+                    yield "," + ",".join(batch)
+                    batch = list()
+            if batch:
+                yield "," + ",".join(batch)
+    except Exception as err:
+        logger.exception("stream interrupted")
+        yield f'],"statusCode":500,"error":{serializer.dumps(str(err))}}}'
+        return
+    yield f'],"statusCode":{status_code}}}'
+
+
+def async_exception_handler(func):
+    """exception_handler for coroutine routes of the asyncio server."""
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        response = ""
+        status_code = 403
+        headers = None
+
+        try:
+            status_code, response, *extra = await func(*args, **kwargs) or "OK"
+            if extra:
+                headers = extra[0]
+            if isinstance(response, AsyncIterator):
+                # Pull the first row here so early failures keep their codes
+                first = await anext(response, _END)
+                return Response(
+                    async_stream_envelope(first, response, status_code),
+                    mimetype="application/json",
+                )
+        except Exception as err:
+            status_code, response = error_response(err, status_code)
+
+        if headers is not None and status_code == CODE_NOT_MODIFIED[0]:
+            return Response("", status=status_code, headers=headers)
+        return Response(
+            serializer.dumps({"data": response, "statusCode": status_code}),
+            headers=headers,
+        )
+
+    return wrapper
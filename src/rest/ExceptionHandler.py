@@ -1,39 +1,92 @@
-import json
+import logging
 import traceback
+from itertools import islice
+from typing import Iterator
+
+from flask import Response, g, has_request_context, stream_with_context
 
 from ..domain.DomainError import DomainError
+from ..infrastructure.bootstrap import constant
 from ..infrastructure.InfrastructureError import InfrastructureError
 from ..presentation.PresentationError import PresentationError
+from ..utils import serializer
+from .status_code import CODE_NOT_MODIFIED
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+def stream_envelope(first, items: Iterator, status_code: int):
+    # Same envelope as exception_handler, written one batch per chunk
+    yield '{"data":['
+    try:
+        if first is not _END:
+            yield serializer.dumps(first)
+            while batch := list(islice(items, constant.STREAM_BATCH_SIZE)):
+                yield "," + ",".join(serializer.dumps(item) for item in batch)
+    except Exception as err:
+        # Headers are already sent, report the failure inside the envelope
+        logger.exception("stream interrupted")
+        yield f'],"statusCode":500,"error":{serializer.dumps(str(err))}}}'
+        return
+    yield f'],"statusCode":{status_code}}}'
+
+
+def error_response(err: Exception, status_code: int = 403) -> tuple:
+    # Status code and body for an error raised by a route, unexpected
+    # errors keep the status code they were raised with
+    if isinstance(err, PresentationError):
+        return 422, str(err)
+    if isinstance(err, DomainError):
+        return 500, str(err)
+    if isinstance(err, InfrastructureError):
+        return 500, str(err)
+    if isinstance(err, TimeoutError):
+        return 600, str(err)
+    error = {
+        "message": str(err),
+        "traceback": traceback.format_exc(),
+    }
+    return status_code, str(error)
 
 
 def exception_handler(func):
     def wrapper(*args, **kwargs):
         response = ""
         status_code = 403
+        stream = None
+        headers = None
 
         try:
-            status_code, response = func(*args, **kwargs) or "OK"
-        except PresentationError as p_err:
-            response = str(p_err)
-            status_code = 422
-        except DomainError as d_err:
-            response = str(d_err)
-            status_code = 500
-        except InfrastructureError as i_err:
-            response = str(i_err)
-            status_code = 500
-        except TimeoutError as t_err:
-            response = str(t_err)
-            status_code = 600
+            # Routes may add a third element, the response headers
+            status_code, response, *extra = func(*args, **kwargs) or "OK"
+            if extra:
+                headers = extra[0]
+            if isinstance(response, Iterator):
+                # Pull the first row here so early failures keep their codes
+                first = next(response, _END)
+                stream = stream_envelope(first, response, status_code)
         except Exception as err:
-            error = {
-                "message": str(err),
-                "traceback": traceback.format_exc(),
-            }
-            response = str(error)
+            status_code, response = error_response(err, status_code)
 
         finally:
-            return json.dumps({"data": response, "statusCode": status_code})
+            if has_request_context():
+                # The envelope code, the HTTP status of most answers is 200
+                g.status_code = status_code
+            if stream is not None:
+                return Response(
+                    stream_with_context(stream), mimetype="application/json"
+                )
+            if headers is not None:
+                if status_code == CODE_NOT_MODIFIED[0]:
+                    # Nothing is serialised, the client keeps its copy
+                    return Response(status=status_code, headers=headers)
+                return Response(
+                    serializer.dumps({"data": response, "statusCode": status_code}),
+                    headers=headers,
+                )
+            return serializer.dumps({"data": response, "statusCode": status_code})
 
     # Renaming the function name:
     wrapper.__name__ = func.__name__
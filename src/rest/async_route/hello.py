@@ -0,0 +1,8 @@
+from quart import Blueprint, jsonify
+
+hello_route = Blueprint("hello_route", __name__)
+
+
+@hello_route.get("/")
+async def say_hello():
+    return jsonify("Hello", 200)
@@ -0,0 +1,89 @@
+from quart import Blueprint, current_app, request
+
+from ..AsyncExceptionHandler import async_exception_handler
+from ..conditional import async_conditional_get
+from ..status_code import CODE_OK, REQUIRED_FIELD, WRITER_NOT_PROVIDED
+
+person_route = Blueprint("person_route", __name__, url_prefix="/person")
+
+
+@person_route.post("/")
+@async_exception_handler
+async def create_person():
+    params = request.args.to_dict()
+
+    if (write_uid := params.get("write_uid")) is None:
+        return WRITER_NOT_PROVIDED
+
+    lc = current_app.config["CONTAINER"].person(write_uid)
+
+    request_data = await request.get_json()
+    await lc.create(
+        request_data["person_id"],
+        request_data["name"],
+        request_data["last_name"],
+        request_data["mail_address"],
+        request_data.get("birthdate"),
+        request_data.get("document_number"),
+        request_data.get("address"),
+    )
+
+    return CODE_OK
+
+
+@person_route.get("/", defaults={"id": None})
+@person_route.get("/<id>")
+@async_exception_handler
+async def fetch_persons(id=None):
+    params = request.args.to_dict()
+
+    if (write_uid := params.get("write_uid")) is None:
+        return WRITER_NOT_PROVIDED
+
+    lc = current_app.config["CONTAINER"].person(write_uid)
+    if id is not None:
+        return await async_conditional_get(lc, id, request.if_none_match)
+    elif params.get("stream") in ("1", "true"):
+        data = lc.stream()
+    elif params.get("page") is not None:
+        # Numbered pages can jump anywhere, each one skips the rows before it
+        data = await lc.fetch(params.get("size"), params.get("page"))
+    else:
+        data = await lc.fetch_page(params.get("size"), params.get("next"))
+
+    return (CODE_OK[0], data)
+
+
+@person_route.put("/<id>")
+@async_exception_handler
+async def update_person(id):
+    params = request.args.to_dict()
+
+    if (write_uid := params.get("write_uid")) is None:
+        return WRITER_NOT_PROVIDED
+    if (person_id := id) is None:
+        return REQUIRED_FIELD
+
+    request_data = await request.get_json()
+    request_data.update({"write_uid": write_uid})
+
+    lc = current_app.config["CONTAINER"].person(write_uid)
+    await lc.update(person_id, request_data)
+
+    return CODE_OK
+
+
+@person_route.delete("/<id>")
+@async_exception_handler
+async def delete_person(id):
+    params = request.args.to_dict()
+
+    if (write_uid := params.get("write_uid")) is None:
+        return WRITER_NOT_PROVIDED
+    if (person_id := id) is None:
+        return REQUIRED_FIELD
+
+    lc = current_app.config["CONTAINER"].person(write_uid)
+    await lc.delete(person_id)
+
+    return CODE_OK
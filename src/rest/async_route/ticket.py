@@ -0,0 +1,87 @@
+from quart import Blueprint, current_app, request
+
+from ..AsyncExceptionHandler import async_exception_handler
+from ..conditional import async_conditional_get
+from ..status_code import REQUIRED_FIELD, WRITER_NOT_PROVIDED
+
+ticket_route = Blueprint("ticket_route", __name__, url_prefix="/ticket")
+
+
+@ticket_route.post("/")
+@async_exception_handler
+async def create_ticket():
+    params = request.args.to_dict()
+
+    if (write_uid := params.get("write_uid")) is None:
+        code, message = WRITER_NOT_PROVIDED
+        return (code, message)
+
+    lc = current_app.config["CONTAINER"].ticket(write_uid)
+    item = await lc.create(
+        params.get("ticket_id"),
+        params.get("channel_id"),
+        params.get("requirement"),
+        params.get("because"),
+    )
+
+    return (200, item)
+
+
+@ticket_route.get("/", defaults={"id": None})
+@ticket_route.get("/<id>")
+@async_exception_handler
+async def fetch_tickets(id=None):
+    params = request.args.to_dict()
+
+    if (write_uid := params.get("write_uid")) is None:
+        code, message = WRITER_NOT_PROVIDED
+        return code, message
+
+    lc = current_app.config["CONTAINER"].ticket(write_uid)
+    if id is not None:
+        return await async_conditional_get(lc, id, request.if_none_match)
+    elif params.get("stream") in ("1", "true"):
+        data = lc.stream()
+    elif params.get("page") is not None:
+        # Numbered pages can jump anywhere, each one skips the rows before it
+        data = await lc.fetch(params.get("size"), params.get("page"))
+    else:
+        data = await lc.fetch_page(params.get("size"), params.get("next"))
+
+    return (200, data)
+
+
+@ticket_route.put("/<id>")
+@async_exception_handler
+async def update_ticket(id):
+    params = request.args.to_dict()
+
+    if (write_uid := params.get("write_uid")) is None:
+        code, message = WRITER_NOT_PROVIDED
+        return (code, message)
+    if (ticket_id := id) is None:
+        code, message = REQUIRED_FIELD
+        return (code, message)
+
+    lc = current_app.config["CONTAINER"].ticket(write_uid)
+    item = await lc.update(ticket_id, params)
+
+    return (200, item)
+
+
+@ticket_route.delete("/<id>")
+@async_exception_handler
+async def delete_ticket(id):
+    params = request.args.to_dict()
+
+    if (write_uid := params.get("write_uid")) is None:
+        code, message = WRITER_NOT_PROVIDED
+        return (code, message)
+    if (ticket_id := id) is None:
+        code, message = REQUIRED_FIELD
+        return (code, message)
+
+    lc = current_app.config["CONTAINER"].ticket(write_uid)
+    item = await lc.delete(ticket_id)
+
+    return (200, item)
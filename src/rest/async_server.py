@@ -0,0 +1,61 @@
+import logging
+
+from prometheus_client import make_asgi_app
+from quart import Quart
+
+from ..infrastructure.bootstrap.bootstrap import Bootstrap
+from ..infrastructure.logger.logger import setup_logging
+from .async_route import hello, person, ticket
+from .container import AsyncContainer
+from .instrumentation import metrics_registry
+
+
+def register_blueprints(app):
+    app.register_blueprint(hello.hello_route)
+    app.register_blueprint(person.person_route)
+    app.register_blueprint(ticket.ticket_route)
+
+
+def mount_metrics(app):
+    # Same /metrics endpoint as the WSGI server
+    metrics_app = make_asgi_app(metrics_registry())
+    quart_app = app.asgi_app
+
+    async def asgi_app(scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/metrics"):
+            return await metrics_app(scope, receive, send)
+        return await quart_app(scope, receive, send)
+
+    app.asgi_app = asgi_app
+
+
+def create_async_server():
+    """Quart application serving the ticket and person routes on asyncio.
+
+    Mongo and RabbitMQ calls are awaited, a single worker keeps thousands
+    of slow requests in flight. CSV import and images are only served by
+    the WSGI server.
+    """
+    app = Quart(__name__)
+
+    my_config = Bootstrap()
+    my_config.get_async_backends()
+    app.config.from_object(my_config)
+    app.config["CONTAINER"] = AsyncContainer(app.config)
+
+    register_blueprints(app)
+
+    if my_config.IS_IN_PRODUCTION:
+        logging.getLogger("rest_app")
+        setup_logging(my_config.LOG_CONFIG)
+        logging.basicConfig(level="INFO")
+
+    @app.after_serving
+    async def close_backends():
+        if (broker := app.config.get("ASYNC_BROKER")) is not None:
+            await broker.close()
+        if (pool := app.config.get("ASYNC_MONGO_POOL")) is not None:
+            await pool.close()
+
+    mount_metrics(app)
+    return app
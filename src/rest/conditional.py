@@ -0,0 +1,68 @@
+import hashlib
+
+from flask import request
+from werkzeug.http import quote_etag
+
+from ..utils import serializer
+from .status_code import CODE_NOT_MODIFIED
+
+
+def _digest(value: str) -> str:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def version_tag(version: str | None) -> str | None:
+    if version is None:
+        return None
+    return _digest(str(version))
+
+
+def content_tag(item) -> str:
+    # For entities written before write_version existed
+    return _digest(serializer.dumps(item, sort_keys=True))
+
+
+def not_modified(tag: str) -> tuple:
+    # Weak: the version names the stored entity, not these exact bytes
+    code, _ = CODE_NOT_MODIFIED
+    return (code, None, {"ETag": quote_etag(tag, weak=True)})
+
+
+def conditional_get(lc, identifier: str) -> tuple:
+    """GET one entity, honouring If-None-Match.
+
+    The version is read first, through a projection on write_version only,
+    and a matching tag is answered with 304 before the document is read
+    or serialised.
+    """
+    if_none_match = request.if_none_match
+    if if_none_match:
+        tag = version_tag(lc.get_version(identifier))
+        if tag is not None and if_none_match.contains_weak(tag):
+            return not_modified(tag)
+
+    item, version = lc.get_by_id_with_version(identifier)
+    if item is None:
+        return (200, item)
+
+    tag = version_tag(version) or content_tag(item)
+    if if_none_match.contains_weak(tag):
+        return not_modified(tag)
+    return (200, item, {"ETag": quote_etag(tag, weak=True)})
+
+
+async def async_conditional_get(lc, identifier: str, if_none_match) -> tuple:
+    # conditional_get for the asyncio server, the headers come from quart
+    if if_none_match:
+        tag = version_tag(await lc.get_version(identifier))
+        if tag is not None and if_none_match.contains_weak(tag):
+            return not_modified(tag)
+
+    item, version = await lc.get_by_id_with_version(identifier)
+    if item is None:
+        return (200, item)
+
+    tag = version_tag(version) or content_tag(item)
+    if if_none_match.contains_weak(tag):
+        return not_modified(tag)
+    return (200, item, {"ETag": quote_etag(tag, weak=True)})
@@ -0,0 +1,128 @@
+import threading
+
+from ..infrastructure.broker.outbox import BrokerOutbox
+from ..infrastructure.services.User import UserService
+from ..presentation.controller.image import ImageController
+from ..presentation.controller.person import AsyncPersonController, PersonController
+from ..presentation.controller.ticket import AsyncTicketController, TicketController
+from .instrumentation import TimedProxy
+
+
+class Container:
+    """Per worker dependencies of the REST layer.
+
+    Controllers, with their repositories and use cases, are built on first
+    use and shared by every request. A request only binds its write_uid
+    on a shallow copy.
+    """
+
+    def __init__(self, ref_config) -> None:
+        self._c = ref_config
+        self._controllers = dict()
+        self._lock = threading.Lock()
+        self._outbox = self._timed_outbox(ref_config.get("BROKER_OUTBOX"))
+
+    def _get(self, name: str, factory):
+        controller = self._controllers.get(name)
+        if controller is None:
+            with self._lock:
+                controller = self._controllers.get(name)
+                if controller is None:
+                    controller = factory()
+                    self._controllers[name] = controller
+        return controller
+
+    @staticmethod
+    def _writer(write_uid: str):
+        return UserService.set_identifier(write_uid)
+
+    def _timed(self, target, layer: str):
+        if target is None or not self._c.get("METRICS_LAYERS"):
+            return target
+        return TimedProxy(target, layer)
+
+    def _timed_outbox(self, outbox):
+        # A request only enqueues on the outbox, the broker round trip is
+        # the flusher's publish_batch and is timed there
+        if isinstance(outbox, BrokerOutbox) and not isinstance(
+            outbox.broker, TimedProxy
+        ):
+            outbox.broker = self._timed(outbox.broker, "broker")
+        return self._timed(outbox, "outbox")
+
+    def _spans(self, controller):
+        # Repository and broker are timed where they are passed in, the
+        # use case is built by the controller itself
+        controller._uc = self._timed(controller._uc, "use_case")
+        return controller
+
+    def _bind(self, controller, write_uid: str):
+        return self._timed(controller.bind(self._writer(write_uid)), "controller")
+
+    def ticket(self, write_uid: str) -> TicketController:
+        controller = self._get(
+            "ticket",
+            lambda: self._spans(
+                TicketController(
+                    None,
+                    self._timed(self._c["REPOSITORY_MONGO"], "repository"),
+                    self._outbox,
+                    ref_cache=self._c.get("CACHE"),
+                )
+            ),
+        )
+        return self._bind(controller, write_uid)
+
+    def person(self, write_uid: str) -> PersonController:
+        controller = self._get(
+            "person",
+            lambda: self._spans(
+                PersonController(
+                    None,
+                    self._timed(self._c["REPOSITORY_MONGO"], "repository"),
+                    self._outbox,
+                    ref_cache=self._c.get("CACHE"),
+                )
+            ),
+        )
+        return self._bind(controller, write_uid)
+
+    def image(self, write_uid: str) -> ImageController:
+        controller = self._get(
+            "image",
+            lambda: self._spans(
+                ImageController(
+                    None,
+                    self._c["IMAGE_PATH"],
+                    self._timed(self._c["REPOSITORY_MONGO"], "repository"),
+                    self._outbox,
+                )
+            ),
+        )
+        return self._bind(controller, write_uid)
+
+
+class AsyncContainer(Container):
+    """Container of the asyncio server, controllers await their backends."""
+
+    def ticket(self, write_uid: str) -> AsyncTicketController:
+        controller = self._get(
+            "ticket",
+            lambda: AsyncTicketController(
+                None,
+                self._c["ASYNC_REPOSITORY_MONGO"],
+                self._c.get("ASYNC_BROKER"),
+            ),
+        )
+        return controller.bind(self._writer(write_uid))
+
+    def person(self, write_uid: str) -> AsyncPersonController:
+        controller = self._get(
+            "person",
+            lambda: AsyncPersonController(
+                None,
+                self._c["ASYNC_REPOSITORY_MONGO"],
+                self._c.get("ASYNC_BROKER"),
+            ),
+        )
+        return controller.bind(self._writer(write_uid))
@@ -0,0 +1,143 @@
+import functools
+import os
+import time
+
+from flask import g, request
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from the start of the request to the response, per route",
+    ["blueprint", "route", "method"],
+)
+REQUEST_TOTAL = Counter(
+    "http_requests",
+    "Responses per route and status code",
+    ["blueprint", "route", "method", "status"],
+)
+LAYER_LATENCY = Histogram(
+    "layer_duration_seconds",
+    "Time spent in a controller, use case, repository, outbox or broker call",
+    ["layer", "target", "method"],
+    buckets=(
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+    ),
+)
+
+# Methods returning a derived copy of their target, proxied in turn
+_DERIVED = frozenset(("bind", "for_table"))
+
+
+@functools.lru_cache(maxsize=None)
+def _observer(layer: str, target: str, method: str):
+    # Controllers are proxied per request, labels are resolved only once
+    return LAYER_LATENCY.labels(layer, target, method).observe
+
+
+class TimedProxy:
+    """Times every method call of `target` into layer_duration_seconds.
+
+    Wrappers are built on first use of each method and kept on the
+    proxy. Attributes that are not callable pass through untouched.
+    Generators and iterators are only timed until they are returned.
+    """
+
+    def __init__(self, target, layer: str) -> None:
+        self._target = target
+        self._layer = layer
+        self._name = getattr(target, "tablename", None) or type(target).__name__
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        if name in _DERIVED:
+
+            def derived(*args, **kwargs):
+                return TimedProxy(attr(*args, **kwargs), self._layer)
+
+            self.__dict__[name] = derived
+            return derived
+
+        observe = _observer(self._layer, self._name, name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - start)
+
+        self.__dict__[name] = timed
+        return timed
+
+
+@functools.lru_cache(maxsize=None)
+def _request_observer(blueprint: str, rule: str, method: str):
+    return REQUEST_LATENCY.labels(blueprint, rule, method).observe
+
+
+@functools.lru_cache(maxsize=None)
+def _request_counter(blueprint: str, rule: str, method: str, status: str):
+    return REQUEST_TOTAL.labels(blueprint, rule, method, status).inc
+
+
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+
+def _record_request(response):
+    start = g.pop("request_start", None)
+    if start is None:
+        return response
+    # The rule template, not the path, keeps the label set bounded
+    rule = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    labels = (request.blueprint or "", rule, request.method)
+    status = g.pop("status_code", response.status_code)
+    _request_observer(*labels)(time.perf_counter() - start)
+    _request_counter(*labels, str(status))()
+    return response
+
+
+def metrics_registry():
+    """Registry served on /metrics.
+
+    With PROMETHEUS_MULTIPROC_DIR set, set before any worker starts, each
+    worker writes its samples to mmap files in that directory and the
+    registry adds them up, whichever worker answers the scrape.
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def instrument(app):
+    """Record latency and status of every request of `app`.
+
+    Streamed bodies are timed until the first chunk, the rest is written
+    after the response leaves the view.
+    """
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
@@ -1,8 +1,8 @@
-from flask import Blueprint, send_from_directory
+from flask import Blueprint, current_app, send_from_directory
 
 download_file_route = Blueprint("file_route", __name__)
 
 
 @download_file_route.get("/uploads/<name>")
 def download_file(name):
-    return send_from_directory(download_file_route.config["IMAGE_PATH"], name)
+    return send_from_directory(current_app.config["IMAGE_PATH"], name)
@@ -1,6 +1,5 @@
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 
-from ...presentation.controller.image import ImageController
 from ..ExceptionHandler import exception_handler
 from ..status_code import REQUIRED_FIELD, WRITER_NOT_PROVIDED
 
@@ -16,12 +15,7 @@ def create_image():
         code, message = WRITER_NOT_PROVIDED
         return (code, message)
 
-    lc = ImageController(
-        write_uid,
-        image_route.config["IMAGE_PATH"],
-        image_route.config["REPOSITORY_MONGO"],
-        image_route.config["BROKER_RABBITMQ"],
-    )
+    lc = current_app.config["CONTAINER"].image(write_uid)
     item = lc.create(
         params.get("image_id"),
     )
@@ -39,13 +33,13 @@ def fetch_images(id=None):
         code, message = WRITER_NOT_PROVIDED
         return code, message
 
-    lc = ImageController(
-        write_uid,
-        image_route.config["IMAGE_PATH"],
-        image_route.config["REPOSITORY_MONGO"],
-        image_route.config["BROKER_RABBITMQ"],
-    )
-    data = lc.get_by_id(id) if id is not None else lc.fetch()
+    lc = current_app.config["CONTAINER"].image(write_uid)
+    if id is not None:
+        data = lc.get_by_id(id)
+    elif params.get("stream") in ("1", "true"):
+        data = lc.stream()
+    else:
+        data = lc.fetch_page(params.get("size"), params.get("next"))
 
     return (200, data)
 
@@ -62,12 +56,7 @@ def update_image(id):
         code, message = REQUIRED_FIELD
         return (code, message)
 
-    lc = ImageController(
-        write_uid,
-        image_route.config["IMAGE_PATH"],
-        image_route.config["REPOSITORY_MONGO"],
-        image_route.config["BROKER_RABBITMQ"],
-    )
+    lc = current_app.config["CONTAINER"].image(write_uid)
     item = lc.update(image_id, params)
 
     return (200, item)
@@ -85,12 +74,7 @@ def delete_image(id):
         code, message = REQUIRED_FIELD
         return (code, message)
 
-    lc = ImageController(
-        write_uid,
-        image_route.config["IMAGE_PATH"],
-        image_route.config["REPOSITORY_MONGO"],
-        image_route.config["BROKER_RABBITMQ"],
-    )
+    lc = current_app.config["CONTAINER"].image(write_uid)
     item = lc.delete(image_id)
 
     return (200, item)
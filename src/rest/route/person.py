@@ -1,7 +1,6 @@
-import pandas as pd
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 
-from ...presentation.controller.person import PersonController
+from ..conditional import conditional_get
 from ..ExceptionHandler import exception_handler
 from ..status_code import (
     CODE_OK,
@@ -21,11 +20,7 @@ def create_person():
     if (write_uid := params.get("write_uid")) is None:
         return WRITER_NOT_PROVIDED
 
-    lc = PersonController(
-        write_uid,
-        person_route.config,
-        constant.TIME_OUT
-    )
+    lc = current_app.config["CONTAINER"].person(write_uid)
 
     request_data = request.get_json()
     lc.create(
@@ -49,11 +44,7 @@ def create_persons_from_csv():
     if (write_uid := params.get("write_uid")) is None:
         return WRITER_NOT_PROVIDED
 
-    lc = PersonController(
-        write_uid,
-        person_route.config["MONGO_SERVER"],
-        person_route.config["RABBITMQ_SERVER"],
-    )
+    lc = current_app.config["CONTAINER"].person(write_uid)
 
     if "file" not in request.files:
         return FILE_NOT_PROVIDED
@@ -62,11 +53,9 @@ def create_persons_from_csv():
     if file.filename == "":
         return FILE_NOT_PROVIDED
 
-    df = pd.read_csv(file, delimiter=",")
+    report = lc.import_csv(file.stream, params.get("batch_size"))
 
-    lc.insert_many(df.to_dict())
-
-    return CODE_OK
+    return (CODE_OK[0], report)
 
 
 @person_route.get("/", defaults={"id": None})
@@ -78,12 +67,16 @@ def fetch_persons(id=None):
     if (write_uid := params.get("write_uid")) is None:
         return WRITER_NOT_PROVIDED
 
-    lc = PersonController(
-        write_uid,
-        person_route.config["MONGO_SERVER"],
-        person_route.config["RABBITMQ_SERVER"],
-    )
-    data = lc.get_by_id(id) if id is not None else lc.fetch()
+    lc = current_app.config["CONTAINER"].person(write_uid)
+    if id is not None:
+        return conditional_get(lc, id)
+    elif params.get("stream") in ("1", "true"):
+        data = lc.stream()
+    elif params.get("page") is not None:
+        # Numbered pages can jump anywhere, each one skips the rows before it
+        data = lc.fetch(params.get("size"), params.get("page"))
+    else:
+        data = lc.fetch_page(params.get("size"), params.get("next"))
 
     return (CODE_OK[0], data)
 
@@ -101,11 +94,7 @@ def update_person(id):
     request_data = request.get_json()
     request_data.update(params["write_uid"])
 
-    lc = PersonController(
-        write_uid,
-        person_route.config["MONGO_SERVER"],
-        person_route.config["RABBITMQ_SERVER"],
-    )
+    lc = current_app.config["CONTAINER"].person(write_uid)
     lc.update(person_id, request_data)
 
     return CODE_OK
@@ -121,11 +110,7 @@ def delete_person(id):
     if (person_id := id) is None:
         return REQUIRED_FIELD
 
-    lc = PersonController(
-        write_uid,
-        person_route.config["MONGO_SERVER"],
-        person_route.config["RABBITMQ_SERVER"],
-    )
+    lc = current_app.config["CONTAINER"].person(write_uid)
     lc.delete(person_id)
 
     return CODE_OK
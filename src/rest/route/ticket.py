@@ -1,6 +1,6 @@
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 
-from ...presentation.controller.ticket import TicketController
+from ..conditional import conditional_get
 from ..ExceptionHandler import exception_handler
 from ..status_code import REQUIRED_FIELD, WRITER_NOT_PROVIDED
 
@@ -16,11 +16,7 @@ def create_ticket():
         code, message = WRITER_NOT_PROVIDED
         return (code, message)
 
-    lc = TicketController(
-        write_uid,
-        ticket_route.config["REPOSITORY_MONGO"],
-        ticket_route.config["BROKER_RABBITMQ"],
-    )
+    lc = current_app.config["CONTAINER"].ticket(write_uid)
     item = lc.create(
         params.get("ticket_id"),
         params.get("channel_id"),
@@ -41,12 +37,16 @@ def fetch_tickets(id=None):
         code, message = WRITER_NOT_PROVIDED
         return code, message
 
-    lc = TicketController(
-        write_uid,
-        ticket_route.config["MONGO_SERVER"],
-        ticket_route.config["RABBITMQ_SERVER"],
-    )
-    data = lc.get_by_id(id) if id is not None else lc.fetch()
+    lc = current_app.config["CONTAINER"].ticket(write_uid)
+    if id is not None:
+        return conditional_get(lc, id)
+    elif params.get("stream") in ("1", "true"):
+        data = lc.stream()
+    elif params.get("page") is not None:
+        # Numbered pages can jump anywhere, each one skips the rows before it
+        data = lc.fetch(params.get("size"), params.get("page"))
+    else:
+        data = lc.fetch_page(params.get("size"), params.get("next"))
 
     return (200, data)
 
@@ -63,11 +63,7 @@ def update_ticket(id):
         code, message = REQUIRED_FIELD
         return (code, message)
 
-    lc = TicketController(
-        write_uid,
-        ticket_route.config["MONGO_SERVER"],
-        ticket_route.config["RABBITMQ_SERVER"],
-    )
+    lc = current_app.config["CONTAINER"].ticket(write_uid)
     item = lc.update(ticket_id, params)
 
     return (200, item)
@@ -85,11 +81,7 @@ def delete_ticket(id):
         code, message = REQUIRED_FIELD
         return (code, message)
 
-    lc = TicketController(
-        write_uid,
-        ticket_route.config["MONGO_SERVER"],
-        ticket_route.config["RABBITMQ_SERVER"],
-    )
+    lc = current_app.config["CONTAINER"].ticket(write_uid)
     item = lc.delete(ticket_id)
 
     return (200, item)
@@ -6,6 +6,8 @@ from werkzeug.middleware.dispatcher import DispatcherMiddleware
 
 from ..infrastructure.bootstrap.bootstrap import Bootstrap
 from ..infrastructure.logger.logger import setup_logging
+from .container import Container
+from .instrumentation import instrument, metrics_registry
 from .route import download_file, hello, image, person, ticket
 
 
@@ -22,10 +24,14 @@ def create_server():
 
     my_config = Bootstrap()
     app.config.from_object(my_config)
+    # Built per worker, controllers are created lazily on first request
+    app.config["CONTAINER"] = Container(app.config)
     print("---CONFIG")
     print(vars(my_config))
 
     register_blueprints(app)
+    if my_config.METRICS_REQUESTS:
+        instrument(app)
 
     if my_config.IS_IN_PRODUCTION:
         logging.getLogger("rest_app")
@@ -33,5 +39,7 @@ def create_server():
         logging.basicConfig(level="INFO")
 
     # Add prometheus wsgi middleware to route /metrics requests
-    app.wsgi_app = DispatcherMiddleware(app.wsgi_app, {"/metrics": make_wsgi_app()})
+    app.wsgi_app = DispatcherMiddleware(
+        app.wsgi_app, {"/metrics": make_wsgi_app(metrics_registry())}
+    )
     return app
@@ -4,6 +4,7 @@ WRITER_NOT_PROVIDED = (417, "Writer is not present in the requests")
 FILE_NOT_PROVIDED = (417, "File not provided")
 CODE_CREATED = (201, "Code created")
 CODE_OK = (200, "Code created")
+CODE_NOT_MODIFIED = (304, "Not modified")
 
 # # CODE STATUS
 # CODE_CONTINUE = 100
@@ -0,0 +1,70 @@
+"""JSON for responses, broker messages and logs.
+
+orjson when it is installed, the standard library otherwise. Both write
+the same compact document: ObjectId as its hex string, dates in ISO
+format, namedtuples such as Ticket or Person as objects.
+"""
+import datetime as dt
+import json
+from enum import Enum
+
+from bson import ObjectId
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, tuple) and hasattr(obj, "_asdict"):
+        return obj._asdict()
+    if isinstance(obj, (dt.datetime, dt.date, dt.time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+def _plain(obj):
+    # The C encoder writes every tuple as an array before default is asked
+    if isinstance(obj, dict):
+        return {key: _plain(value) for key, value in obj.items()}
+    if isinstance(obj, tuple) and hasattr(obj, "_asdict"):
+        return {key: _plain(value) for key, value in obj._asdict().items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain(value) for value in obj]
+    return obj
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumpb(obj, sort_keys: bool = False) -> bytes:
+        option = _OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _OPTIONS
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def dumps(obj, sort_keys: bool = False) -> str:
+        return dumpb(obj, sort_keys).decode("utf-8")
+
+else:
+    _encoder = json.JSONEncoder(
+        ensure_ascii=False, separators=(",", ":"), default=_default
+    )
+    _sorted_encoder = json.JSONEncoder(
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=_default,
+        sort_keys=True,
+    )
+
+    def dumps(obj, sort_keys: bool = False) -> str:
+        encoder = _sorted_encoder if sort_keys else _encoder
+        return encoder.encode(_plain(obj))
+
+    def dumpb(obj, sort_keys: bool = False) -> bytes:
+        return dumps(obj, sort_keys).encode("utf-8")
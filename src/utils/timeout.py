@@ -1,32 +1,213 @@
 # -*- coding: utf-8 -*-
+import asyncio
+import builtins
+import os
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar
 
+from prometheus_client import Counter, Gauge
 
-class TimeoutError(Exception):
+from ..infrastructure.bootstrap import constant
+
+TIMEOUTS = Counter(
+    "deadline_timeouts",
+    "Calls abandoned because their deadline passed",
+    ["function"],
+)
+EXECUTOR_REJECTED = Counter(
+    "deadline_executor_rejected",
+    "Calls refused because the deadline executor was saturated",
+    ["function"],
+)
+EXECUTOR_PENDING = Gauge(
+    "deadline_executor_pending",
+    "Calls queued or running in the deadline executor",
+    multiprocess_mode="livesum",
+)
+
+
+class TimeoutError(builtins.TimeoutError):
     pass
 
 
-def timeout_function(func, args=(), kwargs={}, seconds=600):
-    class InterruptableThread(threading.Thread):
-        def __init__(self):
-            threading.Thread.__init__(self)
-            self.result = None
-            self.exc = None
+class Deadline:
+    def __init__(self, seconds: float) -> None:
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+
+_deadline: ContextVar[Deadline | None] = ContextVar("deadline", default=None)
+
+
+def remaining() -> float | None:
+    """Seconds left for the current call, None when it has no deadline."""
+    current = _deadline.get()
+    return None if current is None else current.remaining()
+
+
+@contextmanager
+def deadline(ref_deadline: Deadline):
+    # A nested deadline can only shorten the one already running
+    current = _deadline.get()
+    if current is not None and current.expires_at < ref_deadline.expires_at:
+        ref_deadline = current
+    token = _deadline.set(ref_deadline)
+    try:
+        yield ref_deadline
+    finally:
+        _deadline.reset(token)
+
+
+class DeadlineExecutor:
+    """Thread pool shared by every call that runs under a deadline.
+
+    At most max_workers calls run and max_pending wait, past that the
+    caller waits for a slot until its own deadline. A call that times out
+    is not killed, the deadline it carries makes the database give up.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = constant.DEADLINE_WORKERS,
+        max_pending: int = constant.DEADLINE_MAX_PENDING,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        # Pool threads do not survive a fork, the child starts its own
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self.max_workers, thread_name_prefix="deadline"
+                    )
+        return self._executor
+
+    def _run(self, ref_deadline: Deadline, func, args, kwargs):
+        try:
+            if ref_deadline.expired:
+                raise TimeoutError("Deadline passed before the call started")
+            with deadline(ref_deadline):
+                return func(*args, **kwargs)
+        finally:
+            self._slots.release()
+            EXECUTOR_PENDING.dec()
+
+    def call(self, func, args=(), kwargs=None, seconds: float = constant.TIME_OUT):
+        name = getattr(func, "__qualname__", repr(func))
+        current = Deadline(seconds)
+
+        if not self._slots.acquire(timeout=current.remaining()):
+            EXECUTOR_REJECTED.labels(name).inc()
+            raise TimeoutError("No worker available before the deadline")
+        EXECUTOR_PENDING.inc()
+        try:
+            future = self.executor.submit(
+                self._run, current, func, args, kwargs or {}
+            )
+        except BaseException:
+            self._slots.release()
+            EXECUTOR_PENDING.dec()
+            raise
+
+        try:
+            return future.result(timeout=current.remaining())
+        except TimeoutError:
+            # Raised inside the call, the database gave up first
+            TIMEOUTS.labels(name).inc()
+            raise
+        except FutureTimeoutError:
+            if future.cancel():
+                # Never started, _run will not give the slot back
+                self._slots.release()
+                EXECUTOR_PENDING.dec()
+            TIMEOUTS.labels(name).inc()
+            raise TimeoutError("Function execution timed out")
+
+
+_executor = DeadlineExecutor()
+
+
+def timeout_function(func, args=(), kwargs=None, seconds=constant.TIME_OUT):
+    return _executor.call(func, args, kwargs, seconds)
+
+
+def timeout_iterator(iterator, seconds=constant.TIME_OUT):
+    """Iterate under one deadline, started by the first row.
+
+    Each next() runs with what is left of it, past it the iteration raises
+    TimeoutError. Rows are handed over outside the deadline.
+    """
+    name = getattr(iterator, "__qualname__", repr(iterator))
+    current = Deadline(seconds)
+    try:
+        while True:
+            if current.expired:
+                TIMEOUTS.labels(name).inc()
+                raise TimeoutError("Stream execution timed out")
+            with deadline(current):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+    finally:
+        if (close := getattr(iterator, "close", None)) is not None:
+            close()
 
-        def run(self):
-            try:
-                self.result = func(*args, **kwargs)
-            except Exception as e:
-                self.exc = e
 
-    thread = InterruptableThread()
-    thread.daemon = True
-    thread.start()
-    thread.join(seconds)
+async def async_timeout_iterator(iterator, seconds=constant.TIME_OUT):
+    # timeout_iterator for async cursors
+    name = getattr(iterator, "__qualname__", repr(iterator))
+    current = Deadline(seconds)
+    try:
+        while True:
+            if current.expired:
+                TIMEOUTS.labels(name).inc()
+                raise TimeoutError("Stream execution timed out")
+            with deadline(current):
+                try:
+                    item = await anext(iterator)
+                except StopAsyncIteration:
+                    return
+            yield item
+    finally:
+        if (aclose := getattr(iterator, "aclose", None)) is not None:
+            await aclose()
 
-    if thread.is_alive():
-        raise TimeoutError("Function execution timed out")
-    if thread.exc:
-        raise thread.exc
 
-    return thread.result
+async def async_timeout_function(
+    func, args=(), kwargs=None, seconds=constant.TIME_OUT
+):
+    # Coroutines need no thread, the event loop cancels them at the deadline
+    name = getattr(func, "__qualname__", repr(func))
+    with deadline(Deadline(seconds)) as current:
+        try:
+            return await asyncio.wait_for(
+                func(*args, **(kwargs or {})), current.remaining()
+            )
+        except TimeoutError:
+            TIMEOUTS.labels(name).inc()
+            raise
+        except asyncio.TimeoutError:
+            TIMEOUTS.labels(name).inc()
+            raise TimeoutError("Function execution timed out")
@@ -0,0 +1,163 @@
+import asyncio
+import tempfile
+import unittest
+
+from src.application.ApplicationError import ApplicationError
+from src.application.use_case.ticket import AsyncTicketUseCase
+from src.domain.enum.ticket_event import TicketEvent
+from src.domain.model.ticket import TicketDomain
+from src.infrastructure.broker.aio_rabbitmq import AsyncRabbitmqClient
+from src.infrastructure.broker.mock_broker import FakeAioConnection
+from src.infrastructure.broker.rabbitmq_pool import RabbitmqServer
+from src.infrastructure.InfrastructureError import InfrastructureError
+from src.infrastructure.mongo.mock_repository import AsyncMockRepositoryClient
+from src.infrastructure.mongo.repositories.ticket_mongo import TicketAsyncMongo
+from src.infrastructure.services.User import UserService
+from src.presentation.controller.ticket import AsyncTicketController
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.events = list()
+
+    async def publish(self, topic, message):
+        self.events.append(topic)
+
+
+class SlowRepository(AsyncMockRepositoryClient):
+    async def get_by_id(self, identifier, attrs):
+        await asyncio.sleep(5)
+
+    async def update(self, identifier, kwargs) -> int:
+        await asyncio.sleep(5)
+        return 1
+
+
+class TestAsyncTicketUseCase(unittest.TestCase):
+    def setUp(self):
+        self.obj = TicketDomain.get_valid_ticket()
+        self.obj_id = TicketDomain.set_identifier(self.obj.ticket_id)
+        repository = AsyncMockRepositoryClient(
+            {"_id": self.obj.ticket_id, "write_version": "5b1a0c9e2f3d4e61"}
+        )
+        self.broker = RecordingBroker()
+        self.use_case = AsyncTicketUseCase(
+            UserService.get_default_identifier(),
+            TicketAsyncMongo(repository, TicketDomain.pk),
+            self.broker,
+        )
+
+    def test_application_ticket(self):
+        async def scenario():
+            assert await self.use_case.create(self.obj) is None
+            assert await self.use_case.update(self.obj) is None
+            assert isinstance(await self.use_case.fetch_page(10), dict)
+            assert await self.use_case.get_version(self.obj_id) is not None
+            assert await self.use_case.delete(self.obj_id) is None
+
+        asyncio.run(scenario())
+        assert self.broker.events == [
+            TicketEvent.CREATED,
+            TicketEvent.UPDATED,
+            TicketEvent.DELETED,
+        ]
+
+    def test_stream_is_async(self):
+        async def scenario():
+            return [item async for item in self.use_case.stream()]
+
+        assert len(asyncio.run(scenario())) == 1
+
+    def test_version_leaves_the_item(self):
+        item, version = asyncio.run(self.use_case.get_by_id_with_version(self.obj_id))
+
+        assert version == "5b1a0c9e2f3d4e61"
+        assert "write_version" not in item
+
+    def test_missing_entity(self):
+        async def zero(identifier):
+            return 0
+
+        self.use_case._r._m.delete = zero
+        with self.assertRaises(ApplicationError):
+            asyncio.run(self.use_case.delete(self.obj_id))
+
+
+class TestAsyncTicketController(unittest.TestCase):
+    def test_validates_before_awaiting(self):
+        controller = AsyncTicketController(
+            None, AsyncMockRepositoryClient({}), RecordingBroker()
+        ).bind(UserService.get_default_identifier())
+
+        with self.assertRaises(Exception):
+            asyncio.run(controller.delete("not an identifier"))
+
+    def test_deadline_cancels_the_call(self):
+        controller = AsyncTicketController(
+            None, SlowRepository({}), RecordingBroker(), ref_timeout=0.05
+        )
+        ticket_id = TicketDomain.get_default_identifier().value
+
+        with self.assertRaises(TimeoutError):
+            asyncio.run(controller.get_by_id(ticket_id))
+
+    def test_deadline_bounds_writes(self):
+        controller = AsyncTicketController(
+            None, SlowRepository({}), RecordingBroker(), ref_timeout=0.05
+        ).bind(UserService.get_default_identifier())
+        ticket_id = TicketDomain.get_default_identifier().value
+
+        with self.assertRaises(TimeoutError):
+            asyncio.run(controller.update(ticket_id, {"requirement": "second"}))
+
+
+class TestAsyncRabbitmqClient(unittest.TestCase):
+    def get_client(self, path, connection):
+        server = RabbitmqServer(
+            hostname="fake",
+            port=5672,
+            username="guest",
+            password="guest",
+            lost_message_path=path,
+        )
+
+        async def factory(server):
+            return connection
+
+        client = AsyncRabbitmqClient(
+            server, factory, lambda topic, message: (topic, message)
+        )
+        client.set_queue("test")
+        return client
+
+    def test_publishes_on_one_channel(self):
+        connection = FakeAioConnection()
+        with tempfile.TemporaryDirectory() as path:
+            client = self.get_client(path, connection)
+
+            async def scenario():
+                await client.publish(TicketEvent.CREATED, "one")
+                await client.publish_batch([(TicketEvent.UPDATED, "two")])
+                await client.close()
+
+            asyncio.run(scenario())
+
+        assert connection.channels == 1
+        assert connection.closed
+        assert connection.default_exchange.messages == [
+            ("test", ("CREATED", "one")),
+            ("test", ("UPDATED", "two")),
+        ]
+
+    def test_spools_rejected_messages(self):
+        connection = FakeAioConnection()
+        connection.default_exchange.fail = True
+        with tempfile.TemporaryDirectory() as path:
+            client = self.get_client(path, connection)
+            with self.assertRaises(InfrastructureError):
+                asyncio.run(client.publish(TicketEvent.DELETED, "lost"))
+
+            spooled = list()
+            client.spool.replay(spooled.append)
+
+        assert [record["data"] for record in spooled] == ["lost"]
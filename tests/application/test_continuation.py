@@ -0,0 +1,44 @@
+import unittest
+
+import pytest
+
+from src.application.ApplicationError import ApplicationError
+from src.application.continuation import ContinuationToken
+from src.infrastructure.bootstrap import constant
+from src.infrastructure.mongo.criteria_compiler import CriteriaCompiler
+
+
+class TestContinuationToken(unittest.TestCase):
+    fields = ["ticket_id", "requirement"]
+
+    def test_round_trip(self):
+        token = ContinuationToken.encode("472016814735868161")
+        assert "=" not in token
+        assert ContinuationToken.decode(token) == "472016814735868161"
+
+    def test_invalid_token(self):
+        with pytest.raises(ApplicationError):
+            ContinuationToken.decode("not-a-token")
+
+    def test_page_size_is_bounded(self):
+        assert ContinuationToken.page_size(None) == constant.PAGE_SIZE
+        assert ContinuationToken.page_size(10**6) == constant.MAX_PAGE_SIZE
+
+    def test_keyset_query(self):
+        token = ContinuationToken.encode("100")
+        matching = ContinuationToken.matching(self.fields, "ticket_id", 2, token)
+        query = CriteriaCompiler.compile(matching, {"ticket_id": "_id"})
+        assert query.filter == {"_id": {"$gt": "100"}}
+        assert query.sort == [("_id", 1)]
+        assert query.limit == 3 and query.skip == 0
+
+    def test_page(self):
+        dataset = [{"ticket_id": str(i)} for i in range(3)]
+        page = ContinuationToken.page(dataset, "ticket_id", 2)
+        assert len(page["items"]) == 2
+        assert ContinuationToken.decode(page["next"]) == "1"
+        assert ContinuationToken.page(dataset, "ticket_id", 3)["next"] is None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import pandas as pd
+
+from src.application.use_case.person import PersonUseCase
+from src.domain.model.person import PersonDomain
+from src.infrastructure.broker.mock_broker import MockBrokerClient
+from src.infrastructure.mongo.mock_repository import MockRepositoryClient
+from src.infrastructure.services.User import UserService
+
+
+class TestPersonImport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        u = UserService.get_default_identifier()
+        r = MockRepositoryClient({})
+        b = MockBrokerClient()
+        cls.use_case = PersonUseCase(u, r, b)
+        person = PersonDomain.as_dict(PersonDomain.get_valid_person())
+        cls.person = {k: v for k, v in person.items() if k != "attrs"}
+        cls.person.update(person["attrs"])
+
+    def test_import_reports_bad_rows(self):
+        frame = pd.DataFrame(
+            [
+                dict(self.person),
+                {"name": "Without id", "last_name": "Row", "contact_type": 0},
+                dict(self.person, person_id="short"),
+            ]
+        )
+        report = self.use_case.import_frames(iter([frame]), batch_size=1)
+        assert report["inserted"] == 1
+        assert report["failed"] == 2
+        assert [error["row"] for error in report["errors"]] == [1, 2]
+
+
+class TestPersonValidateMany(unittest.TestCase):
+    def test_matches_is_valid(self):
+        valid = PersonDomain.as_dict(PersonDomain.get_valid_person())
+        invalid = PersonDomain.as_dict(PersonDomain.get_invalid_person())
+        invalid["attrs"] = {}
+        rows = [
+            valid,
+            invalid,
+            dict(valid, birthdate="2020-13-01"),
+            dict(valid, name=None),
+        ]
+
+        mask, messages = PersonDomain.validate_many(pd.DataFrame(rows))
+        for row, data in enumerate(rows):
+            try:
+                PersonDomain.is_valid(**data)
+                expected = ""
+            except Exception as err:
+                expected = str(err)
+            assert bool(mask.iat[row]) == (expected == "")
+            assert messages.iat[row] == expected
+
+
+if __name__ == "__main__":
+    unittest.main()
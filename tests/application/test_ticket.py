@@ -17,7 +17,7 @@ class TestTicketUseCase(unittest.TestCase):
         my_config = Bootstrap()
         u = UserService.get_default_identifier()
         r = TicketMongo(my_config.REPOSITORY_MONGO, TicketDomain.pk)
-        b = RabbitmqClient(my_config.BROKER_RABBITMQ)
+        b = RabbitmqClient(my_config.RABBITMQ_POOL)
         cls.use_case = TicketUseCase(u, r, b)
         cls.obj = TicketDomain.get_valid_ticket()
         cls.obj_id = TicketDomain.set_identifier(cls.obj.ticket_id)
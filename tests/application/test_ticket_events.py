@@ -0,0 +1,82 @@
+import asyncio
+import json
+import unittest
+
+from src.application.use_case.ticket import AsyncTicketUseCase, TicketUseCase
+from src.domain.enum.ticket_event import TicketEvent
+from src.domain.model.ticket import TicketDomain
+from src.infrastructure.mongo.mock_repository import (
+    AsyncMockRepositoryClient,
+    MockRepositoryClient,
+)
+from src.infrastructure.mongo.repositories.ticket_mongo import (
+    TicketAsyncMongo,
+    TicketMongo,
+)
+from src.infrastructure.services.User import UserService
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.events = list()
+
+    def publish(self, topic, message):
+        self.events.append((topic, json.loads(message)))
+
+
+class AsyncRecordingBroker(RecordingBroker):
+    async def publish(self, topic, message):
+        super().publish(topic, message)
+
+
+class TestTicketEvents(unittest.TestCase):
+    def setUp(self):
+        self.obj = TicketDomain.get_valid_ticket()
+        self.broker = RecordingBroker()
+        self.use_case = TicketUseCase(
+            UserService.get_default_identifier(),
+            TicketMongo(MockRepositoryClient({}), TicketDomain.pk),
+            self.broker,
+        )
+
+    def test_events_carry_the_identifier(self):
+        self.use_case.create(self.obj)
+        self.use_case.update(self.obj)
+
+        assert [topic for topic, _ in self.broker.events] == [
+            TicketEvent.CREATED,
+            TicketEvent.UPDATED,
+        ]
+        for _, body in self.broker.events:
+            assert body[TicketDomain.pk] == self.obj.ticket_id
+            assert "_id" not in body
+
+    def test_without_broker(self):
+        use_case = TicketUseCase(
+            UserService.get_default_identifier(),
+            TicketMongo(MockRepositoryClient({}), TicketDomain.pk),
+            None,
+        )
+
+        assert use_case.update(self.obj) is None
+
+
+class TestAsyncTicketEvents(unittest.TestCase):
+    def test_events_carry_the_identifier(self):
+        obj = TicketDomain.get_valid_ticket()
+        broker = AsyncRecordingBroker()
+        use_case = AsyncTicketUseCase(
+            UserService.get_default_identifier(),
+            TicketAsyncMongo(AsyncMockRepositoryClient({}), TicketDomain.pk),
+            broker,
+        )
+
+        async def scenario():
+            await use_case.create(obj)
+            await use_case.update(obj)
+
+        asyncio.run(scenario())
+        assert [body[TicketDomain.pk] for _, body in broker.events] == [
+            obj.ticket_id,
+            obj.ticket_id,
+        ]
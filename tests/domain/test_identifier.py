@@ -0,0 +1,72 @@
+import os
+import unittest
+from unittest import mock
+
+import pandas as pd
+from bson import ObjectId
+
+from src.domain.enum.identifier_algorithm import IdentifierAlgorithm
+from src.domain.identifier_generator import IdentifierGenerator, TickSonyFlake
+from src.domain.identifier_handler import IdentifierHandler
+
+
+class TestIdentifierGenerator(unittest.TestCase):
+    def test_next_ids_are_unique_and_valid(self):
+        for algorithm in IdentifierAlgorithm:
+            if algorithm == IdentifierAlgorithm.DEFAULT:
+                continue
+            identifiers = IdentifierGenerator.next_ids(algorithm, 1000)
+            assert len(set(identifiers)) == 1000
+            for identifier in identifiers[:10]:
+                IdentifierHandler.is_valid(algorithm, identifier)
+
+    def test_validate_many_matches_validator(self):
+        for algorithm in IdentifierAlgorithm:
+            valid = IdentifierGenerator.next_id(algorithm)
+            values = [valid, valid[:-1], valid + "0", valid[:-1] + "\u00e9", None, 5]
+            if algorithm == IdentifierAlgorithm.OBJECT_ID:
+                values.append(ObjectId())
+            column = pd.Series(values, dtype=object)
+
+            validator = IdentifierHandler.validator(algorithm)
+            expected = [value is not None and validator(value) for value in values]
+            assert IdentifierHandler.validate_many(algorithm, column).tolist() == expected
+
+    def test_validator_checks_every_character(self):
+        for algorithm in IdentifierAlgorithm:
+            if algorithm == IdentifierAlgorithm.DEFAULT:
+                continue
+            valid = IdentifierGenerator.next_id(algorithm)
+            validator = IdentifierHandler.validator(algorithm)
+            for position in (0, len(valid) // 2, len(valid) - 1):
+                for character in ("!", " ", "\u0661"):
+                    value = valid[:position] + character + valid[position + 1 :]
+                    assert not validator(value), (algorithm, value)
+
+    def test_sony_flake_is_shared(self):
+        assert IdentifierGenerator.sony_flake() is IdentifierGenerator.sony_flake()
+
+    def test_machine_id_keeps_16_host_bits(self):
+        target = "src.domain.identifier_generator.lower_16bit_private_ip"
+        with mock.patch.dict(os.environ, {}, clear=True):
+            for host in (0x1102, 0x1202):
+                with mock.patch(target, return_value=host):
+                    assert IdentifierGenerator.machine_id() == host
+
+        with mock.patch.dict(os.environ, {"SONYFLAKE_MACHINE_ID": "513"}):
+            assert IdentifierGenerator.machine_id() == 513
+
+    def test_workers_of_a_host_do_not_collide(self):
+        workers = [TickSonyFlake.for_worker(7, slot, 2) for slot in range(4)]
+        identifiers = [sf.next_id() for _ in range(300) for sf in workers]
+
+        assert len(set(identifiers)) == len(identifiers)
+        assert {identifier & 0xFFFF for identifier in identifiers} == {7}
+
+    def test_worker_slot_must_fit(self):
+        with self.assertRaises(ValueError):
+            TickSonyFlake.for_worker(7, 4, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
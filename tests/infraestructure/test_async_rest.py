@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+from quart import Quart
+
+from src.domain.model.ticket import TicketDomain
+from src.infrastructure.broker.mock_broker import AsyncMockBrokerClient
+from src.infrastructure.mongo.mock_repository import AsyncMockRepositoryClient
+from src.infrastructure.services.User import UserService
+from src.rest.async_route import ticket
+from src.rest.container import AsyncContainer
+
+
+class RecordingRepository(AsyncMockRepositoryClient):
+    def __init__(self, data) -> None:
+        super().__init__(data)
+        self.updates = list()
+
+    async def update(self, identifier, kwargs) -> int:
+        self.updates.append((identifier, kwargs))
+        return 1
+
+
+@pytest.fixture
+def ticket_id():
+    return TicketDomain.get_default_identifier().value
+
+
+@pytest.fixture
+def repository(ticket_id):
+    return RecordingRepository(
+        {
+            "_id": ticket_id,
+            "requirement": "first",
+            "write_version": "5b1a0c9e2f3d4e61",
+        }
+    )
+
+
+@pytest.fixture
+def client(repository):
+    app = Quart(__name__)
+    app.register_blueprint(ticket.ticket_route)
+    app.config["CONTAINER"] = AsyncContainer(
+        {
+            "ASYNC_REPOSITORY_MONGO": repository,
+            "ASYNC_BROKER": AsyncMockBrokerClient(),
+        }
+    )
+    return app.test_client()
+
+
+@pytest.fixture
+def write_uid():
+    return UserService.get_default_identifier().value
+
+
+def send(request):
+    async def scenario():
+        response = await request
+        return response, await response.get_data()
+
+    return asyncio.run(scenario())
+
+
+def test_get_envelope(client, ticket_id, write_uid):
+    response, body = send(
+        client.get(f"/ticket/{ticket_id}", query_string={"write_uid": write_uid})
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    envelope = json.loads(body)
+    assert envelope["statusCode"] == 200
+    assert envelope["data"]["requirement"] == "first"
+
+
+def test_put_envelope(client, repository, ticket_id, write_uid):
+    response, body = send(
+        client.put(
+            f"/ticket/{ticket_id}",
+            query_string={"write_uid": write_uid, "requirement": "second"},
+        )
+    )
+
+    assert response.status_code == 200
+    assert json.loads(body) == {"data": None, "statusCode": 200}
+    identifier, item = repository.updates[0]
+    assert identifier == ticket_id
+    assert item["requirement"] == "second"
+
+
+def test_streamed_get(client, ticket_id, write_uid):
+    response, body = send(
+        client.get("/ticket/", query_string={"write_uid": write_uid, "stream": "1"})
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    envelope = json.loads(body)
+    assert envelope["statusCode"] == 200
+    assert [item["requirement"] for item in envelope["data"]] == ["first"]
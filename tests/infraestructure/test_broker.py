@@ -1,7 +1,104 @@
+import tempfile
+
+import pytest
+
+from src.domain.enum.ticket_event import TicketEvent
 from src.infrastructure.bootstrap.bootstrap import Bootstrap
+from src.infrastructure.broker.kafka import (
+    KafkaClient,
+    KafkaServer,
+    kafka_interface_test,
+)
+from src.infrastructure.broker.mock_broker import FakeKafkaProducer
+from src.infrastructure.broker.outbox import BrokerOutbox
 from src.infrastructure.broker.rabbitmq import rabbitmq_interface_test
+from src.infrastructure.InfrastructureError import InfrastructureError
 
 
 def test_rabbitmq():
     my_config = Bootstrap()
     rabbitmq_interface_test(my_config.RABBITMQ_SERVER)
+
+
+def get_kafka_server(path):
+    return KafkaServer(hostname="fake", port=9092, prefix="test", lost_message_path=path)
+
+
+def test_kafka():
+    with tempfile.TemporaryDirectory() as path:
+        kafka_interface_test(get_kafka_server(path), FakeKafkaProducer)
+
+
+def test_kafka_reuses_one_producer():
+    producers = list()
+
+    def factory(server):
+        producers.append(FakeKafkaProducer())
+        return producers[-1]
+
+    with tempfile.TemporaryDirectory() as path:
+        kafka_broker = KafkaClient(get_kafka_server(path), factory)
+        for _ in range(3):
+            kafka_broker.publish(TicketEvent.CREATED, "testing...")
+
+    assert len(producers) == 1
+    assert producers[0].topics["test.created"] == [b"testing..."] * 3
+
+
+def test_kafka_spools_failed_deliveries():
+    producer = FakeKafkaProducer()
+    producer.fail_topics.add("test.deleted")
+
+    with tempfile.TemporaryDirectory() as path:
+        kafka_broker = KafkaClient(get_kafka_server(path), lambda server: producer)
+        kafka_broker.publish(TicketEvent.DELETED, "testing...")
+
+        spooled = list()
+        kafka_broker.spool.replay(spooled.append)
+
+    assert [record["data"] for record in spooled] == ["testing..."]
+
+
+def test_kafka_spools_the_batch_without_a_producer():
+    def factory(server):
+        raise ConnectionError("no brokers available")
+
+    with tempfile.TemporaryDirectory() as path:
+        kafka_broker = KafkaClient(get_kafka_server(path), factory)
+        with pytest.raises(InfrastructureError):
+            kafka_broker.publish_batch(
+                [(TicketEvent.CREATED, "first"), (TicketEvent.UPDATED, "second")]
+            )
+
+        spooled = list()
+        kafka_broker.spool.replay(spooled.append)
+
+    assert [record["data"] for record in spooled] == ["first", "second"]
+
+
+def test_kafka_behind_the_outbox():
+    producer = FakeKafkaProducer()
+
+    with tempfile.TemporaryDirectory() as path:
+        kafka_broker = KafkaClient(get_kafka_server(path), lambda server: producer)
+        outbox = BrokerOutbox(kafka_broker)
+        outbox.publish(TicketEvent.CREATED, "testing...")
+        outbox.close()
+
+    assert producer.topics["test.created"] == [b"testing..."]
+    assert producer.flushed == 1
+
+
+def test_kafka_replays_its_spool():
+    producer = FakeKafkaProducer()
+    producer.fail_topics.add("test.deleted")
+
+    with tempfile.TemporaryDirectory() as path:
+        kafka_broker = KafkaClient(get_kafka_server(path), lambda server: producer)
+        kafka_broker.publish(TicketEvent.DELETED, "testing...")
+
+        assert kafka_broker.spool.replay(kafka_broker.republish) == 0
+        producer.fail_topics.clear()
+        assert kafka_broker.spool.replay(kafka_broker.republish) == 1
+
+    assert producer.topics["test.deleted"] == [b"testing..."]
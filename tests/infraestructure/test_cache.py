@@ -0,0 +1,154 @@
+import time
+import unittest
+
+from src.infrastructure.cache.cached_repository import CachedRepository
+from src.infrastructure.cache.local_cache import LocalCache
+from src.infrastructure.cache.mock_cache import FakeRedis
+from src.infrastructure.cache.redis_cache import RedisCache, RedisServer
+
+
+class CountingRepository:
+    tablename = "ticket"
+    pk = "ticket_id"
+
+    def __init__(self):
+        self.items = dict()
+        self.reads = 0
+
+    def get_by_id(self, identifier, fields):
+        self.reads += 1
+        item = self.items.get(identifier)
+        if item is None:
+            return None
+        if fields is None:
+            return dict(item)
+        return {field: item[field] for field in fields if field in item}
+
+    def update(self, identifier, item):
+        if identifier not in self.items:
+            return 0
+        self.items[identifier].update(item)
+        return 1
+
+    def delete(self, identifier):
+        return int(self.items.pop(identifier, None) is not None)
+
+    def create(self, item):
+        self.items[item[self.pk]] = dict(item)
+
+
+class TestLocalCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LocalCache(max_size=2)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        cache.get("a")
+        cache.set("c", 3, 60)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_entries_expire(self):
+        cache = LocalCache()
+        cache.set("a", 1, 0.01)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestCachedRepository(unittest.TestCase):
+    fields = ["ticket_id", "requirement"]
+
+    def get_repository(self, cache):
+        repository = CountingRepository()
+        repository.create({"ticket_id": "1", "requirement": "first"})
+        return repository, CachedRepository(repository, cache)
+
+    def test_reads_once_then_hits(self):
+        repository, cached = self.get_repository(LocalCache())
+        for _ in range(3):
+            item = cached.get_by_id("1", self.fields)
+
+        assert item == {"ticket_id": "1", "requirement": "first"}
+        assert repository.reads == 1
+
+    def test_hits_are_copies(self):
+        _, cached = self.get_repository(LocalCache())
+        cached.get_by_id("1", self.fields)["requirement"] = "changed"
+
+        assert cached.get_by_id("1", self.fields)["requirement"] == "first"
+
+    def test_narrower_projection_is_a_hit(self):
+        repository, cached = self.get_repository(LocalCache())
+        cached.get_by_id("1", self.fields)
+        item = cached.get_by_id("1", ["requirement"])
+
+        assert item == {"ticket_id": "1", "requirement": "first"}
+        assert repository.reads == 1
+
+    def test_wider_projection_is_a_miss(self):
+        repository, cached = self.get_repository(LocalCache())
+        cached.get_by_id("1", ["requirement"])
+        item = cached.get_by_id("1", self.fields)
+
+        assert item == {"ticket_id": "1", "requirement": "first"}
+        assert repository.reads == 2
+
+    def test_update_and_delete_invalidate(self):
+        repository, cached = self.get_repository(LocalCache())
+        cached.get_by_id("1", self.fields)
+
+        cached.update("1", {"requirement": "second"})
+        assert cached.get_by_id("1", self.fields)["requirement"] == "second"
+
+        cached.delete("1")
+        assert cached.get_by_id("1", self.fields) is None
+        assert repository.reads == 3
+
+    def test_full_document_with_fresh_fields(self):
+        repository = CountingRepository()
+        repository.create({"ticket_id": "1", "write_version": "a"})
+        cached = CachedRepository(
+            repository, LocalCache(), fresh_fields=("write_version",)
+        )
+
+        assert cached.get_by_id("1", None) == {"ticket_id": "1", "write_version": "a"}
+        repository.update("1", {"write_version": "b"})
+        assert cached.get_by_id("1", None)["write_version"] == "b"
+
+    def test_misses_are_cached_until_create(self):
+        repository, cached = self.get_repository(LocalCache())
+        assert cached.get_by_id("2", self.fields) is None
+        assert cached.get_by_id("2", self.fields) is None
+        assert repository.reads == 1
+
+        cached.create({"ticket_id": "2", "requirement": "new"})
+        assert cached.get_by_id("2", self.fields)["requirement"] == "new"
+
+    def test_shared_backend(self):
+        client = FakeRedis()
+        server = RedisServer(hostname="fake", port=6379, prefix="test")
+        cache = RedisCache(server, lambda server: client)
+        repository, cached = self.get_repository(cache)
+
+        cached.get_by_id("1", self.fields)
+        assert cached.get_by_id("1", self.fields)["requirement"] == "first"
+        assert repository.reads == 1
+        assert "test:ticket:1" in client.data
+
+        cached.delete("1")
+        assert "test:ticket:1" not in client.data
+
+    def test_failing_cache_falls_back(self):
+        class BrokenCache:
+            def get(self, *args):
+                raise ConnectionError("down")
+
+            set = delete = get
+
+        repository, cached = self.get_repository(BrokenCache())
+
+        assert cached.get_by_id("1", self.fields)["requirement"] == "first"
+        assert cached.update("1", {"requirement": "second"}) == 1
@@ -0,0 +1,165 @@
+import json
+import uuid
+
+import pytest
+from flask import Flask
+
+from src.application.audit_handler import AuditHandler
+from src.domain.model.ticket import TicketDomain
+from src.infrastructure.services.User import UserService
+from src.infrastructure.broker.mock_broker import MockBrokerClient
+from src.infrastructure.cache.local_cache import LocalCache
+from src.infrastructure.cache.mock_cache import FakeRedis
+from src.infrastructure.cache.redis_cache import RedisCache, RedisServer
+from src.rest.container import Container
+from src.rest.route import ticket
+
+
+class RecordingRepository:
+    def __init__(self, items: dict):
+        self.items = items
+        self.reads = list()
+
+    def for_table(self, tablename):
+        return self
+
+    def get_by_id(self, identifier, attrs):
+        self.reads.append(list(attrs))
+        item = self.items.get(identifier)
+        if item is None:
+            return None
+        return {k: v for k, v in item.items() if k in attrs or k == "_id"}
+
+    def update(self, identifier, kwargs) -> int:
+        self.items[identifier].update(kwargs)
+        return 1
+
+
+def get_client(repository, cache=None):
+    app = Flask(__name__)
+    app.register_blueprint(ticket.ticket_route)
+    app.config["CONTAINER"] = Container(
+        {
+            "REPOSITORY_MONGO": repository,
+            "BROKER_OUTBOX": MockBrokerClient(),
+            "CACHE": cache,
+        }
+    )
+    return app.test_client()
+
+
+@pytest.fixture
+def ticket_id():
+    return TicketDomain.get_default_identifier().value
+
+
+@pytest.fixture
+def repository(ticket_id):
+    return RecordingRepository(
+        {
+            ticket_id: {
+                "_id": ticket_id,
+                "requirement": "first",
+                "write_version": "5b1a0c9e2f3d4e61",
+            }
+        }
+    )
+
+
+def get_ticket(client, ticket_id, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(
+        f"/ticket/{ticket_id}",
+        query_string={"write_uid": str(uuid.uuid4())},
+        headers=headers,
+    )
+
+
+def test_get_sends_etag(repository, ticket_id):
+    response = get_ticket(get_client(repository), ticket_id)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    data = json.loads(response.data)["data"]
+    assert data["requirement"] == "first"
+    assert "write_version" not in data
+
+
+def test_matching_etag_reads_the_version_only(repository, ticket_id):
+    client = get_client(repository)
+    etag = get_ticket(client, ticket_id).headers["ETag"]
+    repository.reads.clear()
+
+    response = get_ticket(client, ticket_id, etag)
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+    assert repository.reads == [["write_version"]]
+
+
+def test_write_changes_the_etag(repository, ticket_id):
+    client = get_client(repository)
+    etag = get_ticket(client, ticket_id).headers["ETag"]
+
+    repository.items[ticket_id]["write_version"] = "0d7f2a9c81b34e5a"
+    response = get_ticket(client, ticket_id, etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_writes_in_the_same_second_change_the_etag(repository, ticket_id):
+    client = get_client(repository)
+    write_uid = UserService.get_default_identifier()
+    etags = [get_ticket(client, ticket_id).headers["ETag"]]
+
+    # write_at is the same for both, it only counts seconds
+    for _ in range(2):
+        repository.update(ticket_id, AuditHandler.get_update_fields(write_uid))
+        etags.append(get_ticket(client, ticket_id).headers["ETag"])
+
+    assert len(set(etags)) == 3
+    assert get_ticket(client, ticket_id, etags[1]).status_code == 200
+
+
+def test_local_cache_reads_the_version_again(repository, ticket_id):
+    # Another worker may have written since, only the version is read
+    client = get_client(repository, LocalCache())
+    etag = get_ticket(client, ticket_id).headers["ETag"]
+    repository.reads.clear()
+
+    assert get_ticket(client, ticket_id, etag).status_code == 304
+    assert repository.reads == [["write_version"]]
+
+
+def test_local_cache_sees_writes_of_other_workers(repository, ticket_id):
+    client = get_client(repository, LocalCache())
+    etag = get_ticket(client, ticket_id).headers["ETag"]
+
+    # Written through another worker, this worker's cache was not told
+    repository.items[ticket_id].update(
+        {"requirement": "second", "write_version": "0d7f2a9c81b34e5a"}
+    )
+    response = get_ticket(client, ticket_id, etag)
+
+    assert response.status_code == 200
+    assert json.loads(response.data)["data"]["requirement"] == "second"
+
+
+def test_shared_cache_answers_without_a_read(repository, ticket_id):
+    server = RedisServer(hostname="fake", port=6379, prefix="test")
+    cache = RedisCache(server, lambda server: FakeRedis())
+    client = get_client(repository, cache)
+    etag = get_ticket(client, ticket_id).headers["ETag"]
+    repository.reads.clear()
+
+    assert get_ticket(client, ticket_id, etag).status_code == 304
+    assert repository.reads == []
+
+
+def test_legacy_entity_uses_a_content_hash(repository, ticket_id):
+    del repository.items[ticket_id]["write_version"]
+    client = get_client(repository)
+
+    etag = get_ticket(client, ticket_id).headers["ETag"]
+    assert get_ticket(client, ticket_id, etag).status_code == 304
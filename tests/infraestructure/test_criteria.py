@@ -0,0 +1,62 @@
+import unittest
+
+from src.application.criteria import Criteria
+from src.infrastructure.mongo.criteria_compiler import CriteriaCompiler
+
+
+class TestCriteriaCompiler(unittest.TestCase):
+    fields = ["ticket_id", "state", "requirement"]
+
+    def test_empty_criteria(self):
+        query = CriteriaCompiler.compile(Criteria(self.fields))
+        assert query.filter == {}
+        assert query.sort is None
+        assert query.limit == 0 and query.skip == 0
+
+    def test_and_binds_tighter_than_or(self):
+        matching = Criteria(self.fields)
+        matching.add(("state", "=", 0))._and().add(("requirement", "!=", "x"))
+        matching._or().add(("state", "in", [2, 3]))
+
+        query = CriteriaCompiler.compile(matching)
+        assert query.filter == {
+            "$or": [
+                {"$and": [{"state": {"$eq": 0}}, {"requirement": {"$ne": "x"}}]},
+                {"state": {"$in": [2, 3]}},
+            ]
+        }
+
+    def test_limit_and_pagination(self):
+        matching = Criteria(self.fields)._limit(10)
+        assert CriteriaCompiler.compile(matching).limit == 10
+
+        matching = Criteria(self.fields)._pagination(3, 20)
+        query = CriteriaCompiler.compile(matching)
+        assert query.skip == 40 and query.limit == 20
+        assert query.sort == [("_id", 1)]
+
+    def test_aliases_and_order(self):
+        matching = Criteria(self.fields)
+        matching.add(("ticket_id", ">", "100"))._order_by("ticket_id", False)
+
+        query = CriteriaCompiler.compile(matching, {"ticket_id": "_id"})
+        assert query.filter == {"_id": {"$gt": "100"}}
+        assert query.sort == [("_id", -1)]
+
+    def test_plans_are_cached_by_shape(self):
+        CriteriaCompiler.plan.cache_clear()
+        for state in range(5):
+            matching = Criteria(self.fields).add(("state", "=", state))._limit(5)
+            query = CriteriaCompiler.compile(matching)
+            assert query.filter == {"state": {"$eq": state}}
+
+        info = CriteriaCompiler.plan.cache_info()
+        assert info.misses == 1 and info.hits == 4
+
+    def test_invalid_operator(self):
+        with self.assertRaises(ValueError):
+            Criteria(self.fields).add(("state", "like", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
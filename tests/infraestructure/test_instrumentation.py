@@ -0,0 +1,160 @@
+import os
+import subprocess
+import sys
+import uuid
+
+from flask import Flask
+from prometheus_client import REGISTRY, multiprocess
+
+from src.domain.enum.ticket_event import TicketEvent
+from src.domain.model.ticket import TicketDomain
+from src.infrastructure.broker.mock_broker import MockBrokerClient
+from src.infrastructure.broker.outbox import BrokerOutbox
+from src.infrastructure.mongo.mock_repository import MockRepositoryClient
+from src.rest.container import Container
+from src.rest.instrumentation import TimedProxy, instrument, metrics_registry
+from src.rest.route import ticket
+
+
+def get_client(layers=1):
+    ticket_id = TicketDomain.get_default_identifier().value
+    app = Flask(__name__)
+    app.register_blueprint(ticket.ticket_route)
+    app.config["CONTAINER"] = Container(
+        {
+            "REPOSITORY_MONGO": MockRepositoryClient({"_id": ticket_id}),
+            "BROKER_OUTBOX": MockBrokerClient(),
+            "METRICS_LAYERS": layers,
+        }
+    )
+    instrument(app)
+    return app.test_client(), ticket_id
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_request_is_counted_with_envelope_status():
+    client, ticket_id = get_client()
+    labels = {"blueprint": "ticket_route", "route": "/ticket/<id>", "method": "GET"}
+    before = sample("http_request_duration_seconds_count", **labels)
+    failed = sample("http_requests_total", status="500", **labels)
+
+    client.get(f"/ticket/{ticket_id}", query_string={"write_uid": str(uuid.uuid4())})
+    client.get("/ticket/not-an-id", query_string={"write_uid": str(uuid.uuid4())})
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 2
+    assert sample("http_requests_total", status="500", **labels) == failed + 1
+
+
+def test_layers_are_timed():
+    client, ticket_id = get_client()
+    layers = {
+        "controller": "TicketController",
+        "use_case": "TicketUseCase",
+        "repository": "ticket",
+    }
+    before = {
+        layer: sample(
+            "layer_duration_seconds_count",
+            layer=layer,
+            target=target,
+            method="get_by_id_with_version",
+        )
+        for layer, target in layers.items()
+        if layer != "repository"
+    }
+
+    client.get(f"/ticket/{ticket_id}", query_string={"write_uid": str(uuid.uuid4())})
+
+    for layer, count in before.items():
+        assert (
+            sample(
+                "layer_duration_seconds_count",
+                layer=layer,
+                target=layers[layer],
+                method="get_by_id_with_version",
+            )
+            == count + 1
+        )
+    assert sample(
+        "layer_duration_seconds_count",
+        layer="repository",
+        target="ticket",
+        method="get_by_id",
+    )
+
+
+def test_outbox_and_broker_are_timed_apart():
+    outbox = BrokerOutbox(MockBrokerClient())
+    container = Container(
+        {
+            "REPOSITORY_MONGO": MockRepositoryClient({}),
+            "BROKER_OUTBOX": outbox,
+            "METRICS_LAYERS": 1,
+        }
+    )
+    enqueued = dict(layer="outbox", target="BrokerOutbox", method="publish")
+    flushed = dict(layer="broker", target="MockBrokerClient", method="publish_batch")
+    published = sample("layer_duration_seconds_count", **enqueued)
+    batches = sample("layer_duration_seconds_count", **flushed)
+
+    container._outbox.publish(TicketEvent.CREATED, "{}")
+    outbox.close()
+
+    assert sample("layer_duration_seconds_count", **enqueued) == published + 1
+    assert sample("layer_duration_seconds_count", **flushed) == batches + 1
+    # A second container does not time the flusher twice
+    Container({"BROKER_OUTBOX": outbox, "METRICS_LAYERS": 1})
+    assert not isinstance(outbox.broker._target, TimedProxy)
+
+
+def test_layers_off():
+    client, _ = get_client(layers=0)
+    controller = client.application.config["CONTAINER"].ticket(str(uuid.uuid4()))
+
+    assert not isinstance(controller, TimedProxy)
+
+
+def test_proxy_keeps_derived_objects_timed():
+    proxy = TimedProxy(MockRepositoryClient({}), "repository")
+
+    table = proxy.for_table("person")
+    assert isinstance(table, TimedProxy)
+    assert table.tablename == "person"
+    assert table.delete("id") == 1
+
+
+WORKER = """
+from prometheus_client import Counter, Gauge
+
+Counter("worker_requests", "Requests").inc(3)
+Gauge("worker_pending", "Pending", multiprocess_mode="livesum").set(1)
+"""
+
+
+def test_multiprocess_registry_sums_workers(tmp_path, monkeypatch):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    workers = [
+        subprocess.Popen([sys.executable, "-c", WORKER], env=env) for _ in range(2)
+    ]
+    assert [worker.wait() for worker in workers] == [0, 0]
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    registry = metrics_registry()
+
+    assert registry is not REGISTRY
+    assert registry.get_sample_value("worker_requests_total") == 6
+    assert registry.get_sample_value("worker_pending") == 2
+
+    # What gunicorn.conf.py child_exit does for a worker that went away
+    multiprocess.mark_process_dead(workers[0].pid, str(tmp_path))
+    assert registry.get_sample_value("worker_requests_total") == 6
+    assert registry.get_sample_value("worker_pending") == 1
+
+
+def test_single_process_registry(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+    assert metrics_registry() is REGISTRY
@@ -1,7 +1,160 @@
+import datetime as dt
+import logging
+import os
+import queue
+import tempfile
+
 from src.infrastructure.bootstrap.bootstrap import Bootstrap
-from src.infrastructure.logger.logger import logger_interface_test
+from src.infrastructure.logger.logger import (
+    LOG_RECORDS_DROPPED,
+    BatchingRotatingFileHandler,
+    MyJSONFormatter,
+    OverflowQueueHandler,
+    SamplingFilter,
+    logger_interface_test,
+    setup_queue,
+)
 
 
 def test_logger():
     my_config = Bootstrap()
     logger_interface_test(my_config.LOG_CONFIG)
+
+
+def get_record(message, level=logging.INFO, name="test"):
+    return logging.LogRecord(name, level, __file__, 1, message, None, None)
+
+
+def test_queue_drops_when_full():
+    handler = OverflowQueueHandler(queue.Queue(1), "drop")
+    dropped = LOG_RECORDS_DROPPED._value.get()
+
+    handler.handle(get_record("kept"))
+    handler.handle(get_record("dropped"))
+
+    assert handler.queue.qsize() == 1
+    assert LOG_RECORDS_DROPPED._value.get() == dropped + 1
+
+
+def test_file_is_written_per_batch():
+    with tempfile.TemporaryDirectory() as path:
+        filename = os.path.join(path, "app.log")
+        handler = BatchingRotatingFileHandler(filename, capacity=3)
+        try:
+            handler.handle(get_record("one"))
+            handler.handle(get_record("two"))
+            assert os.path.getsize(filename) == 0
+
+            handler.handle(get_record("three"))
+            assert os.path.getsize(filename) > 0
+
+            handler.handle(get_record("failure", logging.ERROR))
+            with open(filename) as f_in:
+                assert f_in.read().splitlines()[-1] == "failure"
+        finally:
+            handler.close()
+
+
+def test_listener_writes_off_the_caller_thread():
+    records = list()
+
+    class Recorder(logging.Handler):
+        def emit(self, record):
+            records.append((record.getMessage(), record.threadName))
+
+    logger = logging.getLogger("test_queue")
+    logger.propagate = False
+    logger.handlers = [Recorder()]
+    listener = setup_queue(logger, size=10)
+    try:
+        logger.warning("hello %s", "world")
+    finally:
+        listener.stop()
+
+    assert records == [("hello world", "MainThread")]
+    assert isinstance(logger.handlers[0], OverflowQueueHandler)
+
+
+def test_json_formatter_timestamp_matches_isoformat():
+    formatter = MyJSONFormatter()
+    record = get_record("tick")
+    for created in (1700000000.0, 1700000000.25, 1700000000.9999996, 1700000001.5):
+        record.created = created
+        expected = dt.datetime.fromtimestamp(created, tz=dt.timezone.utc)
+
+        assert formatter._timestamp(record) == expected.isoformat()
+
+
+def test_json_formatter_follows_the_plan():
+    formatter = MyJSONFormatter(fmt_keys={"level": "levelname", "text": "message"})
+    record = get_record("hello %s")
+    record.args = ("world",)
+
+    assert list(formatter._prepare_log_dict(record).items())[:2] == [
+        ("level", "INFO"),
+        ("text", "hello world"),
+    ]
+    assert "write_uid" not in formatter._prepare_log_dict(record)
+
+    record.write_uid = "system"
+    message = formatter._prepare_log_dict(record)
+    assert list(message) == ["level", "text", "timestamp", "write_uid"]
+
+
+def test_sampling_keeps_warnings():
+    sampling = SamplingFilter(default_rate=0.0)
+
+    assert not sampling.filter(get_record("debug", logging.DEBUG))
+    assert sampling.filter(get_record("warning", logging.WARNING))
+
+
+def test_sampling_rate_of_the_closest_logger():
+    sampling = SamplingFilter(loggers={"pymongo": 0.0, "pymongo.topology": 1.0})
+
+    assert not sampling.filter(get_record("command", name="pymongo.command"))
+    assert sampling.filter(get_record("heartbeat", name="pymongo.topology.sdam"))
+    assert sampling.filter(get_record("request", name="src.rest"))
+
+
+def test_sampling_rate_of_the_message_template():
+    sampling = SamplingFilter(loggers={"test": 1.0}, messages={"hot %s": 0.0})
+
+    assert not sampling.filter(get_record("hot %s"))
+    assert sampling.filter(get_record("cold %s"))
+
+
+def test_rate_limit_reports_suppressed():
+    sampling = SamplingFilter(rate=0.0, burst=2)
+    kept = [sampling.filter(get_record("repeated")) for _ in range(5)]
+
+    assert kept == [True, True, False, False, False]
+
+    sampling.rate = 1000000.0
+    record = get_record("repeated")
+    assert sampling.filter(record)
+    assert record.suppressed == 3
+    assert record.getMessage() == "repeated (3 suppressed)"
+
+
+def test_rate_limit_charges_a_record_once():
+    sampling = SamplingFilter(rate=0.0, burst=1)
+    record = get_record("shared by handlers")
+
+    assert all(sampling.filter(record) for _ in range(3))
+    assert not sampling.filter(get_record("shared by handlers"))
+
+
+def test_shared_filters_run_before_the_queue():
+    sampling = SamplingFilter()
+    first, second = logging.NullHandler(), logging.NullHandler()
+    first.addFilter(sampling)
+    second.addFilter(sampling)
+    second.addFilter(logging.Filter("only"))
+
+    logger = logging.getLogger("test_hoist")
+    logger.propagate = False
+    logger.handlers = [first, second]
+    listener = setup_queue(logger, size=10)
+    listener.stop()
+
+    assert logger.handlers[0].filters == [sampling]
@@ -0,0 +1,44 @@
+import threading
+import unittest
+
+from src.domain.enum.ticket_event import TicketEvent
+from src.infrastructure.broker.outbox import BrokerOutbox
+from src.infrastructure.InfrastructureError import InfrastructureError
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.batches = list()
+        self.release = threading.Event()
+        self.release.set()
+
+    def publish_batch(self, events: list):
+        self.release.wait()
+        self.batches.append(list(events))
+
+
+class TestBrokerOutbox(unittest.TestCase):
+    def test_flushes_every_event_in_order(self):
+        broker = RecordingBroker()
+        outbox = BrokerOutbox(broker, max_size=100, batch_size=10)
+        for number in range(50):
+            outbox.publish(TicketEvent.CREATED, str(number))
+        outbox.close()
+
+        events = [message for batch in broker.batches for _, message in batch]
+        assert events == [str(number) for number in range(50)]
+        assert all(len(batch) <= 10 for batch in broker.batches)
+
+    def test_full_outbox_refuses_events(self):
+        broker = RecordingBroker()
+        broker.release.clear()
+        outbox = BrokerOutbox(broker, max_size=2, batch_size=1, put_timeout=0.01)
+        with self.assertRaises(InfrastructureError):
+            for number in range(10):
+                outbox.publish(TicketEvent.UPDATED, str(number))
+        broker.release.set()
+        outbox.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from flask import Flask
+
+from src.domain.model.ticket import TicketDomain
+from src.infrastructure.broker.mock_broker import MockBrokerClient
+from src.infrastructure.mongo.criteria_compiler import CriteriaCompiler
+from src.infrastructure.mongo.mock_repository import MockRepositoryClient
+from src.infrastructure.services.User import UserService
+from src.rest.container import Container
+from src.rest.route import ticket
+
+
+class RecordingRepository(MockRepositoryClient):
+    def __init__(self, data) -> None:
+        super().__init__(data)
+        self.queries = list()
+
+    def fetch(self, attrs, matching, aliases=None):
+        self.queries.append(CriteriaCompiler.compile(matching, aliases))
+        return [dict(self.object)]
+
+
+@pytest.fixture
+def repository():
+    return RecordingRepository({"_id": TicketDomain.get_default_identifier().value})
+
+
+@pytest.fixture
+def client(repository):
+    app = Flask(__name__)
+    app.register_blueprint(ticket.ticket_route)
+    app.config["CONTAINER"] = Container(
+        {
+            "REPOSITORY_MONGO": repository,
+            "BROKER_OUTBOX": MockBrokerClient(),
+        }
+    )
+    return app.test_client()
+
+
+def fetch(client, size, **params):
+    response = client.get(
+        "/ticket/",
+        query_string={
+            "write_uid": UserService.get_default_identifier().value,
+            "size": size,
+            **params,
+        },
+    )
+    return json.loads(response.data)
+
+
+def test_size_pages_the_list(client):
+    envelope = fetch(client, "2")
+
+    assert envelope["statusCode"] == 200
+    assert len(envelope["data"]["items"]) == 1
+    assert envelope["data"]["next"] is None
+
+
+@pytest.mark.parametrize("size", ["abc", "1.5", "0", "-1", "+2"])
+def test_invalid_size_is_a_format_error(client, size):
+    envelope = fetch(client, size)
+
+    assert envelope["statusCode"] == 500
+    assert envelope["data"] == "size must be a positive integer"
+
+
+def test_numbered_page_skips_the_rows_before(client, repository):
+    envelope = fetch(client, "10", page="3")
+
+    assert envelope["statusCode"] == 200
+    assert len(envelope["data"]) == 1
+    assert repository.queries[0].skip == 20
+    assert repository.queries[0].limit == 10
+
+
+def test_invalid_page_is_a_format_error(client):
+    envelope = fetch(client, "10", page="first")
+
+    assert envelope["statusCode"] == 500
+    assert envelope["data"] == "page must be a positive integer"
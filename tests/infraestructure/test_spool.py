@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from src.infrastructure.broker.spool import LostMessageSpool
+
+
+class TestLostMessageSpool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.spool = LostMessageSpool(self.tmp.name, "test", segment_size=64)
+        self.records = [{"type": "CREATED", "data": str(n)} for n in range(20)]
+        for record in self.records:
+            self.spool.append([record])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rotates_segments_by_size(self):
+        assert len(self.spool._segments()) > 1
+
+    def test_replay_publishes_in_order_and_empties(self):
+        published = list()
+        assert self.spool.replay(published.append) == len(self.records)
+        assert published == self.records
+        files = os.listdir(self.spool.directory)
+        assert [f for f in files if not f.startswith(".")] == []
+
+    def test_failed_replay_keeps_the_rest(self):
+        published = list()
+
+        def publish(record):
+            if len(published) == 5:
+                raise ConnectionError("broker down")
+            published.append(record)
+
+        assert self.spool.replay(publish) == 5
+        assert self.spool.replay(published.append) == len(self.records) - 5
+        assert published == self.records
+
+    def test_concurrent_replay_leaves(self):
+        published = list()
+        nested = list()
+
+        def publish(record):
+            if not nested:
+                nested.append(self.spool.replay(published.append))
+            published.append(record)
+
+        assert self.spool.replay(publish) == len(self.records)
+        assert nested == [0]
+        assert published == self.records
+
+
+if __name__ == "__main__":
+    unittest.main()
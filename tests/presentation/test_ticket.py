@@ -8,9 +8,27 @@ from src.infrastructure.broker.mock_broker import MockBrokerClient
 from src.infrastructure.mongo.mock_repository import MockRepositoryClient
 from src.infrastructure.services.User import UserService
 from src.presentation.controller.ticket import TicketController
+from src.utils import timeout
 from src.domain.model.status_code import FIELD_REQUIRED, ID_NOT_VALID, INVALID_FORMAT
 
 
+class DeadlineRepository(MockRepositoryClient):
+    def __init__(self, data) -> None:
+        super().__init__(data)
+        self.deadlines = list()
+
+    def delete(self, identifier) -> int:
+        self.deadlines.append(timeout.remaining())
+        return 1
+
+    def update(self, identifier, kwargs) -> int:
+        self.deadlines.append(timeout.remaining())
+        return 1
+
+    def create(self, item) -> None:
+        self.deadlines.append(timeout.remaining())
+
+
 class TestTicketController(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -74,6 +92,28 @@ class TestTicketController(unittest.TestCase):
             )
             assert error.code == INVALID_FORMAT[0]
 
+    def test_writes_run_under_the_deadline(self):
+        repository = DeadlineRepository({})
+        controller = TicketController(
+            UserService.get_default_identifier(),
+            repository,
+            MockBrokerClient(),
+            ref_timeout=5,
+        )
+        ticket_id = self.ticket.ticket_id
+
+        controller.create(
+            ticket_id,
+            self.ticket.channel_type,
+            self.ticket.requirement,
+            self.ticket.because,
+        )
+        controller.update(ticket_id, {"requirement": "second"})
+        controller.delete(ticket_id)
+
+        assert len(repository.deadlines) == 3
+        assert all(0 < left <= 5 for left in repository.deadlines)
+
 
 if __name__ == "__main__":
     unittest.main()
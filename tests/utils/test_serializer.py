@@ -0,0 +1,61 @@
+import datetime as dt
+import importlib
+import json
+import sys
+import unittest
+from unittest import mock
+
+from bson import ObjectId
+
+from src.domain.model.ticket import TicketDomain
+from src.rest.ExceptionHandler import _END, stream_envelope
+from src.utils import serializer
+
+
+def stdlib_dumps():
+    # dumps as imported where orjson is not installed
+    try:
+        with mock.patch.dict(sys.modules, {"orjson": None}):
+            module = importlib.reload(serializer)
+        return module.BACKEND, module.dumps
+    finally:
+        importlib.reload(serializer)
+
+
+class TestSerializer(unittest.TestCase):
+    def setUp(self):
+        self.ticket = TicketDomain.get_valid_ticket()
+        self.item = {
+            "_id": ObjectId("65a1b2c3d4e5f60718293a4b"),
+            "ticket": self.ticket,
+            "tickets": [self.ticket],
+            "write_at": dt.datetime(2024, 1, 1, 10, 0, 0),
+            "name": "ñandú",
+        }
+
+    def test_native_types(self):
+        data = json.loads(serializer.dumps(self.item))
+
+        assert data["_id"] == "65a1b2c3d4e5f60718293a4b"
+        assert data["ticket"] == TicketDomain.as_dict(self.ticket)
+        assert data["tickets"] == [TicketDomain.as_dict(self.ticket)]
+        assert data["write_at"] == "2024-01-01T10:00:00"
+        assert data["name"] == "ñandú"
+
+    def test_backends_agree(self):
+        backend, dumps = stdlib_dumps()
+
+        assert backend == "json"
+        assert dumps(self.item) == serializer.dumps(self.item)
+        assert dumps(self.item, sort_keys=True) == serializer.dumps(
+            self.item, sort_keys=True
+        )
+
+    def test_streamed_envelope_matches_dumps(self):
+        items = [self.item, {"name": "second"}, {"name": "third"}]
+        streamed = "".join(stream_envelope(items[0], iter(items[1:]), 200))
+
+        assert streamed == serializer.dumps({"data": items, "statusCode": 200})
+        assert "".join(stream_envelope(_END, iter([]), 200)) == serializer.dumps(
+            {"data": [], "statusCode": 200}
+        )
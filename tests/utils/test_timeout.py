@@ -0,0 +1,89 @@
+import threading
+import unittest
+
+from src.utils import timeout
+from src.utils.timeout import DeadlineExecutor, timeout_function, timeout_iterator
+
+
+class TestDeadlineExecutor(unittest.TestCase):
+    def test_returns_the_result(self):
+        assert timeout_function(sum, ([1, 2, 3],), seconds=1) == 6
+
+    def test_propagates_errors(self):
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            timeout_function(fail, seconds=1)
+
+    def test_times_out_as_builtin_timeout(self):
+        release = threading.Event()
+        try:
+            with self.assertRaises(TimeoutError):
+                timeout_function(release.wait, (5,), seconds=0.05)
+        finally:
+            release.set()
+
+    def test_deadline_is_visible_to_the_call(self):
+        left = timeout_function(timeout.remaining, seconds=2)
+
+        assert 0 < left <= 2
+        assert timeout.remaining() is None
+
+    def test_nested_deadline_keeps_the_shorter(self):
+        def nested():
+            with timeout.deadline(timeout.Deadline(60)):
+                return timeout.remaining()
+
+        assert timeout_function(nested, seconds=1) <= 1
+
+    def test_saturated_executor_rejects_and_recovers(self):
+        executor = DeadlineExecutor(max_workers=1, max_pending=0)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=executor.call, args=(block, (), None, 5))
+        worker.start()
+        started.wait(1)
+
+        with self.assertRaises(timeout.TimeoutError):
+            executor.call(sum, ([1],), seconds=0.05)
+
+        release.set()
+        worker.join()
+        assert executor.call(sum, ([1],), seconds=1) == 1
+
+
+class TestTimeoutIterator(unittest.TestCase):
+    def test_every_row_is_read_under_the_deadline(self):
+        def rows():
+            for _ in range(3):
+                yield timeout.remaining()
+
+        left = list(timeout_iterator(rows(), seconds=2))
+
+        assert len(left) == 3
+        assert all(0 < value <= 2 for value in left)
+        assert timeout.remaining() is None
+
+    def test_expired_deadline_stops_and_closes(self):
+        closed = threading.Event()
+
+        def rows():
+            try:
+                while True:
+                    yield 1
+            finally:
+                closed.set()
+
+        stream = timeout_iterator(rows(), seconds=0.05)
+        assert next(stream) == 1
+        threading.Event().wait(0.1)
+
+        with self.assertRaises(timeout.TimeoutError):
+            next(stream)
+        assert closed.is_set()